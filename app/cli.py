@@ -0,0 +1,188 @@
+# File: app\cli.py
+"""
+Tk gerektirmeyen komut satiri girisi (sunucu / cron icin).
+
+    python -m app.cli KLASOR [--model heavy] [--ocr off] [-o sonuclar.jsonl]
+
+Her cift sonucu db/results.db'ye commit edildigi anda (parti parti) bir JSON
+satiri olarak yazilir; boylece yarida kalan run --devam ile surdurulurken
+ciktida tekrar eden satir olusmaz.
+Loglar stderr'e gider; stdout yalnizca JSONL icindir.
+
+Cikis kodlari:
+    0  tamamlandi, KOPYA yok
+    1  tamamlandi, en az bir KOPYA cift var
+    2  gecersiz arguman
+    3  analiz edilecek belge yok / devam edilemez
+    4  calisma hatasi
+    130 kesildi (Ctrl+C); run --devam ile surdurulebilir
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+
+CIKIS_TEMIZ = 0
+CIKIS_KOPYA = 1
+CIKIS_ARGUMAN = 2
+CIKIS_BELGE_YOK = 3
+CIKIS_HATA = 4
+CIKIS_KESILDI = 130
+
+
+def _arguman_ayristirici():
+    p = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Klasordeki belgeleri karsilastirir, sonuclari JSONL olarak yazar.",
+    )
+    p.add_argument("klasor", help="PDF/DOCX/TXT belgelerinin bulundugu klasor")
+    p.add_argument("--model", choices=["heavy", "light"], default="heavy")
+    p.add_argument("--ocr", choices=["heavy", "light", "off"], default="heavy")
+    p.add_argument(
+        "-o", "--cikti", default="-",
+        help="JSONL cikti dosyasi ('-': stdout, varsayilan)",
+    )
+    p.add_argument("--isci", type=int, help="Belge yukleme process sayisi (0: CPU sayisi)")
+    p.add_argument("--ocr-isci", type=int, help="OCR satir kesme thread sayisi")
+    p.add_argument("--kopya-esik", type=float)
+    p.add_argument("--supheli-esik", type=float)
+    p.add_argument("--lexical-w", type=float)
+    p.add_argument("--semantic-w", type=float)
+    p.add_argument("--aday-modu", choices=["hepsi", "lsh", "topk"])
+    p.add_argument(
+        "--artimli", action="store_true",
+        help="Yalnizca yeni/degismis belgeleri iceren ciftleri skorla",
+    )
+    p.add_argument("--base", metavar="TARIH", help="Artimli analizde temel run")
+    p.add_argument(
+        "--devam", nargs="?", const="son", metavar="TARIH",
+        help="Yarida kalan run'a devam et (tarih verilmezse ayni modlu son run)",
+    )
+    p.add_argument(
+        "--profil", choices=["cprofile", "tracemalloc", "hepsi"],
+        help="Yukleme ve analizi profille (config.json'daki profil_klasoru'na yazilir)",
+    )
+    p.add_argument("-q", "--sessiz", action="store_true", help="Ilerleme loglarini yazma")
+    return p
+
+
+def _ayarlar(args) -> dict:
+    """Verilen argumanlari config anahtarlarina cevirir."""
+    eslesme = {
+        "isci": "yukleme_isci_sayisi",
+        "ocr_isci": "ocr_isci_sayisi",
+        "kopya_esik": "kopya_esik",
+        "supheli_esik": "supheli_esik",
+        "lexical_w": "lexical_weight",
+        "semantic_w": "semantic_weight",
+        "aday_modu": "aday_modu",
+    }
+    ayarlar = {
+        anahtar: getattr(args, arg)
+        for arg, anahtar in eslesme.items()
+        if getattr(args, arg) is not None
+    }
+    if args.profil:
+        ayarlar["profil_cprofile"] = args.profil in ("cprofile", "hepsi")
+        ayarlar["profil_tracemalloc"] = args.profil in ("tracemalloc", "hepsi")
+    return ayarlar
+
+
+def _stdout_ayir():
+    """
+    JSONL icin asil stdout'un kopyasini dondurur; fd 1 stderr'e yonlendirilir.
+    Boylece extractor/model print'leri (alt process'ler dahil) JSONL'i bozmaz.
+    """
+    sys.stdout.flush()
+    fd = os.dup(1)
+    os.dup2(2, 1)
+    return os.fdopen(fd, "w", encoding="utf-8", buffering=1)
+
+
+def calistir(argv=None) -> int:
+    args = _arguman_ayristirici().parse_args(argv)
+    if not os.path.isdir(args.klasor):
+        print(f"[Hata] Klasor bulunamadi: {args.klasor}", file=sys.stderr)
+        return CIKIS_ARGUMAN
+
+    def log(mesaj):
+        if not args.sessiz or mesaj.startswith(("[Hata]", "[Uyari]")):
+            print(mesaj, file=sys.stderr, flush=True)
+
+    cikti = _stdout_ayir() if args.cikti == "-" else open(
+        args.cikti, "a", encoding="utf-8", buffering=1
+    )
+
+    # Ilk Ctrl+C analizi duzgun durdurur (tamponlar yazilir), ikincisi keser
+    durdur = threading.Event()
+
+    def kesme(_sig, _frame):
+        if durdur.is_set():
+            raise KeyboardInterrupt
+        durdur.set()
+        log("[Uyari] Durduruluyor... (run --devam ile surdurulebilir)")
+
+    signal.signal(signal.SIGINT, kesme)
+
+    sayac = {"KOPYA": 0, "SUPHELI": 0, "TEMIZ": 0}
+
+    def sonuc_yaz(s):
+        sayac[s["durum"]] += 1
+        cikti.write(json.dumps(s, ensure_ascii=False) + "\n")
+
+    try:
+        from app.similarity_app import SimilarityApp
+
+        app = SimilarityApp(model_mode=args.model, ocr_mode=args.ocr, ayarlar=_ayarlar(args))
+        app.log_cb = log
+        app.klasor_yukle(args.klasor)
+        if len(app.veriler) < 2:
+            log("[Hata] Analiz icin en az iki okunabilir belge gerekli")
+            return CIKIS_BELGE_YOK
+
+        devam = args.devam
+        if devam == "son":
+            devam = app.db.get_latest_incomplete_run(app._run_modeli(), app.ocr_mode)
+            if devam is None:
+                log("[Hata] Devam edilecek yarim run bulunamadi")
+                return CIKIS_BELGE_YOK
+
+        sonuclar, run_time = app.analiz_et(
+            cancel_cb=durdur.is_set,
+            artimli=args.artimli,
+            base_tarih=args.base,
+            sonuc_cb=sonuc_yaz,
+            devam_tarih=devam,
+        )
+    except KeyboardInterrupt:
+        return CIKIS_KESILDI
+    except Exception as e:
+        log(f"[Hata] {e}")
+        return CIKIS_HATA
+    finally:
+        cikti.close()
+
+    if run_time is None:
+        return CIKIS_BELGE_YOK
+    if durdur.is_set():
+        log(f"Run {run_time} yarida kaldi: python -m app.cli {args.klasor} --devam {run_time!r}")
+        return CIKIS_KESILDI
+
+    kopya = sum(s["durum"] == "KOPYA" for s in sonuclar)
+    log(
+        f"Run {run_time}: {len(sonuclar)} cift "
+        f"({sayac['KOPYA']} KOPYA, {sayac['SUPHELI']} SUPHELI bu calismada yazildi)"
+    )
+    return CIKIS_KOPYA if kopya else CIKIS_TEMIZ
+
+
+def main():
+    sys.exit(calistir())
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -11,10 +11,14 @@ class SimilarityGUI:
     """Masaustu arayuz."""
 
     def __init__(self):
+        # Modeller burada yuklenmez; pencere hemen acilir, motor arka planda isinir
         self.app = SimilarityApp()
         self.db = ResultDatabase()
         self._queue = queue.Queue()
         self._running = False
+        self._motor_yukleniyor = False
+        # Arka planda hesaplanan detay (kanit) istekleri
+        self._bekleyen_detay = 0
         self._cancel_event = threading.Event()
         self.run_records = []
 
@@ -27,6 +31,22 @@ class SimilarityGUI:
         # Varsayilan ayarlarla motorlari hazirla
         self.app.set_options(self.model_var.get(), self.ocr_var.get(), log_cb=self._log)
         self._load_config_to_ui()
+        self._motoru_isit()
+
+    def _motoru_isit(self):
+        """Semantik modeli arka planda yukler; gecmis bu sirada incelenebilir."""
+
+        def worker():
+            try:
+                self.app.isit()
+                self._queue.put(("motor", None))
+            except Exception as e:
+                self._queue.put(("motor", e))
+
+        self._motor_yukleniyor = True
+        self.status_var.set("Motor yukleniyor...")
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self._poll_queue)
 
     def _ui(self):
         top = tk.Frame(self.root)
@@ -60,6 +80,13 @@ class SimilarityGUI:
             width=15,
         ).pack(side=tk.LEFT, padx=5)
 
+        tk.Button(
+            top,
+            text="Olcumler",
+            command=self._show_olcum,
+            width=10,
+        ).pack(side=tk.LEFT, padx=5)
+
         tk.Button(
             top,
             text="Temizle (DB)",
@@ -90,6 +117,14 @@ class SimilarityGUI:
             state="readonly",
         ).pack(side=tk.LEFT, padx=(0, 10))
 
+        # Artimli: yalnizca yeni/degismis belgeleri iceren ciftler skorlanir
+        self.artimli_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            opts,
+            text="Artimli (sadece yeni belgeler)",
+            variable=self.artimli_var,
+        ).pack(side=tk.LEFT, padx=(0, 10))
+
         main = tk.Frame(self.root)
         main.pack(fill=tk.BOTH, expand=True)
 
@@ -183,7 +218,12 @@ class SimilarityGUI:
         yol = filedialog.askdirectory()
         if yol:
             self.app.klasor_yukle(yol)
-            messagebox.showinfo("Bilgi", "PDF'ler yuklendi.")
+            ist = self.app.son_yukleme
+            messagebox.showinfo(
+                "Bilgi",
+                f"Dosyalar yuklendi.\nOnbellek: {ist['isabet']} isabet, "
+                f"{ist['kacirma']} yeni cikarma.",
+            )
 
     def analiz(self):
         if self._running:
@@ -197,17 +237,25 @@ class SimilarityGUI:
             sonuclar, run_time = self.app.analiz_et(
                 progress_cb=self._progress_cb,
                 cancel_cb=self._cancel_event.is_set,
+                artimli=self.artimli_var.get(),
             )
             self._queue.put(("done", sonuclar, run_time))
 
         self._set_running(True)
         self.progress["value"] = 0
         self.progress["maximum"] = 1
-        self.status_var.set("Analiz basliyor...")
+        # Isinma bitmediyse analiz thread'i motoru bekler
+        self.status_var.set(
+            "Motor yukleniyor, analiz bekliyor..."
+            if self._motor_yukleniyor
+            else "Analiz basliyor..."
+        )
         self._cancel_event.clear()
 
         threading.Thread(target=worker, daemon=True).start()
-        self.root.after(100, self._poll_queue)
+        # Isinma veya detay hesabi suruyorsa kuyruk zaten dinleniyor
+        if not (self._motor_yukleniyor or self._bekleyen_detay):
+            self.root.after(100, self._poll_queue)
 
     def _progress_cb(self, adim, toplam):
         self._queue.put(("progress", adim, toplam))
@@ -223,8 +271,26 @@ class SimilarityGUI:
             elif item[0] == "done":
                 _, sonuclar, run_time = item
                 self._on_analysis_done(sonuclar, run_time)
-
-        if self._running:
+            elif item[0] == "motor":
+                self._motor_yukleniyor = False
+                hata = item[1]
+                if hata is not None:
+                    self._log(f"[Hata] Motor yuklenemedi: {hata}")
+                    self.status_var.set("Motor yuklenemedi")
+                elif not self._running:
+                    self.status_var.set("Hazir")
+            elif item[0] == "detay":
+                _, d1, d2, detaylar, hata = item
+                self._bekleyen_detay -= 1
+                if not (self._bekleyen_detay or self._running or self._motor_yukleniyor):
+                    self.status_var.set("Hazir")
+                if hata is not None:
+                    self._log(f"[Hata] Detay hesaplanamadi: {d1} <> {d2} :: {hata}")
+                    messagebox.showerror("Hata", f"Detay hesaplanamadi: {hata}")
+                else:
+                    self._detay_penceresi(d1, d2, detaylar)
+
+        if self._running or self._motor_yukleniyor or self._bekleyen_detay:
             self.root.after(100, self._poll_queue)
 
     def _on_analysis_done(self, sonuclar, run_time):
@@ -293,8 +359,11 @@ class SimilarityGUI:
         if not path:
             return
         try:
-            self.db.export_csv(path)
-            messagebox.showinfo("Bilgi", "Sonuclar CSV olarak kaydedildi.")
+            olcum_yolu = self.db.export_csv(path)
+            mesaj = "Sonuclar CSV olarak kaydedildi."
+            if olcum_yolu:
+                mesaj += f"\nRun olcumleri: {olcum_yolu}"
+            messagebox.showinfo("Bilgi", mesaj)
         except Exception as e:
             messagebox.showerror("Hata", f"CSV kaydedilemedi: {e}")
 
@@ -319,13 +388,19 @@ class SimilarityGUI:
             supheli = float(self.supheli_esik.get())
             lex = float(self.lex_w.get())
             sem = float(self.sem_w.get())
-            cfg = {
+            import json
+            # Arayuzde olmayan anahtarlar (blok boyutu vb.) korunur
+            try:
+                with open("config.json", "r", encoding="utf-8") as f:
+                    cfg = json.load(f)
+            except Exception:
+                cfg = {}
+            cfg.update({
                 "kopya_esik": kopya,
                 "supheli_esik": supheli,
                 "lexical_weight": lex,
                 "semantic_weight": sem,
-            }
-            import json
+            })
             with open("config.json", "w", encoding="utf-8") as f:
                 json.dump(cfg, f, ensure_ascii=False, indent=2)
             # Config guncellendikten sonra motorlari yeniden kur
@@ -366,6 +441,60 @@ class SimilarityGUI:
         for r in results:
             self.tree.insert("", tk.END, values=r)
 
+    def _show_olcum(self):
+        """Secili run'in asama sureleri, CPU ve bellek olcumleri."""
+        secim = self.run_list.curselection()
+        if not secim:
+            messagebox.showinfo("Bilgi", "Once calisma gecmisinden bir run secin.")
+            return
+        tarih = self.run_records[secim[0]][0]
+        olcum = self.db.get_run_olcum(tarih)
+        if not olcum:
+            messagebox.showinfo("Bilgi", "Bu run icin olcum kaydi yok.")
+            return
+
+        top = tk.Toplevel(self.root)
+        top.title(f"Olcum: {tarih}")
+        sutunlar = (
+            "asama", "cagri", "adet", "sure", "cpu", "hiz",
+            "rss_mb", "rss_artis_mb", "py_tepe_mb",
+        )
+        tree = ttk.Treeview(top, columns=sutunlar, show="headings", height=16)
+        for c in sutunlar:
+            tree.heading(c, text=c)
+            tree.column(c, width=85, anchor="e")
+        tree.column("asama", width=170, anchor="w")
+
+        def sayi(deger, bicim="{:.1f}"):
+            return "" if deger is None else bicim.format(deger)
+
+        # En uzun suren asama en ustte
+        for ad, a in sorted(olcum.get("asamalar", {}).items(), key=lambda x: -x[1]["sure"]):
+            hiz = a["adet"] / a["sure"] if a["sure"] and a["adet"] else None
+            tree.insert(
+                "",
+                tk.END,
+                values=(
+                    ad,
+                    a["cagri"],
+                    a["adet"],
+                    sayi(a["sure"], "{:.3f}"),
+                    sayi(a["cpu"], "{:.3f}"),
+                    sayi(hiz),
+                    sayi(a.get("rss_mb")),
+                    sayi(a.get("rss_artis_mb")),
+                    sayi(a.get("py_tepe_mb")),
+                ),
+            )
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        ek = [f"{ad}: {n}" for ad, n in olcum.get("sayaclar", {}).items()]
+        ek += [f"Profil: {yol}" for yol in olcum.get("profiller", [])]
+        if ek:
+            tk.Label(top, text="\n".join(ek), justify=tk.LEFT).pack(anchor="w", padx=5)
+
+        tk.Button(top, text="Kapat", command=top.destroy).pack(pady=5)
+
     def _show_detail(self, event):
         item = self.tree.selection()
         if not item:
@@ -374,7 +503,23 @@ class SimilarityGUI:
         if len(vals) < 2:
             return
         d1, d2, tarih = vals[0], vals[1], vals[6]
-        detaylar = self.app.get_detay(d1, d2, tarih)
+
+        # Temiz ciftlerde kanit ilk acilista hesaplanir; arayuz bu sirada donmaz
+        def worker():
+            try:
+                self._queue.put(("detay", d1, d2, self.app.get_detay(d1, d2, tarih), None))
+            except Exception as e:
+                self._queue.put(("detay", d1, d2, None, e))
+
+        dinleniyor = self._running or self._motor_yukleniyor or self._bekleyen_detay
+        self._bekleyen_detay += 1
+        if not self._running:
+            self.status_var.set("Detay hesaplaniyor...")
+        threading.Thread(target=worker, daemon=True).start()
+        if not dinleniyor:
+            self.root.after(100, self._poll_queue)
+
+    def _detay_penceresi(self, d1, d2, detaylar):
         if not detaylar:
             messagebox.showinfo("Bilgi", "Bu eslesme icin detay bulunamadi.")
             return
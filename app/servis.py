@@ -0,0 +1,393 @@
+# File: app\servis.py
+"""
+Yerel HTTP skor servisi. Modeller bir kez yuklenir ve istekler arasinda
+bellekte kalir; ayni anda gelen kodlama istekleri MikroBatch ile tek
+encode cagrisinda birlestirilir.
+
+    python -m app.servis [--port 8765] [--model heavy] [--ocr heavy]
+
+Uc noktalar (JSON):
+    GET  /saglik                      durum ve batch istatistikleri
+    POST /belgeler  {ad, icerik}      belgeyi (base64) dokumanlar/'a alir, metni cikarir
+    POST /skor      {metin1, metin2} | {belge1, belge2} | {ciftler: [...]}
+    POST /analiz    {klasor?, artimli?, base?}   klasor analizi (run olusturur)
+    GET  /runlar                      run listesi
+    GET  /runlar/<tarih>              run sonuclari
+    GET  /runlar/<tarih>/olcum        run'in asama sureleri ve bellek olcumleri
+    GET  /detay?tarih=&d1=&d2=        cift kaniti
+    GET  /komsular?k=&dosya=          kayitli top-k indeksinden en yakin belgeler
+
+Kimlik dogrulama yoktur; varsayilan olarak yalnizca 127.0.0.1'e baglanir.
+"""
+import argparse
+import base64
+import binascii
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from app.similarity_app import SimilarityApp
+from core.lexical_motoru import LexicalMotoru
+from core.mikro_batch import MikroBatch
+from core.model_registry import MODELLER
+
+_DESTEKLENEN = {".pdf", ".docx", ".txt"}
+# Istek govdesi siniri (base64 belge dahil)
+_EN_FAZLA_GOVDE = 256 * 1024 * 1024
+
+
+class ServisHatasi(Exception):
+    """HTTP durum koduyla istemciye donen hata."""
+
+    def __init__(self, kod: int, mesaj: str):
+        super().__init__(mesaj)
+        self.kod = kod
+
+
+class SkorServisi:
+    """SimilarityApp'i istekler arasinda sicak tutan servis mantigi."""
+
+    def __init__(self, app: SimilarityApp, log_cb=None):
+        self.app = app
+        self.log_cb = log_cb
+        self.app.log_cb = log_cb
+        self.batch = MikroBatch(
+            self.app.motor.metinleri_kodla,
+            en_fazla=self.app.config["servis_batch_boyutu"],
+            bekleme_ms=self.app.config["servis_bekleme_ms"],
+        )
+        # Tek belge cikarma (extractor/OCR motoru thread-safe degil)
+        self._cikarma_kilidi = threading.Lock()
+        # Ayni anda tek klasor analizi (SimilarityApp durumu paylasilir)
+        self._analiz_kilidi = threading.Lock()
+
+    def kapat(self):
+        self.batch.kapat()
+
+    def saglik(self) -> dict:
+        return {
+            "durum": "analiz" if self._analiz_kilidi.locked() else "hazir",
+            "model": self.app._run_modeli(),
+            "ocr": self.app.ocr_mode,
+            "batch": self.batch.ozet(),
+            "modeller": MODELLER.ozet(),
+        }
+
+    # ---------------- BELGELER ----------------
+
+    def belge_al(self, istek: dict) -> dict:
+        """Base64 icerigi dokumanlar/ altina yazar ve metni (onbellekli) cikarir."""
+        ad = os.path.basename(str(istek.get("ad") or ""))
+        if os.path.splitext(ad)[1].lower() not in _DESTEKLENEN:
+            raise ServisHatasi(400, f"Desteklenmeyen veya eksik dosya adi: {ad!r}")
+        try:
+            icerik = base64.b64decode(istek["icerik"], validate=True)
+        except (KeyError, TypeError, binascii.Error):
+            raise ServisHatasi(400, "icerik alani base64 olmali")
+
+        yol = os.path.join(self.app.klasor, ad)
+        with self._cikarma_kilidi:
+            with open(yol, "wb") as f:
+                f.write(icerik)
+            metin, onbellekten = self.app._metin_getir(yol)
+        return {"ad": ad, "karakter": len(metin), "onbellek": onbellekten}
+
+    def _belge_birimleri(self, ad: str):
+        """Belgenin kodlanacak (metin, agirlik) birimleri ve tam metni."""
+        ad = os.path.basename(ad)
+        with self._cikarma_kilidi:
+            metin = self.app._belge_metni(ad)
+            if not metin:
+                raise ServisHatasi(404, f"Belge bulunamadi veya bos: {ad}")
+            if self.app.config["semantik_birim"] != "parca":
+                return metin, [(metin, 1.0)]
+            parcalar = self.app._belge_parcalari(ad)
+        if not parcalar:
+            return metin, [(metin, 1.0)]
+        return metin, [(p.metin, float(p.token_sayisi)) for p in parcalar]
+
+    # ---------------- SKOR ----------------
+
+    def skorla(self, istek: dict) -> dict:
+        if "ciftler" in istek:
+            ciftler = istek["ciftler"]
+            if not isinstance(ciftler, list):
+                raise ServisHatasi(400, "ciftler bir liste olmali")
+            return {"sonuclar": self._ciftleri_skorla(ciftler)}
+        return self._ciftleri_skorla([istek])[0]
+
+    def _taraf(self, cift: dict, no: int):
+        """Ciftin bir tarafi: (ad, metin, birimler)."""
+        if f"metin{no}" in cift:
+            metin = str(cift[f"metin{no}"])
+            return f"metin{no}", metin, [(metin, 1.0)]
+        if f"belge{no}" in cift:
+            ad = str(cift[f"belge{no}"])
+            return (ad, *self._belge_birimleri(ad))
+        raise ServisHatasi(400, f"metin{no} veya belge{no} alani gerekli")
+
+    def _ciftleri_skorla(self, ciftler) -> list:
+        """
+        Tum ciftlerin birimleri tek istekte MikroBatch'e verilir; es zamanli
+        diger isteklerle ayni encode cagrisinda kodlanir. Lexical skorlar
+        son analizin korpus IDF'iyle hesaplanir; henuz analiz yoksa istekteki
+        metinler bir kez fit edilir (cift basina fit yapilmaz).
+        """
+        taraflar = []
+        for cift in ciftler:
+            if not isinstance(cift, dict):
+                raise ServisHatasi(400, "Her cift bir JSON nesnesi olmali")
+            taraflar.append((self._taraf(cift, 1), self._taraf(cift, 2)))
+
+        sira = {}
+        for t1, t2 in taraflar:
+            for metin, _ in t1[2] + t2[2]:
+                sira.setdefault(metin, len(sira))
+        emb = self.batch.isle(list(sira))
+
+        motor = self.app.motor
+        tam = {}
+        for t1, t2 in taraflar:
+            tam.setdefault(t1[1], len(tam))
+            tam.setdefault(t2[1], len(tam))
+        lexical = motor.lexical
+        if lexical.belge_sayisi == 0:
+            lexical = LexicalMotoru().fit(list(tam))
+        lex_skorlari = lexical.metin_skorlari(
+            list(tam),
+            [tam[t1[1]] for t1, _ in taraflar],
+            [tam[t2[1]] for _, t2 in taraflar],
+        )
+
+        sonuclar = []
+        for k, ((ad1, metin1, b1), (ad2, metin2, b2)) in enumerate(taraflar):
+            if min(len(metin1), len(metin2)) < motor.MIN_METIN_UZUNLUGU:
+                lex = sem = 0.0
+            else:
+                lex = float(lex_skorlari[k])
+                sem = float(self._vektor(emb, sira, b1) @ self._vektor(emb, sira, b2))
+            final = motor.final_skor(lex, sem)
+            sonuclar.append(self.app._sonuc_satiri(ad1, ad2, lex, sem, final, None))
+        return sonuclar
+
+    @staticmethod
+    def _vektor(emb, sira, birimler):
+        """Birim embedding'lerinin agirlikli ortalamasi (L2-normalize)."""
+        agirlik = np.array([a for _, a in birimler], dtype=np.float32)
+        v = agirlik @ emb[[sira[m] for m, _ in birimler]]
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
+
+    # ---------------- ANALIZ / SONUCLAR ----------------
+
+    def analiz(self, istek: dict) -> dict:
+        klasor = istek.get("klasor") or self.app.klasor
+        if not os.path.isdir(klasor):
+            raise ServisHatasi(400, f"Klasor bulunamadi: {klasor}")
+        if not self._analiz_kilidi.acquire(blocking=False):
+            raise ServisHatasi(409, "Baska bir analiz calisiyor")
+        try:
+            # Cikarma, /belgeler ve /skor istekleriyle ayni extractor'lari kullanir
+            with self._cikarma_kilidi:
+                self.app.klasor_yukle(klasor)
+            sonuclar, run_time = self.app.analiz_et(
+                artimli=bool(istek.get("artimli")), base_tarih=istek.get("base")
+            )
+        finally:
+            self._analiz_kilidi.release()
+        return {
+            "tarih": run_time,
+            "belge": len(self.app.veriler),
+            "cift": len(sonuclar),
+            "kopya": sum(s["durum"] == "KOPYA" for s in sonuclar),
+            "supheli": sum(s["durum"] == "SUPHELI" for s in sonuclar),
+        }
+
+    def runlar(self) -> list:
+        return [
+            dict(zip(("tarih", "model", "ocr_mode"), r))
+            for r in self.app.db.get_runs()
+        ]
+
+    def run_sonuclari(self, tarih: str) -> list:
+        if not self.app.db.run_exists(tarih):
+            raise ServisHatasi(404, f"Run bulunamadi: {tarih}")
+        alanlar = ("dosya1", "dosya2", "lex", "sem", "final", "durum", "tarih")
+        return [dict(zip(alanlar, r)) for r in self.app.db.get_results_by_tarih(tarih)]
+
+    def run_olcumu(self, tarih: str) -> dict:
+        if not self.app.db.run_exists(tarih):
+            raise ServisHatasi(404, f"Run bulunamadi: {tarih}")
+        olcum = self.app.db.get_run_olcum(tarih)
+        if olcum is None:
+            raise ServisHatasi(404, f"Run icin olcum kaydi yok: {tarih}")
+        return olcum
+
+    def detay(self, sorgu: dict) -> list:
+        try:
+            tarih, d1, d2 = (sorgu[k][0] for k in ("tarih", "d1", "d2"))
+        except KeyError:
+            raise ServisHatasi(400, "tarih, d1 ve d2 parametreleri gerekli")
+        with self._cikarma_kilidi:
+            return self.app.get_detay(d1, d2, tarih)
+
+    def komsular(self, sorgu: dict) -> dict:
+        try:
+            k = int(sorgu["k"][0]) if "k" in sorgu else None
+        except ValueError:
+            raise ServisHatasi(400, "k bir tamsayi olmali")
+        if k is not None and k < 1:
+            raise ServisHatasi(400, "k en az 1 olmali")
+        sonuc = self.app.en_yakinlar(k)
+        if not sonuc:
+            raise ServisHatasi(
+                404, "Komsu indeksi yok (aday_modu=topk ile bir analiz calistirin)"
+            )
+        if "dosya" in sorgu:
+            dosya = sorgu["dosya"][0]
+            if dosya not in sonuc:
+                raise ServisHatasi(404, f"Indekste belge yok: {dosya}")
+            sonuc = {dosya: sonuc[dosya]}
+        return {
+            d: [{"dosya": komsu, "skor": skor} for komsu, skor in liste]
+            for d, liste in sonuc.items()
+        }
+
+
+class _Istekci(BaseHTTPRequestHandler):
+    servis: SkorServisi = None
+    sessiz = False
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parca = urlsplit(self.path)
+        yol = parca.path.rstrip("/")
+        if yol == "/saglik":
+            return self._cevapla(self.servis.saglik)
+        if yol == "/runlar":
+            return self._cevapla(self.servis.runlar)
+        if yol.startswith("/runlar/") and yol.endswith("/olcum"):
+            tarih = unquote(yol[len("/runlar/"):-len("/olcum")])
+            return self._cevapla(lambda: self.servis.run_olcumu(tarih))
+        if yol.startswith("/runlar/"):
+            tarih = unquote(yol[len("/runlar/"):])
+            return self._cevapla(lambda: self.servis.run_sonuclari(tarih))
+        if yol == "/detay":
+            sorgu = parse_qs(parca.query)
+            return self._cevapla(lambda: self.servis.detay(sorgu))
+        if yol == "/komsular":
+            sorgu = parse_qs(parca.query)
+            return self._cevapla(lambda: self.servis.komsular(sorgu))
+        self._yaz(404, {"hata": f"Bilinmeyen yol: {yol}"})
+
+    def do_POST(self):
+        yol = urlsplit(self.path).path.rstrip("/")
+        islev = {
+            "/belgeler": self.servis.belge_al,
+            "/skor": self.servis.skorla,
+            "/analiz": self.servis.analiz,
+        }.get(yol)
+        if islev is None:
+            self._govde_atla()
+            return self._yaz(404, {"hata": f"Bilinmeyen yol: {yol}"})
+        self._cevapla(lambda: islev(self._govde()))
+
+    def _govde(self) -> dict:
+        try:
+            uzunluk = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            uzunluk = -1
+        if uzunluk < 0:
+            self.close_connection = True
+            raise ServisHatasi(400, "Gecersiz Content-Length")
+        if uzunluk > _EN_FAZLA_GOVDE:
+            self.close_connection = True
+            raise ServisHatasi(413, "Istek govdesi cok buyuk")
+        try:
+            veri = json.loads(self.rfile.read(uzunluk) or b"{}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ServisHatasi(400, "Gecersiz JSON")
+        if not isinstance(veri, dict):
+            raise ServisHatasi(400, "Istek govdesi bir JSON nesnesi olmali")
+        return veri
+
+    def _govde_atla(self):
+        try:
+            uzunluk = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            uzunluk = -1
+        if 0 < uzunluk <= _EN_FAZLA_GOVDE:
+            self.rfile.read(uzunluk)
+        elif uzunluk:
+            # Okunmayan govde baglantida kalir
+            self.close_connection = True
+
+    def _cevapla(self, islev):
+        try:
+            self._yaz(200, islev())
+        except ServisHatasi as e:
+            self._yaz(e.kod, {"hata": str(e)})
+        except Exception as e:
+            self.log_error("[Hata] %s", e)
+            self._yaz(500, {"hata": str(e)})
+
+    def _yaz(self, kod: int, veri):
+        govde = json.dumps(veri, ensure_ascii=False).encode("utf-8")
+        self.send_response(kod)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(govde)))
+        self.end_headers()
+        self.wfile.write(govde)
+
+    def log_message(self, format, *args):
+        if not self.sessiz:
+            sys.stderr.write(f"[Servis] {self.address_string()} {format % args}\n")
+
+
+def sunucu_kur(servis: SkorServisi, host: str, port: int, sessiz: bool = False):
+    istekci = type("Istekci", (_Istekci,), {"servis": servis, "sessiz": sessiz})
+    sunucu = ThreadingHTTPServer((host, port), istekci)
+    sunucu.daemon_threads = True
+    return sunucu
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m app.servis", description=__doc__.split("\n\n")[0])
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--model", choices=["heavy", "light"], default="heavy")
+    p.add_argument("--ocr", choices=["heavy", "light", "off"], default="heavy")
+    p.add_argument(
+        "--ocr-isit", action="store_true",
+        help="OCR modelini ilk PDF'i beklemeden baslangicta yukle",
+    )
+    p.add_argument("-q", "--sessiz", action="store_true", help="Istek loglarini yazma")
+    args = p.parse_args(argv)
+
+    def log(mesaj):
+        if not args.sessiz or mesaj.startswith(("[Hata]", "[Uyari]")):
+            print(mesaj, file=sys.stderr, flush=True)
+
+    app = SimilarityApp(model_mode=args.model, ocr_mode=args.ocr)
+    if args.ocr_isit and args.ocr != "off":
+        # Property erisimi TrOCR modelini yukler
+        app.doc_processor.extractors[0].ocr_engine
+    servis = SkorServisi(app, log_cb=log)
+    sunucu = sunucu_kur(servis, args.host, args.port, sessiz=args.sessiz)
+    print(f"[Sistem] Servis hazir: http://{args.host}:{args.port}", file=sys.stderr, flush=True)
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sunucu.server_close()
+        servis.kapat()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,170 @@
 # File: app\similarity_app.py
 import os
 import shutil
-import itertools
 import json
+import threading
 from datetime import datetime
 from core.document_processor import DocumentProcessor
-from core.analiz_motoru import BenzerlikMotoru
+from core.hashing import dosya_hash, metin_hash
+from core.komsu_indeksi import KomsuIndeksi
+from core.minhash import MinHashLSH
+from core.model_registry import MODELLER
+from core.olcum import OLCUM, Olcum, profil
+from core.segmentasyon import (
+    SEGMENT_SURUMU,
+    parcalara_bol,
+    parcalari_coz,
+    parcalari_kodla,
+)
 from db.database import ResultDatabase
+from db.cache_database import CacheDatabase
 
 
 class SimilarityApp:
     """PDF benzerlik analizinin ana is mantigini yonetir."""
 
-    def __init__(self, model_mode: str = "heavy", ocr_mode: str = "heavy"):
+    def __init__(
+        self, model_mode: str = "heavy", ocr_mode: str = "heavy", ayarlar: dict | None = None
+    ):
         self.klasor = "dokumanlar"
         os.makedirs(self.klasor, exist_ok=True)
 
         self.model_mode = model_mode
         self.ocr_mode = ocr_mode
 
-        self.config = self._load_config()
-        self.doc_processor = DocumentProcessor(ocr_mode=self.ocr_mode)
-        self.motor = BenzerlikMotoru(
-            mode=self.model_mode,
-            lexical_w=self.config["lexical_weight"],
-            semantic_w=self.config["semantic_weight"],
-        )
+        # config.json uzerine yazilan ayarlar (ornegin komut satirindan)
+        self.ayarlar = dict(ayarlar or {})
+        self.config = {**self._load_config(), **self.ayarlar}
         self.db = ResultDatabase()
+        self.cache_yolu = "db/cache.db"
+        self.cache = CacheDatabase(self.cache_yolu)
+        # Motorlar ilk erisimde kurulur; GUI acilisi model yuklemesini beklemez
+        self._doc_processor = None
+        self._motor = None
+        self._motor_kilidi = threading.Lock()
+        # set_options kilidi beklemeden motoru eskimis isaretler
+        self._motor_eski = False
 
         self.veriler = {}
+        self.parcalar = {}
         self.yeni_yukleme_var = False
         self.log_cb = None
         self.detaylar = {}
+        self.kanit = None
+        # self.kanit'in hazirlandigi run (lazy kanit ayni IDF'i kullanir)
+        self.kanit_tarihi = None
+        self.son_yukleme = {"isabet": 0, "kacirma": 0}
+        # Son run'in asama olcumleri (runs.olcum ile ayni bicim)
+        self.son_olcum = None
+        # Yukleme + analiz olcumleri (run basina; servis istekleri karismaz)
+        self._olcum = Olcum()
+        self._yukleme_profilleri = []
 
     def set_options(self, model_mode: str, ocr_mode: str, log_cb=None):
-        """Model/OCR modlarini gunceller."""
+        """
+        Model/OCR modlarini ve config'i gunceller. Motorlar yeniden kurulur;
+        modeller MODELLER kaydindan geldigi icin yeniden yuklenmez.
+        """
         self.model_mode = model_mode
         self.ocr_mode = ocr_mode
         self.log_cb = log_cb
 
-        self.config = self._load_config()
-        self.doc_processor = DocumentProcessor(ocr_mode=self.ocr_mode)
-        self.motor = BenzerlikMotoru(
+        self.config = {**self._load_config(), **self.ayarlar}
+        self._doc_processor = None
+        # Kilit alinmaz: isinma model yuklerken kilidi tutar ve arayuz
+        # thread'i beklerdi. Motor bir sonraki erisimde yeniden kurulur.
+        self._motor_eski = True
+
+    @property
+    def doc_processor(self) -> DocumentProcessor:
+        # Kurulum ucuzdur; OCR modeli ilk PDF'te yuklenir
+        if self._doc_processor is None:
+            self._doc_processor = self._processor_kur()
+        return self._doc_processor
+
+    @property
+    def motor(self):
+        """Benzerlik motoru; ilk erisimde kurulur (semantik model yuklenir)."""
+        with self._motor_kilidi:
+            if self._motor is None or self._motor_eski:
+                # Bayrak kurulumdan once inir; kurulum sirasinda gelen
+                # set_options cagrisi bir sonraki erisimde yeniden kurdurur
+                self._motor_eski = False
+                self._motor = self._motor_kur()
+            return self._motor
+
+    @property
+    def motor_hazir(self) -> bool:
+        return self._motor is not None and not self._motor_eski
+
+    def isit(self):
+        """Motoru simdi kurar (arka plan thread'inden cagrilir)."""
+        return self.motor
+
+    def _processor_kur(self):
+        cfg = self.config
+        return DocumentProcessor(
+            ocr_mode=self.ocr_mode,
+            pdf_ayarlari={
+                "ocr_batch_boyutu": cfg["ocr_batch_boyutu"],
+                "ocr_gorsel_grubu": cfg["ocr_gorsel_grubu"],
+                "ocr_onbellek_yolu": (
+                    self.cache_yolu if cfg["ocr_onbellegi"] else None
+                ),
+                "ocr_min_karakter": cfg["ocr_min_karakter"],
+                "ocr_kaynak": cfg["ocr_kaynak"],
+                "ocr_dpi": cfg["ocr_dpi"],
+                "ocr_isci_sayisi": cfg["ocr_isci_sayisi"],
+                "ocr_kuyruk_boyutu": cfg["ocr_kuyruk_boyutu"],
+                "ocr_backend": cfg["cikarim_backend"],
+                "onnx_nicemleme": cfg["onnx_nicemleme"],
+            },
+            docx_ayarlari={
+                "dipnotlar": cfg["docx_dipnotlar"],
+                "ustbilgiler": cfg["docx_ustbilgiler"],
+            },
+        )
+
+    def _motor_kur(self):
+        # torch/sentence-transformers/sklearn ilk kurulumda import edilir
+        from core.analiz_motoru import BenzerlikMotoru
+
+        cfg = self.config
+        # Yuklu modeller (semantik + OCR) icin LRU bellek butcesi
+        MODELLER.butce_ayarla(cfg["model_bellek_mb"])
+        return BenzerlikMotoru(
             mode=self.model_mode,
-            lexical_w=self.config["lexical_weight"],
-            semantic_w=self.config["semantic_weight"],
+            lexical_w=cfg["lexical_weight"],
+            semantic_w=cfg["semantic_weight"],
+            blok_boyutu=cfg["skor_blok_boyutu"],
+            cache=self.cache if cfg["embedding_onbellegi"] else None,
+            cache_dtype=cfg["embedding_dtype"],
+            cache_max_mb=cfg["embedding_onbellek_mb"],
+            backend=cfg["cikarim_backend"],
+            nicemleme=cfg["onnx_nicemleme"],
         )
-        self.config = self._load_config()
+
+    def _run_modeli(self):
+        """Run kaydindaki model; ONNX ile uretilen skorlar ayri tutulur."""
+        etiket = self.motor.etiket
+        return f"{self.model_mode}@{etiket}" if etiket else self.model_mode
 
     def klasor_yukle(self, klasor_yolu):
+        # Olcum oturumu yuklemeyle baslar; run sonunda runs kaydina yazilir
+        self._olcum = Olcum()
+        zaman = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._olcum.etkin(), self._profil(f"yukleme_{zaman}") as p:
+            self._klasor_yukle(klasor_yolu)
+        self._yukleme_profilleri = p.dosyalar
+
+    def _klasor_yukle(self, klasor_yolu):
         self.veriler = {}
-        yuklenen_var = False
+        self.parcalar = {}
+        isabet = kacirma = 0
+        sira = []
+        metinler = {}
+        # Onbellekte olmayanlar: hedef yol -> (dosya adi, ozet, anahtar)
+        eksikler = {}
 
         for f in os.listdir(klasor_yolu):
             uzanti = f.lower().rsplit(".", 1)
@@ -65,85 +179,619 @@ class SimilarityApp:
                 shutil.copy(kaynak, hedef)
 
             # Analizde kullanabilmek icin dosya var olsa da metni yukle
+            sira.append(f)
             try:
-                metin = self.doc_processor.metin_cikar(hedef)
-                if metin:
-                    self.veriler[f] = metin
-                    yuklenen_var = True
-                    self._safe_log(f"Yuklendi: {f}")
-                else:
-                    self._safe_log(f"[Uyari] Metin cikarilamadi: {f}")
+                metin, ozet, anahtar = self._onbellek_sorgula(hedef)
             except Exception as e:
                 self._safe_log(f"[Hata] {f} islenemedi: {e}")
+                continue
+            if metin is not None:
+                isabet += 1
+                metinler[f] = metin
+                self._safe_log(f"Yuklendi: {f} (onbellek)")
+            else:
+                eksikler[hedef] = (f, ozet, anahtar)
+
+        # Onbellekte olmayanlar process havuzunda cikarilir; her dosya
+        # bittikce sonucu gelir, hatalar dosya bazinda kalir
+        for yol, metin, hata in self.doc_processor.paralel_metin_cikar(
+            eksikler, self.config["yukleme_isci_sayisi"]
+        ):
+            f, ozet, anahtar = eksikler[yol]
+            kacirma += 1
+            if hata is not None:
+                self._safe_log(f"[Hata] {f} islenemedi: {hata}")
+                continue
+            if metin:
+                self._onbellege_yaz(ozet, anahtar, metin)
+                metinler[f] = metin
+                self._safe_log(f"Yuklendi: {f}")
+            else:
+                self._safe_log(f"[Uyari] Metin cikarilamadi: {f}")
+
+        # Cift sirasi tamamlanma sirasindan bagimsiz kalsin
+        for f in sira:
+            if metinler.get(f):
+                self.veriler[f] = metinler[f]
+                # Parcalama belge basina bir kez yapilir; kanit ve
+                # parca bazli semantik skor ayni listeyi kullanir
+                self.parcalar[f] = self._parcalar_getir(metinler[f])
+
+        self.yeni_yukleme_var = bool(self.veriler)
+        self.son_yukleme = {"isabet": isabet, "kacirma": kacirma}
+        OLCUM.say("metin_onbellek_isabet", isabet)
+        OLCUM.say("metin_onbellek_kacirma", kacirma)
+        self._safe_log(f"Metin onbellegi: {isabet} isabet, {kacirma} kacirma")
+
+    def _parcalar_getir(self, metin):
+        """Metnin parcalarini onbellekten getirir; yoksa bolup kaydeder."""
+        ayar = (
+            f"v{SEGMENT_SURUMU}:{self.config['parca_min_uzunluk']}"
+            f":{self.config['parca_max_token']}"
+        )
+        ozet = metin_hash(metin)
+        if self.config["metin_onbellegi"]:
+            try:
+                veri = self.cache.get_segments(ozet, ayar)
+                if veri is not None:
+                    return parcalari_coz(json.loads(veri))
+            except Exception as e:
+                self._safe_log(f"[Uyari] Parca onbellegi okunamadi: {e}")
 
-        self.yeni_yukleme_var = yuklenen_var
+        parcalar = parcalara_bol(
+            metin,
+            min_len=self.config["parca_min_uzunluk"],
+            max_token=self.config["parca_max_token"],
+        )
+        if self.config["metin_onbellegi"]:
+            try:
+                self.cache.save_segments(
+                    ozet, ayar, json.dumps(parcalari_kodla(parcalar), ensure_ascii=False)
+                )
+            except Exception as e:
+                self._safe_log(f"[Uyari] Parca onbellegine yazilamadi: {e}")
+        return parcalar
+
+    def _belge_parcalari(self, dosya):
+        """Yuklu belgenin parcalari; yoksa (orn. eski run) o an bolunur."""
+        if dosya not in self.parcalar:
+            self.parcalar[dosya] = self._parcalar_getir(self._belge_metni(dosya))
+        return self.parcalar[dosya]
+
+    def _onbellek_sorgula(self, dosya_yolu):
+        """
+        Metni icerik ozeti + extractor anahtarina gore onbellekte arar.
+        (metin veya None, ozet, anahtar) dondurur.
+        """
+        anahtar = self.doc_processor.onbellek_anahtari(dosya_yolu)
+        if not self.config["metin_onbellegi"] or anahtar is None:
+            return None, None, anahtar
+        ozet = dosya_hash(dosya_yolu)
+        return self.cache.get_text(ozet, anahtar), ozet, anahtar
+
+    def _onbellege_yaz(self, ozet, anahtar, metin):
+        # Bos sonuclar (gecici hata olabilir) saklanmaz
+        if ozet is not None and metin:
+            self.cache.save_text(ozet, anahtar, metin)
+
+    def _metin_getir(self, dosya_yolu):
+        """Tek dosya icin onbellekli cikarma. (metin, onbellekten_mi) dondurur."""
+        metin, ozet, anahtar = self._onbellek_sorgula(dosya_yolu)
+        if metin is not None:
+            return metin, True
+        metin = self.doc_processor.metin_cikar(dosya_yolu)
+        self._onbellege_yaz(ozet, anahtar, metin)
+        return metin, False
+
+    def analiz_et(
+        self,
+        progress_cb=None,
+        cancel_cb=None,
+        artimli=False,
+        base_tarih=None,
+        sonuc_cb=None,
+        devam_tarih=None,
+    ):
+        """
+        Yuklu belgeleri karsilastirir. artimli=True ise yalnizca yeni/degismis
+        belgeleri iceren ciftler skorlanir; eski ciftlerin sonuclari temel
+        run'dan (base_tarih veya ayni modlu son run) aktarilir.
+        sonuc_cb verilirse bu cagrida yazilan her cift sonucu, partisi
+        veritabanina commit edildikten sonra ona iletilir. devam_tarih
+        verilirse yarida kalmis o run'a devam edilir; kayitli ciftler
+        yeniden skorlanmaz.
+        Yukleme ve analizin asama olcumleri run kaydina yazilir.
+        """
+        with self._olcum.etkin(), self._profil("run") as p:
+            sonuclar, run_time = self._analiz_et(
+                progress_cb, cancel_cb, artimli, base_tarih, sonuc_cb, devam_tarih
+            )
+            if run_time:
+                p.ad = f"run_{run_time}"
+        if run_time:
+            self._olcum_kaydet(run_time, self._yukleme_profilleri + p.dosyalar)
+        return sonuclar, run_time
 
-    def analiz_et(self, progress_cb=None, cancel_cb=None):
+    def _analiz_et(
+        self, progress_cb, cancel_cb, artimli, base_tarih, sonuc_cb, devam_tarih
+    ):
         if not self.yeni_yukleme_var or len(self.veriler) < 2:
             return [], None
 
         sonuclar = []
-        run_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-        self.db.save_run_meta(run_time, self.model_mode, self.ocr_mode)
         dokumanlar = list(self.veriler.keys())
+        ozetler = {d: metin_hash(self.veriler[d]) for d in dokumanlar}
+
+        yeniler = None
+        bitmis = {}
+        if devam_tarih:
+            meta = self._devam_kontrol(devam_tarih, ozetler)
+            if meta is None:
+                return [], None
+            run_time, base_tarih = devam_tarih, meta[3]
+            if base_tarih:
+                base_tarih, yeniler = self._artimli_plan(
+                    dokumanlar, ozetler, base_tarih, haric=run_time
+                )
+            bitmis = self.db.get_pair_results(run_time)
+            self._safe_log(f"Run {run_time} devam ediyor: {len(bitmis)} cift kayitli")
+        else:
+            # Tarih once alinir; run kendini temel olarak secemez
+            run_time = self._yeni_run_tarihi()
+            if artimli:
+                base_tarih, yeniler = self._artimli_plan(
+                    dokumanlar, ozetler, base_tarih, haric=run_time
+                )
+                if yeniler is not None and not yeniler:
+                    self._safe_log("Artimli analiz: yeni veya degismis belge yok.")
+                    return [], None
+            if yeniler is None:
+                base_tarih = None
+
+            self.db.save_run_meta(
+                run_time, self._run_modeli(), self.ocr_mode, base_tarih=base_tarih
+            )
+            self.db.save_run_docs(run_time, ozetler)
+
+        # Devam edilen run'da zaten yazilmis ciftler (indeks cifti olarak)
+        sira = {d: k for k, d in enumerate(dokumanlar)}
+        bitmis_idx = {
+            (min(sira[d1], sira[d2]), max(sira[d1], sira[d2]))
+            for d1, d2 in bitmis
+            if d1 in sira and d2 in sira
+        }
+        for (d1, d2), (lex, sem, atlandi) in bitmis.items():
+            final = self.motor.final_skor(lex, sem)
+            sonuclar.append(
+                self._sonuc_satiri(d1, d2, lex, sem, final, run_time, atlandi)
+            )
         toplam = len(dokumanlar) * (len(dokumanlar) - 1) // 2
-        adim = 0
+        adim = len(sonuclar)
+        # Sonuclar cift basina commit yerine partiler halinde yazilir
+        yazici = self.db.toplu_yazici(
+            run_time, self.config["db_parti_boyutu"], yazildi_cb=sonuc_cb
+        )
+
+        skorlanmamis = []
+        if yeniler is not None:
+            aktarilan, skorlanmamis = self._onceki_sonuclari_aktar(
+                base_tarih, run_time, dokumanlar, yeniler, yazici,
+                atla=bitmis,
+            )
+            sonuclar += aktarilan
+            adim = len(sonuclar)
+
+        # TF-IDF korpusa bir kez fit edilir, her belge bir kez kodlanir;
+        # ciftler bloklar halinde matris carpimlarindan okunur
+        self._safe_log(f"Korpus hazirlaniyor: {len(dokumanlar)} belge")
+        metinler = [self.veriler[d] for d in dokumanlar]
+        parcalar = None
+        if self.config["semantik_birim"] == "parca":
+            parcalar = [self._belge_parcalari(d) for d in dokumanlar]
+        mod = self.config["aday_modu"]
+        adaylar = None
+        if yeniler is not None:
+            # Yeni x mevcut ve yeni x yeni ciftler; mevcut belgelerin
+            # embedding'leri onbellekten gelir
+            self.motor.korpus_hazirla(metinler, parcalar=parcalar)
+            # Yalnizca yeni belgelerin satirlari gezilir (n x yeni)
+            adaylar = {
+                (min(y, j), max(y, j))
+                for y, d in enumerate(dokumanlar)
+                if d in yeniler
+                for j in range(len(dokumanlar))
+                if j != y
+            }
+            adaylar |= self._eski_adaylar(
+                dokumanlar, metinler, skorlanmamis, sira, mod
+            )
+            adaylar -= bitmis_idx
+            skorlar = self._aday_skorlari(len(dokumanlar), adaylar, atlananlar=False)
+            toplam = adim + len(adaylar)
+        else:
+            if mod == "lsh":
+                adaylar = self._lsh_adaylari(metinler)
+                kodlanacak = {i for cift in adaylar for i in cift}
+                self.motor.korpus_hazirla(
+                    metinler, kodlanacak=kodlanacak, parcalar=parcalar
+                )
+            else:
+                self.motor.korpus_hazirla(metinler, parcalar=parcalar)
+                if mod == "topk":
+                    adaylar = self._topk_adaylari(dokumanlar, metinler)
+
+            if adaylar is None:
+                skorlar = self._cift_skorlari(len(dokumanlar))
+            else:
+                skorlar = self._aday_skorlari(len(dokumanlar), adaylar)
+                if not self._atlananlari_kaydet():
+                    toplam = len(adaylar)
+        # Parca matrisleri ilk kanit gerektiginde hazirlanir
+        self.kanit = None
+        kod = self.motor.son_kodlama
+        self._safe_log(
+            f"Embedding onbellegi: {kod['isabet']} isabet, {kod['kodlanan']} kodlandi"
+        )
 
-        for d1, d2 in itertools.combinations(dokumanlar, 2):
+        iptal = False
+        for i, j, lex, sem, final, atlandi in skorlar:
             if cancel_cb and cancel_cb():
                 self._safe_log("Analiz iptal edildi.")
+                iptal = True
                 break
-
-            try:
-                lex, sem, final = self.motor.hesapla(
-                    self.veriler[d1], self.veriler[d2]
-                )
-            except Exception as e:
-                self._safe_log(f"[Hata] Hesaplama basarisiz: {d1} <> {d2} :: {e}")
+            if (i, j) in bitmis_idx:
                 continue
 
-            durum = "TEMIZ"
-            if final > self.config["kopya_esik"]:
-                durum = "KOPYA"
-            elif final > self.config["supheli_esik"]:
-                durum = "SUPHELI"
-
-            s = {
-                "dosya1": d1,
-                "dosya2": d2,
-                "lex": round(lex, 2),
-                "sem": round(sem, 2),
-                "final": round(final, 2),
-                "durum": durum,
-                "tarih": run_time,
-            }
+            d1, d2 = dokumanlar[i], dokumanlar[j]
+            s = self._sonuc_satiri(d1, d2, lex, sem, final, run_time, atlandi)
 
             try:
-                self.db.save_result(s, tarih=run_time)
+                yazici.sonuc_ekle(s)
             except Exception as e:
                 self._safe_log(f"[Hata] DB kaydi basarisiz: {d1} <> {d2} :: {e}")
                 continue
 
             sonuclar.append(s)
-            try:
-                detay_list = self._chunk_evidence(
-                    self.veriler[d1], self.veriler[d2]
-                )
-                self.detaylar[(d1, d2, run_time)] = detay_list
-                self.db.save_evidences(run_time, d1, d2, detay_list)
-            except Exception as e:
-                self._safe_log(f"[Hata] Detay hesaplanamadi: {d1} <> {d2} :: {e}")
-
             adim += 1
+            # Atlanan ve esik alti ciftlerin kaniti satir acildiginda
+            # get_detay ile hesaplanir
+            if not atlandi and self._kanit_simdi_mi(final):
+                try:
+                    if self.kanit is None or self.kanit_tarihi != run_time:
+                        self._kanit_hazirla(dokumanlar, run_time)
+                    detay_list = self.kanit.kanit_bul(d1, d2)
+                    self.detaylar[(d1, d2, run_time)] = detay_list
+                    yazici.kanit_ekle(d1, d2, detay_list)
+                except Exception as e:
+                    self._safe_log(f"[Hata] Detay hesaplanamadi: {d1} <> {d2} :: {e}")
 
             if progress_cb:
                 progress_cb(adim, toplam)
-            self._safe_log(f"Karsilastirildi: {d1} <> {d2} (final={final:.2f})")
+            if not atlandi:
+                self._safe_log(f"Karsilastirildi: {d1} <> {d2} (final={final:.2f})")
+
+        try:
+            yazici.flush()
+            # Iptal edilen run artimli analizde temel alinmaz, devam ettirilebilir
+            if not iptal:
+                self.db.set_run_complete(run_time)
+        except Exception as e:
+            self._safe_log(f"[Hata] DB kaydi basarisiz: {e}")
 
         # Aynı veriyi tekrar analiz etmemek icin yukleme bayragi sifirlanir
         self.yeni_yukleme_var = False
         return sonuclar, run_time
 
+    def _profil(self, ad):
+        cfg = self.config
+        return profil(
+            cfg["profil_klasoru"],
+            ad,
+            cprofile=cfg["profil_cprofile"],
+            bellek=cfg["profil_tracemalloc"],
+        )
+
+    def _olcum_kaydet(self, run_time, profiller):
+        """
+        Yukleme + analiz olcumlerini run kaydina yazar. Devam edilen run'da
+        onceki calismalarin toplamlarina eklenir.
+        """
+        try:
+            onceki = self.db.get_run_olcum(run_time) or {}
+            olcum = Olcum()
+            olcum.birlestir(onceki)
+            olcum.birlestir(self._olcum.ozet())
+            # Ayni toplamlar bir sonraki run'a tekrar eklenmesin
+            self._olcum = Olcum()
+            ozet = olcum.ozet()
+            ozet["profiller"] = onceki.get("profiller", []) + list(profiller)
+            self.db.save_run_olcum(run_time, ozet)
+        except Exception as e:
+            self._safe_log(f"[Hata] Olcum kaydedilemedi: {e}")
+            return
+        self.son_olcum = ozet
+
+        asamalar = sorted(ozet["asamalar"].items(), key=lambda a: -a[1]["sure"])
+        rss = max((a.get("rss_mb") or 0 for _, a in asamalar), default=0)
+        self._safe_log(
+            "Olcum: "
+            + ", ".join(f"{ad} {a['sure']:.2f} s" for ad, a in asamalar[:4])
+            + (f" (en yuksek asama sonu RSS {rss:.0f} MB)" if rss else "")
+        )
+        for yol in profiller:
+            self._safe_log(f"Profil kaydedildi: {yol}")
+
+    def _sonuc_satiri(self, d1, d2, lex, sem, final, run_time, atlandi=False):
+        # Atlanan ciftlerin skoru 0'dir, TEMIZ olarak kaydedilir
+        durum = "TEMIZ"
+        if final > self.config["kopya_esik"]:
+            durum = "KOPYA"
+        elif final > self.config["supheli_esik"]:
+            durum = "SUPHELI"
+
+        return {
+            "dosya1": d1,
+            "dosya2": d2,
+            "lex": round(lex, 2),
+            "sem": round(sem, 2),
+            "final": round(final, 2),
+            "durum": durum,
+            "tarih": run_time,
+            "atlandi": atlandi,
+        }
+
+    def _yeni_run_tarihi(self):
+        """
+        Kullanilmamis run zaman damgasi. Ayni dakikadaki ikinci run saniyeyle,
+        ayni saniyedekiler "-2", "-3" ... ekiyle ayrilir (siralama korunur).
+        """
+        simdi = datetime.now()
+        tarih = simdi.strftime("%Y-%m-%d %H:%M")
+        if not self.db.run_exists(tarih):
+            return tarih
+        temel = simdi.strftime("%Y-%m-%d %H:%M:%S")
+        tarih, sayac = temel, 1
+        while self.db.run_exists(tarih):
+            sayac += 1
+            tarih = f"{temel}-{sayac}"
+        return tarih
+
+    def _devam_kontrol(self, tarih, ozetler):
+        """
+        Run'a devam edilebilirse meta kaydini, edilemezse None dondurur.
+        Belge kumesi ve metinleri run baslatildigindakiyle ayni olmalidir.
+        """
+        meta = self.db.get_run_meta(tarih)
+        if meta is None:
+            self._safe_log(f"[Hata] Run bulunamadi: {tarih}")
+            return None
+        if self.db.is_run_complete(tarih):
+            self._safe_log(f"[Hata] Run zaten tamamlanmis: {tarih}")
+            return None
+        if (meta[1], meta[2]) != (self._run_modeli(), self.ocr_mode):
+            self._safe_log(
+                f"[Hata] Run {tarih} farkli modlarla baslatilmis: {meta[1]}/{meta[2]}"
+            )
+            return None
+        if self.db.get_run_docs(tarih) != ozetler:
+            self._safe_log(f"[Hata] Run {tarih} baslatildiktan sonra belgeler degismis")
+            return None
+        return meta
+
+    def _artimli_plan(self, dokumanlar, ozetler, base_tarih=None, haric=None):
+        """
+        Temel run'i ve yeni/degismis belgeleri belirler.
+        (base_tarih, yeniler) dondurur; temel run yoksa (None, None).
+        haric: temel alinamayacak run (yeni veya devam edilen run'in kendisi).
+        """
+        base = base_tarih or self.db.get_latest_base_run(
+            self._run_modeli(), self.ocr_mode, haric=haric
+        )
+        if base is not None and base == haric:
+            self._safe_log(f"[Uyari] Run {base} kendisinin temel run'i olamaz")
+            base = None
+        onceki = self.db.get_run_docs(base) if base else {}
+        if not onceki:
+            self._safe_log("Artimli analiz icin onceki run bulunamadi; tam analiz yapiliyor.")
+            return None, None
+
+        yeniler = {d for d in dokumanlar if onceki.get(d) != ozetler[d]}
+        self._safe_log(
+            f"Artimli analiz: temel run {base}, {len(yeniler)} yeni/degismis belge"
+        )
+        return base, yeniler
+
+    def _onceki_sonuclari_aktar(
+        self, base_tarih, run_time, dokumanlar, yeniler, yazici, atla=()
+    ):
+        """
+        Iki belgesi de degismemis ciftlerin skorlarini temel run'dan yeni
+        run'a aktarir. Durum mevcut agirlik/esiklerle yeniden belirlenir.
+        Temel run'da skorlanmamis (atlandi veya hic kaydi olmayan) ciftler
+        aktarilmaz; (aktarilan sonuclar, skorlanmamis (dosya1, dosya2)
+        ciftleri) dondurulur. atla: yeni run'da zaten kayitli ciftler.
+        """
+        onceki = self.db.get_pair_results(base_tarih)
+        eskiler = [d for d in dokumanlar if d not in yeniler]
+        aktarilan = []
+        skorlanmamis = []
+        for a in range(len(eskiler)):
+            for b in range(a + 1, len(eskiler)):
+                d1, d2 = eskiler[a], eskiler[b]
+                if (d1, d2) in atla or (d2, d1) in atla:
+                    continue
+                kayit = onceki.get((d1, d2))
+                if kayit is None:
+                    kayit = onceki.get((d2, d1))
+                    if kayit is not None:
+                        d1, d2 = d2, d1
+                # Aday elemeyle atlanan cift TEMIZ gibi aktarilmaz
+                if kayit is None or kayit[2]:
+                    skorlanmamis.append((d1, d2))
+                    continue
+                lex, sem, _ = kayit
+                final = self.motor.final_skor(lex, sem)
+                s = self._sonuc_satiri(d1, d2, lex, sem, final, run_time)
+                try:
+                    yazici.sonuc_ekle(s)
+                except Exception as e:
+                    self._safe_log(f"[Hata] DB kaydi basarisiz: {d1} <> {d2} :: {e}")
+                    continue
+                aktarilan.append(s)
+
+        yazici.flush()
+        self.db.copy_evidences(
+            base_tarih, run_time, [(s["dosya1"], s["dosya2"]) for s in aktarilan]
+        )
+        self._safe_log(
+            f"Temel run'dan aktarilan cift: {len(aktarilan)}, "
+            f"temel run'da skorlanmamis: {len(skorlanmamis)}"
+        )
+        return aktarilan, skorlanmamis
+
+    def _eski_adaylar(self, dokumanlar, metinler, skorlanmamis, sira, mod):
+        """
+        Temel run'da skorlanmamis eski ciftlerden bu run'da skorlanacaklar.
+        "hepsi" modunda tamami, lsh/topk modunda yalnizca guncel aday
+        eleme tarafindan secilenler (tam analizle ayni sonuc).
+        """
+        if not skorlanmamis:
+            return set()
+        ciftler = {
+            (min(sira[d1], sira[d2]), max(sira[d1], sira[d2]))
+            for d1, d2 in skorlanmamis
+        }
+        if mod == "lsh":
+            return ciftler & self._lsh_adaylari(metinler)
+        if mod == "topk":
+            return ciftler & self._topk_adaylari(dokumanlar, metinler)
+        return ciftler
+
+    def _cift_skorlari(self, n):
+        """Motorun blok ciktilarindan (i, j, lex, sem, final, atlandi) uretir."""
+        for baslangic, bitis, lex, sem, final in self.motor.korpus_bloklari(
+            self.config["skor_blok_boyutu"]
+        ):
+            for i in range(baslangic, bitis):
+                a = i - baslangic
+                for j in range(i + 1, n):
+                    b = j - baslangic
+                    yield (
+                        i, j, float(lex[a, b]), float(sem[a, b]), float(final[a, b]), False
+                    )
+
+    def _lsh_adaylari(self, metinler):
+        """MinHash LSH ile tam skorlanacak aday ciftleri secer."""
+        lsh = MinHashLSH(
+            perm_sayisi=self.config["lsh_perm_sayisi"],
+            shingle=self.config["lsh_shingle"],
+            esik=self.config["lsh_esik"],
+        )
+        with OLCUM.asama("aday_secimi", adet=len(metinler)):
+            adaylar = lsh.aday_ciftler(lsh.imzalar(metinler))
+        toplam = len(metinler) * (len(metinler) - 1) // 2
+        self._safe_log(
+            f"LSH aday eleme: {len(adaylar)}/{toplam} cift tam skorlanacak "
+            f"(esik={lsh.esik}, {lsh.bant_sayisi} bant x {lsh.bant_satiri} satir)"
+        )
+        return set(adaylar)
+
+    def _topk_adaylari(self, dokumanlar, metinler):
+        """
+        Her belgenin embedding uzayindaki en yakin k komsusunu aday yapar.
+        Aday sayisi n*k ile sinirlidir; indeks bir sonraki sorgular icin
+        diske kaydedilir.
+        """
+        with OLCUM.asama("aday_secimi", adet=len(dokumanlar)):
+            indeks = KomsuIndeksi(blok_boyutu=self.config["skor_blok_boyutu"]).kur(
+                dokumanlar,
+                self.motor.embeddingler,
+                ozetler=[metin_hash(m) for m in metinler],
+            )
+        try:
+            indeks.kaydet(self._komsu_indeksi_yolu())
+        except Exception as e:
+            self._safe_log(f"[Uyari] Komsu indeksi kaydedilemedi: {e}")
+
+        k = self.config["topk_k"]
+        with OLCUM.asama("aday_secimi"):
+            komsular, _ = indeks.ara(k)
+        adaylar = set()
+        for i, satir in enumerate(komsular):
+            for j in satir:
+                j = int(j)
+                adaylar.add((min(i, j), max(i, j)))
+        toplam = len(dokumanlar) * (len(dokumanlar) - 1) // 2
+        self._safe_log(f"Top-{k} komsu: {len(adaylar)}/{toplam} cift tam skorlanacak")
+        return adaylar
+
+    def _komsu_indeksi_yolu(self):
+        return os.path.join("db", f"komsu_indeksi_{self.motor.model_anahtari}.npz")
+
+    def en_yakinlar(self, k: int | None = None):
+        """
+        Kayitli komsu indeksinden her belge icin en yakin k belgeyi
+        {dosya: [(komsu, skor), ...]} olarak dondurur.
+        """
+        indeks = KomsuIndeksi.yukle(self._komsu_indeksi_yolu())
+        if indeks is None:
+            return {}
+        komsular, skorlar = indeks.ara(k or self.config["topk_k"])
+        return {
+            indeks.anahtarlar[i]: [
+                (indeks.anahtarlar[int(j)], float(sk))
+                for j, sk in zip(komsular[i], skorlar[i])
+            ]
+            for i in range(len(indeks))
+        }
+
+    def _atlananlari_kaydet(self):
+        """
+        Aday elemeyle atlanan ciftler TEMIZ/atlandi=1 olarak yazilir mi?
+        Ayar verilmemisse (null) lsh modunda evet, topk modunda hayir.
+        """
+        deger = self.config["atlananlari_kaydet"]
+        if deger is None:
+            return self.config["aday_modu"] == "lsh"
+        return deger
+
+    def _aday_skorlari(self, n, adaylar, atlananlar=True):
+        """
+        Yalnizca aday ciftleri skorlar; cift sirasi tam moddakiyle aynidir.
+        Elenenler kaydediliyorsa (_atlananlari_kaydet, atlananlar=True)
+        digerlerini atlandi=True ve sifir skorla da uretir; bu durumda tum
+        n(n-1)/2 cift gezilir. Aksi halde yalnizca aday kumesi gezilir.
+        """
+        kaydet = atlananlar and self._atlananlari_kaydet()
+        ciftler = sorted(adaylar)
+        lex = sem = final = None
+        if ciftler:
+            lex, sem, final = self.motor.cift_skorlari(
+                [c[0] for c in ciftler], [c[1] for c in ciftler]
+            )
+        if not kaydet:
+            for k, (i, j) in enumerate(ciftler):
+                yield i, j, float(lex[k]), float(sem[k]), float(final[k]), False
+            return
+
+        skorlar = {
+            cift: (float(lex[k]), float(sem[k]), float(final[k]))
+            for k, cift in enumerate(ciftler)
+        }
+        for i in range(n):
+            for j in range(i + 1, n):
+                skor = skorlar.get((i, j))
+                if skor is None:
+                    yield i, j, 0.0, 0.0, 0.0, True
+                else:
+                    yield (i, j, *skor, False)
+
+    def _kanit_simdi_mi(self, final):
+        """Kanit analiz sirasinda mi hesaplanir? Varsayilan: yalnizca supheli+ ciftler."""
+        if self.config["kanit_modu"] == "hepsi":
+            return True
+        return final > self.config["supheli_esik"]
+
     def get_detay(self, d1, d2, tarih):
         key = (d1, d2, tarih)
         alt_key = (d2, d1, tarih)
@@ -151,57 +799,55 @@ class SimilarityApp:
             return self.detaylar[key]
         if alt_key in self.detaylar:
             return self.detaylar[alt_key]
-        return self.db.get_evidences(tarih, d1, d2)
-
-    def _chunk_evidence(self, metin1, metin2, top_n=3):
-        """Cümle/paragraph bazinda en benzer parcalari getirir."""
-        parcalar1 = self._metni_parcalara_bol(metin1)
-        parcalar2 = self._metni_parcalara_bol(metin2)
-
-        if not parcalar1 or not parcalar2:
-            return []
+        kayitli = self.db.get_evidences(tarih, d1, d2)
+        if kayitli is not None:
+            return kayitli
 
+        # Analizde kanit uretilmemis cift: istek aninda hesapla ve sakla
+        detay_list = self._kanit_hesapla(d1, d2, tarih)
+        self.detaylar[key] = detay_list
         try:
-            tfidf_texts = parcalar1 + parcalar2
-            vectorizer = BenzerlikMotoru._shared_vectorizer()
-            tfidf = vectorizer.fit_transform(tfidf_texts)
-            m1 = tfidf[0 : len(parcalar1)]
-            m2 = tfidf[len(parcalar1) :]
-            sim_matrix = m1 * m2.T  # sparse
-
-            # En yuksek top_n skor
-            best = []
-            for i, row in enumerate(sim_matrix):
-                row = row.toarray().ravel()
-                if not row.size:
-                    continue
-                j = row.argmax()
-                skor = row[j]
-                best.append((skor, parcalar1[i], parcalar2[j]))
-
-            best = sorted(best, key=lambda x: x[0], reverse=True)[:top_n]
-            return [
-                {"p1": p1, "p2": p2, "score": float(skor)}
-                for skor, p1, p2 in best
-                if skor > 0
-            ]
-        except Exception:
+            self.db.save_evidences(tarih, d1, d2, detay_list)
+        except Exception as e:
+            self._safe_log(f"[Hata] Detay kaydedilemedi: {d1} <> {d2} :: {e}")
+        return detay_list
+
+    def _kanit_hesapla(self, d1, d2, tarih):
+        """
+        Tek cift icin kanit. Analizdeki kanitla ayni IDF'i kullanmak icin
+        parca matrisi run'in tum belgeleri uzerinde (run basina bir kez)
+        hazirlanir.
+        """
+        kanit = self.kanit
+        if kanit is None or self.kanit_tarihi != tarih:
+            dokumanlar = list(self.db.get_run_docs(tarih)) or [d1, d2]
+            kanit = self._kanit_hazirla(dokumanlar, tarih)
+        if d1 not in kanit or d2 not in kanit:
             return []
+        return kanit.kanit_bul(d1, d2)
+
+    def _belge_metni(self, dosya):
+        """Yuklu metin yoksa dokumanlar/ altindaki kopyadan (onbellekli) okur."""
+        if dosya in self.veriler:
+            return self.veriler[dosya]
+        yol = os.path.join(self.klasor, dosya)
+        if not os.path.exists(yol):
+            return ""
+        try:
+            return self._metin_getir(yol)[0]
+        except Exception as e:
+            self._safe_log(f"[Hata] {dosya} okunamadi: {e}")
+            return ""
 
-    def _metni_parcalara_bol(self, metin, min_len=30):
-        raw_parts = []
-        for sep in [".", "\n", ";"]:
-            if sep in metin:
-                raw_parts = metin.split(sep)
-                break
-        if not raw_parts:
-            raw_parts = [metin]
-        parts = []
-        for p in raw_parts:
-            t = " ".join(p.split()).strip()
-            if len(t) >= min_len:
-                parts.append(t)
-        return parts
+    def _kanit_hazirla(self, dokumanlar, tarih):
+        """Run'daki tum belgelerin parca matrislerini bir kez hazirlar."""
+        from core.kanit_motoru import KanitMotoru
+
+        self.kanit = KanitMotoru().hazirla(
+            {d: [p.metin for p in self._belge_parcalari(d)] for d in dokumanlar}
+        )
+        self.kanit_tarihi = tarih
+        return self.kanit
 
     def _safe_log(self, msg: str):
         if self.log_cb:
@@ -222,6 +868,45 @@ class SimilarityApp:
                 "semantic_weight": float(cfg.get("semantic_weight", 0.3)),
                 "kopya_esik": float(cfg.get("kopya_esik", 0.75)),
                 "supheli_esik": float(cfg.get("supheli_esik", 0.5)),
+                "skor_blok_boyutu": int(cfg.get("skor_blok_boyutu", 512)),
+                "metin_onbellegi": bool(cfg.get("metin_onbellegi", True)),
+                "yukleme_isci_sayisi": int(cfg.get("yukleme_isci_sayisi", 0)),
+                "ocr_batch_boyutu": int(cfg.get("ocr_batch_boyutu", 16)),
+                "ocr_gorsel_grubu": int(cfg.get("ocr_gorsel_grubu", 8)),
+                "ocr_onbellegi": bool(cfg.get("ocr_onbellegi", True)),
+                "aday_modu": str(cfg.get("aday_modu", "hepsi")),
+                "lsh_esik": float(cfg.get("lsh_esik", 0.1)),
+                "lsh_shingle": int(cfg.get("lsh_shingle", 3)),
+                "lsh_perm_sayisi": int(cfg.get("lsh_perm_sayisi", 128)),
+                "topk_k": int(cfg.get("topk_k", 5)),
+                "atlananlari_kaydet": (
+                    None
+                    if cfg.get("atlananlari_kaydet") is None
+                    else bool(cfg["atlananlari_kaydet"])
+                ),
+                "db_parti_boyutu": int(cfg.get("db_parti_boyutu", 1000)),
+                "kanit_modu": str(cfg.get("kanit_modu", "supheli")),
+                "embedding_onbellegi": bool(cfg.get("embedding_onbellegi", True)),
+                "embedding_dtype": str(cfg.get("embedding_dtype", "float16")),
+                "embedding_onbellek_mb": float(cfg.get("embedding_onbellek_mb", 512)),
+                "parca_min_uzunluk": int(cfg.get("parca_min_uzunluk", 30)),
+                "parca_max_token": int(cfg.get("parca_max_token", 80)),
+                "semantik_birim": str(cfg.get("semantik_birim", "belge")),
+                "docx_dipnotlar": bool(cfg.get("docx_dipnotlar", False)),
+                "docx_ustbilgiler": bool(cfg.get("docx_ustbilgiler", False)),
+                "ocr_min_karakter": int(cfg.get("ocr_min_karakter", 50)),
+                "ocr_kaynak": str(cfg.get("ocr_kaynak", "gorsel")),
+                "ocr_dpi": int(cfg.get("ocr_dpi", 200)),
+                "ocr_isci_sayisi": int(cfg.get("ocr_isci_sayisi", 2)),
+                "ocr_kuyruk_boyutu": int(cfg.get("ocr_kuyruk_boyutu", 64)),
+                "cikarim_backend": str(cfg.get("cikarim_backend", "torch")),
+                "onnx_nicemleme": str(cfg.get("onnx_nicemleme", "avx2")),
+                "servis_batch_boyutu": int(cfg.get("servis_batch_boyutu", 64)),
+                "servis_bekleme_ms": float(cfg.get("servis_bekleme_ms", 5)),
+                "model_bellek_mb": float(cfg.get("model_bellek_mb", 4096)),
+                "profil_cprofile": bool(cfg.get("profil_cprofile", False)),
+                "profil_tracemalloc": bool(cfg.get("profil_tracemalloc", False)),
+                "profil_klasoru": str(cfg.get("profil_klasoru", "db/profiller")),
             }
         except Exception:
             return {
@@ -229,4 +914,39 @@ class SimilarityApp:
                 "semantic_weight": 0.3,
                 "kopya_esik": 0.75,
                 "supheli_esik": 0.5,
+                "skor_blok_boyutu": 512,
+                "metin_onbellegi": True,
+                "yukleme_isci_sayisi": 0,
+                "ocr_batch_boyutu": 16,
+                "ocr_gorsel_grubu": 8,
+                "ocr_onbellegi": True,
+                "aday_modu": "hepsi",
+                "lsh_esik": 0.1,
+                "lsh_shingle": 3,
+                "lsh_perm_sayisi": 128,
+                "topk_k": 5,
+                "atlananlari_kaydet": None,
+                "db_parti_boyutu": 1000,
+                "kanit_modu": "supheli",
+                "embedding_onbellegi": True,
+                "embedding_dtype": "float16",
+                "embedding_onbellek_mb": 512,
+                "parca_min_uzunluk": 30,
+                "parca_max_token": 80,
+                "semantik_birim": "belge",
+                "docx_dipnotlar": False,
+                "docx_ustbilgiler": False,
+                "ocr_min_karakter": 50,
+                "ocr_kaynak": "gorsel",
+                "ocr_dpi": 200,
+                "ocr_isci_sayisi": 2,
+                "ocr_kuyruk_boyutu": 64,
+                "cikarim_backend": "torch",
+                "onnx_nicemleme": "avx2",
+                "servis_batch_boyutu": 64,
+                "servis_bekleme_ms": 5,
+                "model_bellek_mb": 4096,
+                "profil_cprofile": False,
+                "profil_tracemalloc": False,
+                "profil_klasoru": "db/profiller",
             }
@@ -1,10 +1,13 @@
 # File: core\analiz_motoru.py
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from core.hashing import metin_hash
+from core.lexical_motoru import LexicalMotoru
 from core.model_paths import resolve_model_path
+from core.model_registry import MODELLER
+from core.olcum import OLCUM
+from core.onnx_backend import model_etiketi, semantik_modeli_yukle
 
 
 class BenzerlikMotoru:
@@ -15,31 +18,78 @@ class BenzerlikMotoru:
         "light": ("distiluse-base-multilingual-cased-v1", "semantic_light"),
     }
 
-    def __init__(self, mode: str = "heavy", lexical_w: float = 0.7, semantic_w: float = 0.3):
+    # Cok kisa metinler anlamsiz sonuc uretir
+    MIN_METIN_UZUNLUGU = 10
+
+    def __init__(
+        self,
+        mode: str = "heavy",
+        lexical_w: float = 0.7,
+        semantic_w: float = 0.3,
+        batch_size: int = 32,
+        blok_boyutu: int = 512,
+        cache=None,
+        cache_dtype: str = "float16",
+        cache_max_mb: float = 512,
+        backend: str = "torch",
+        nicemleme: str = "",
+    ):
         model_name, alias = self.MODEL_MAP.get(mode, self.MODEL_MAP["heavy"])
-        model_path = resolve_model_path(model_name, alias)
-        print(f"[Sistem] Semantik yapay zeka modeli yukleniyor... ({model_path})")
-        self.semantic_model = SentenceTransformer(model_path)
+        self.alias = alias
+        # Model process genelinde paylasilir; ayar degisikligi yeniden yuklemez
+        self.semantic_model, self.backend = MODELLER.getir(
+            "semantik",
+            alias,
+            model_etiketi(backend, nicemleme) or "torch",
+            lambda: self._model_yukle(resolve_model_path(model_name, alias), backend, nicemleme),
+        )
+        # Embedding onbellegi ve komsu indeksi backend'e gore ayrilir
+        self.etiket = model_etiketi(self.backend, nicemleme)
+        self.model_anahtari = f"{alias}@{self.etiket}" if self.etiket else alias
         self.lexical_w = lexical_w
         self.semantic_w = semantic_w
+        self.batch_size = batch_size
+        self.lexical = LexicalMotoru(blok_boyutu=blok_boyutu)
+        # Kalici embedding onbellegi (CacheDatabase); None ise devre disi
+        self.cache = cache
+        self.cache_dtype = cache_dtype
+        self.cache_max_bayt = int(cache_max_mb * 1024 * 1024)
+        self.son_kodlama = {"isabet": 0, "kodlanan": 0}
+        self._emb = None
+        self._kisa = None
+
+    @staticmethod
+    def _model_yukle(model_path, backend, nicemleme):
+        """(model, gercek backend) dondurur; ONNX yuklenemezse PyTorch'a duser."""
+        from sentence_transformers import SentenceTransformer
+
+        print(f"[Sistem] Semantik yapay zeka modeli yukleniyor... ({model_path})")
+        model, gercek = None, "torch"
+        if backend == "onnx":
+            try:
+                model, gercek = semantik_modeli_yukle(model_path, nicemleme), "onnx"
+            except Exception as e:
+                print(f"[Uyari] ONNX backend yuklenemedi, PyTorch kullaniliyor: {e}")
+        if model is None:
+            model = SentenceTransformer(model_path)
         print("[Sistem] Analiz motoru hazir!")
+        return model, gercek
 
     def hesapla(self, metin1, metin2):
         """
         Iki metin icin lexical, semantik ve agirlikli final skorunu dondurur.
         """
+        with OLCUM.asama("hesapla", adet=1):
+            return self._hesapla(metin1, metin2)
 
-        # Cok kisa metinler anlamsiz sonuc uretir
-        if len(metin1) < 10 or len(metin2) < 10:
+    def _hesapla(self, metin1, metin2):
+        if (
+            len(metin1) < self.MIN_METIN_UZUNLUGU
+            or len(metin2) < self.MIN_METIN_UZUNLUGU
+        ):
             return 0, 0, 0
 
-        # ---------------- LEXICAL BENZERLIK ----------------
-        try:
-            vectorizer = TfidfVectorizer()
-            tfidf = vectorizer.fit_transform([metin1, metin2])
-            lexical_score = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
-        except Exception:
-            lexical_score = 0.0
+        lexical_score = self.lexical_skor(metin1, metin2)
 
         # ---------------- SEMANTIC BENZERLIK ----------------
         try:
@@ -51,12 +101,188 @@ class BenzerlikMotoru:
         except Exception:
             semantic_score = 0.0
 
-        # ---------------- AGIRLIKLI SKOR ----------------
-        final_score = (lexical_score * self.lexical_w) + (semantic_score * self.semantic_w)
+        return lexical_score, semantic_score, self.final_skor(
+            lexical_score, semantic_score
+        )
+
+    def lexical_skor(self, metin1, metin2):
+        """Iki metin icin TF-IDF cosine benzerligi."""
+        try:
+            vectorizer = TfidfVectorizer()
+            tfidf = vectorizer.fit_transform([metin1, metin2])
+            return cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
+        except Exception:
+            return 0.0
+
+    def final_skor(self, lexical_score, semantic_score):
+        """Agirlikli final skor (skaler veya numpy dizisi)."""
+        return (lexical_score * self.lexical_w) + (semantic_score * self.semantic_w)
+
+    def metinleri_kodla(self, metinler):
+        """
+        Tum metinleri tek seferde toplu kodlar.
+        Satirlari L2-normalize edilmis (n, d) float32 matris dondurur.
+        Onbellek varsa yalnizca daha once gorulmemis metinler kodlanir.
+        """
+        metinler = list(metinler)
+        if self.cache is None:
+            self.son_kodlama = {"isabet": 0, "kodlanan": len(metinler)}
+            OLCUM.say("embedding_kodlanan", len(metinler))
+            return self._normalize(self._encode(metinler))
+
+        hashler = [metin_hash(m) for m in metinler]
+        bulunan = self.cache.get_embeddings(hashler, self.model_anahtari)
+
+        # Ayni metin birden fazla kez gecse de bir kez kodlanir
+        eksik = {}
+        for h, m in zip(hashler, metinler):
+            if h not in bulunan and h not in eksik:
+                eksik[h] = m
+        if eksik:
+            yeni = self._normalize(self._encode(list(eksik.values())))
+            # Onbellek hassasiyetinden gecirilir; soguk ve sicak run ayni skoru verir
+            yeni = yeni.astype(self.cache_dtype).astype(np.float32)
+            yeni_map = dict(zip(eksik.keys(), yeni))
+            self.cache.save_embeddings(self.model_anahtari, yeni_map, dtype=self.cache_dtype)
+            self.cache.evict_embeddings(self.cache_max_bayt)
+            bulunan.update(yeni_map)
+
+        self.son_kodlama = {"isabet": len(metinler) - len(eksik), "kodlanan": len(eksik)}
+        OLCUM.say("embedding_isabet", len(metinler) - len(eksik))
+        OLCUM.say("embedding_kodlanan", len(eksik))
+        return self._normalize(np.stack([bulunan[h] for h in hashler]))
 
-        return lexical_score, semantic_score, final_score
+    def _encode(self, metinler):
+        with OLCUM.asama("kodlama", adet=len(metinler)):
+            emb = self.semantic_model.encode(
+                metinler,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            return np.asarray(emb, dtype=np.float32)
 
     @staticmethod
-    def _shared_vectorizer():
-        """Chunk karsilastirmada paylasilan basit TF-IDF vectorizer."""
-        return TfidfVectorizer()
+    def _normalize(emb):
+        emb = np.asarray(emb, dtype=np.float32)
+        normlar = np.linalg.norm(emb, axis=1, keepdims=True)
+        normlar[normlar == 0] = 1.0
+        return emb / normlar
+
+    def korpus_hazirla(self, metinler, kodlanacak=None, parcalar=None):
+        """
+        Korpus bazli skorlama icin hazirlik: TF-IDF bir kez fit edilir,
+        her belge bir kez kodlanir. Sonrasinda korpus_bloklari veya
+        cift_skorlari kullanilir. kodlanacak verilirse yalnizca bu
+        indeksler kodlanir (aday eleme sonrasi); digerleri sifir vektor kalir.
+        parcalar verilirse (belge sirasiyla Parca listeleri) belge
+        embedding'i parca embedding'lerinin token agirlikli ortalamasidir.
+        """
+        metinler = list(metinler)
+        self._kisa = self._kisa_maske(metinler)
+        with OLCUM.asama("tfidf", adet=len(metinler)):
+            self.lexical.fit(metinler)
+        secili = range(len(metinler)) if kodlanacak is None else sorted(kodlanacak)
+        if parcalar is None:
+            emb = self._guvenli_kodla([metinler[i] for i in secili])
+        else:
+            emb = self._guvenli_kodla(
+                [metinler[i] for i in secili],
+                parcalar=[parcalar[i] for i in secili],
+            )
+        if kodlanacak is None:
+            self._emb = emb
+            return
+
+        self._emb = np.zeros((len(metinler), emb.shape[1]), dtype=np.float32)
+        if secili:
+            self._emb[secili] = emb
+
+    @property
+    def embeddingler(self):
+        """Son korpus_hazirla cagrisinin L2-normalize embedding matrisi."""
+        return self._emb
+
+    def cift_skorlari(self, i_dizi, j_dizi):
+        """
+        Secili ciftler icin (lex, sem, final) dizileri.
+        Tum ust ucgen yerine yalnizca aday ciftler hesaplanir.
+        """
+        if self._emb is None:
+            raise RuntimeError("Once korpus_hazirla cagrilmalidir.")
+        i_dizi = np.asarray(i_dizi, dtype=np.int64)
+        j_dizi = np.asarray(j_dizi, dtype=np.int64)
+        with OLCUM.asama("skorlama", adet=len(i_dizi)):
+            lex = self.lexical.cift_skorlari(i_dizi, j_dizi)
+            sem = np.einsum("ij,ij->i", self._emb[i_dizi], self._emb[j_dizi])
+            kisa = self._kisa[i_dizi] | self._kisa[j_dizi]
+            lex[kisa] = 0.0
+            sem[kisa] = 0.0
+            return lex, sem, self.final_skor(lex, sem)
+
+    def korpus_bloklari(self, blok_boyutu: int | None = None):
+        """
+        Ust ucgen skorlarini bloklar halinde uretir:
+        (baslangic, bitis, lex_blok, sem_blok, final_blok).
+        Blok sutunlari baslangic indeksinden korpus sonuna kadardir.
+        """
+        if self._emb is None:
+            raise RuntimeError("Once korpus_hazirla cagrilmalidir.")
+        # Olcum yalnizca blok uretimini kapsar; adet blogun ust ucgen ciftleri
+        yield from OLCUM.uretec(
+            "skorlama", self._bloklar(blok_boyutu), adet=self._blok_cift_sayisi
+        )
+
+    def _bloklar(self, blok_boyutu):
+        for baslangic, bitis, lex in self.lexical.blok_skorlari(blok_boyutu):
+            sem = self._emb[baslangic:bitis] @ self._emb[baslangic:].T
+            kisa_satir = self._kisa[baslangic:bitis]
+            kisa_sutun = self._kisa[baslangic:]
+            for blok in (lex, sem):
+                blok[kisa_satir, :] = 0.0
+                blok[:, kisa_sutun] = 0.0
+            yield baslangic, bitis, lex, sem, self.final_skor(lex, sem)
+
+    @staticmethod
+    def _blok_cift_sayisi(blok):
+        baslangic, bitis, _, _, final = blok
+        satir = bitis - baslangic
+        return satir * final.shape[1] - satir * (satir + 1) // 2
+
+    def parcalardan_kodla(self, metinler, parcalar):
+        """
+        Her belgenin parcalarini kodlar (parca ozetleriyle onbellekten) ve
+        token sayisi agirlikli ortalamayi L2-normalize eder. Parcasi olmayan
+        belgeler tum metinle kodlanir.
+        """
+        birimler = [ps if ps else None for ps in parcalar]
+        duz = []
+        for metin, ps in zip(metinler, birimler):
+            duz.extend([p.metin for p in ps] if ps else [metin])
+        emb = self.metinleri_kodla(duz)
+
+        sonuc = np.zeros((len(metinler), emb.shape[1]), dtype=np.float32)
+        i = 0
+        for k, ps in enumerate(birimler):
+            if ps is None:
+                sonuc[k] = emb[i]
+                i += 1
+                continue
+            agirlik = np.array([p.token_sayisi for p in ps], dtype=np.float32)
+            sonuc[k] = agirlik @ emb[i : i + len(ps)]
+            i += len(ps)
+        return self._normalize(sonuc)
+
+    def _guvenli_kodla(self, metinler, parcalar=None):
+        try:
+            if parcalar is not None:
+                return self.parcalardan_kodla(metinler, parcalar)
+            return self.metinleri_kodla(metinler)
+        except Exception as e:
+            print(f"[Hata] Semantik kodlama basarisiz: {e}")
+            return np.zeros((len(metinler), 1), dtype=np.float32)
+
+    def _kisa_maske(self, metinler):
+        return np.array(
+            [len(m) < self.MIN_METIN_UZUNLUGU for m in metinler], dtype=bool
+        )
@@ -1,5 +1,13 @@
 # File: core\document_processor.py
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from core.extractors import PdfExtractor, DocxExtractor, TxtExtractor
+from core.olcum import OLCUM, Olcum
+
+# OCR acikken otomatik isci sayisinin ust siniri: her isci kendi TrOCR
+# modelini yukler ve MODELLER butcesi process'ler arasi gecerli degildir
+_OCR_ISCI_SINIRI = 2
 
 
 class DocumentProcessor:
@@ -8,17 +16,113 @@ class DocumentProcessor:
     Kullanicidan bagimsiz olarak uygun extractor'a delege eder.
     """
 
-    def __init__(self, ocr_mode: str = "heavy"):
+    def __init__(
+        self,
+        ocr_mode: str = "heavy",
+        pdf_ayarlari: dict | None = None,
+        docx_ayarlari: dict | None = None,
+    ):
+        self.ocr_mode = ocr_mode
+        # PdfExtractor'a aynen iletilen ek ayarlar (OCR batch boyutu vb.)
+        self.pdf_ayarlari = dict(pdf_ayarlari or {})
+        # DocxExtractor'a iletilen ayarlar (dipnot/ustbilgi dahil etme)
+        self.docx_ayarlari = dict(docx_ayarlari or {})
         self.extractors = [
-            PdfExtractor(ocr_mode=ocr_mode),
-            DocxExtractor(),
+            PdfExtractor(ocr_mode=ocr_mode, **self.pdf_ayarlari),
+            DocxExtractor(**self.docx_ayarlari),
             TxtExtractor(),
         ]
 
-    def metin_cikar(self, dosya_yolu: str) -> str:
+    def _extractor_bul(self, dosya_yolu: str):
         for ex in self.extractors:
             if ex.destekler_mi(dosya_yolu):
+                return ex
+        return None
+
+    def metin_cikar(self, dosya_yolu: str) -> str:
+        ex = self._extractor_bul(dosya_yolu)
+        if ex is not None:
+            uzanti = os.path.splitext(dosya_yolu)[1].lstrip(".").lower()
+            with OLCUM.asama(f"cikarma_{uzanti}", adet=1):
                 return ex.metin_cikar(dosya_yolu)
 
         print(f"[Uyari] Desteklenmeyen format: {dosya_yolu}")
         return ""
+
+    def onbellek_anahtari(self, dosya_yolu: str):
+        """Dosyayi isleyecek extractor'in onbellek anahtari; desteklenmiyorsa None."""
+        ex = self._extractor_bul(dosya_yolu)
+        return ex.onbellek_anahtari() if ex is not None else None
+
+    def paralel_metin_cikar(self, dosya_yollari, isci_sayisi: int = 0):
+        """
+        Dosyalari process havuzunda isler; her dosya bittikce
+        (dosya_yolu, metin, hata) uretir. Hata yoksa hata=None.
+        isci_sayisi <= 0 ise CPU sayisi kullanilir (OCR acikken en fazla
+        _OCR_ISCI_SINIRI); 1 ise ayni process'te sirayla islenir.
+
+        Not: OCR acikken her isci kendi TrOCR modelini yukler. Isciler
+        "spawn" ile baslatilir; fork, GUI'nin isinma thread'i kilit tutarken
+        kilitlenebilir. Iscilerin olcumleri sonuclariyla birlikte gelir ve
+        etkin olcum toplayicisina eklenir.
+        """
+        dosya_yollari = list(dosya_yollari)
+        if isci_sayisi <= 0:
+            isci_sayisi = os.cpu_count() or 1
+            if self.ocr_mode != "off":
+                isci_sayisi = min(isci_sayisi, _OCR_ISCI_SINIRI)
+        isci_sayisi = min(isci_sayisi, len(dosya_yollari))
+
+        if isci_sayisi <= 1:
+            for yol in dosya_yollari:
+                try:
+                    yield yol, self.metin_cikar(yol), None
+                except Exception as e:
+                    yield yol, "", e
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=isci_sayisi,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_isci_baslat,
+            initargs=(self.ocr_mode, self.pdf_ayarlari, self.docx_ayarlari),
+        ) as havuz:
+            gorevler = {
+                havuz.submit(_isci_metin_cikar, yol): yol for yol in dosya_yollari
+            }
+            for gorev in as_completed(gorevler):
+                yol = gorevler[gorev]
+                try:
+                    metin, olcum = gorev.result()
+                    OLCUM.birlestir(olcum)
+                    yield yol, metin, None
+                except Exception as e:
+                    yield yol, "", e
+
+
+# Process havuzu iscileri: her process DocumentProcessor'u bir kez kurar,
+# boylece lazy yuklenen OCR motoru ayni iscideki dosyalar arasinda paylasilir.
+_isci_processor = None
+
+
+def _isci_baslat(ocr_mode: str, pdf_ayarlari: dict, docx_ayarlari: dict):
+    global _isci_processor
+    if ocr_mode != "off":
+        # Isciler zaten paralel; her birinin tum cekirdekleri istemesi asiri yuk
+        try:
+            import torch
+
+            torch.set_num_threads(1)
+        except ImportError:
+            pass
+    _isci_processor = DocumentProcessor(
+        ocr_mode=ocr_mode, pdf_ayarlari=pdf_ayarlari, docx_ayarlari=docx_ayarlari
+    )
+
+
+def _isci_metin_cikar(dosya_yolu: str):
+    """(metin, bu dosyanin olcum ozeti) dondurur."""
+    olcum = Olcum()
+    with olcum.etkin():
+        metin = _isci_processor.metin_cikar(dosya_yolu)
+    return metin, olcum.ozet()
@@ -3,9 +3,15 @@ class BaseExtractor:
     """Ortak arayuz: uzanti kontrolu ve metin cikarma."""
 
     extensions = set()
+    # Cikarma mantigi degistiginde artirilir; eski onbellek kayitlari gecersizlesir
+    surum = 1
 
     def destekler_mi(self, dosya_yolu: str) -> bool:
         return any(dosya_yolu.lower().endswith(ext) for ext in self.extensions)
 
     def metin_cikar(self, dosya_yolu: str) -> str:
         raise NotImplementedError
+
+    def onbellek_anahtari(self) -> str:
+        """Ayni dosyanin ayni ciktiyi verdigi ayarlari tanimlayan anahtar."""
+        return f"{self.__class__.__name__}:v{self.surum}"
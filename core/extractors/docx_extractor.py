@@ -1,38 +1,93 @@
 # File: core\extractors\docx_extractor.py
+import re
 import zipfile
+from xml.parsers import expat
 from core.extractors.base import BaseExtractor
 
+# expat namespace ayiricisi " " ile etiketler "uri yerel_ad" gelir
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main "
+_P = _W + "p"
+_T = _W + "t"
+# Paragraf icinde bosluk/satir sonu ureten bos elemanlar
+_AYIRICILAR = {_W + "tab": " ", _W + "br": "\n", _W + "cr": "\n"}
+
+_DIPNOT_PARCALARI = ("word/footnotes.xml", "word/endnotes.xml")
+_BASLIK_DESENI = re.compile(r"word/(header|footer)\d*\.xml$")
+
 
 class DocxExtractor(BaseExtractor):
+    """
+    word/document.xml'i zip akisindan artimli (expat) okur; XML agaci
+    kurulmaz, bellek dosya boyutuna bagli degildir. Ayni paragraftaki
+    run'lar birlestirilir, paragraflar satir sonu ile ayrilir.
+    """
+
     extensions = {".docx"}
+    surum = 2
+
+    def __init__(self, dipnotlar: bool = False, ustbilgiler: bool = False):
+        self.dipnotlar = dipnotlar
+        self.ustbilgiler = ustbilgiler
+
+    def onbellek_anahtari(self) -> str:
+        return (
+            f"{super().onbellek_anahtari()}"
+            f":dipnot={int(self.dipnotlar)}:ustbilgi={int(self.ustbilgiler)}"
+        )
 
     def metin_cikar(self, dosya_yolu: str) -> str:
         try:
             with zipfile.ZipFile(dosya_yolu) as docx:
-                xml = docx.read("word/document.xml").decode("utf-8")
+                adlar = docx.namelist()
+                parcalar = ["word/document.xml"]
+                if self.dipnotlar:
+                    parcalar += [a for a in _DIPNOT_PARCALARI if a in adlar]
+                if self.ustbilgiler:
+                    parcalar += sorted(a for a in adlar if _BASLIK_DESENI.match(a))
+
+                paragraflar = []
+                for ad in parcalar:
+                    with docx.open(ad) as akis:
+                        paragraflar.extend(self._paragraflari_oku(akis))
         except Exception as e:
             print(f"[Hata] DOCX okunamadi: {dosya_yolu} :: {e}")
             return ""
 
-        # Basit tag temizleme; docx icindeki text nodelarini ayrıştır
-        metin = []
+        return "\n".join(paragraflar)
+
+    @staticmethod
+    def _paragraflari_oku(akis):
+        """XML akisindan bos olmayan paragraf metinlerini sirayla dondurur."""
+        paragraflar = []
         parca = []
-        i = 0
-        while i < len(xml):
-            if xml[i] == "<":
-                if parca:
-                    metin.append("".join(parca))
-                    parca = []
-                j = xml.find(">", i)
-                if j == -1:
-                    break
-                i = j + 1
-            else:
-                parca.append(xml[i])
-                i += 1
-
-        if parca:
-            metin.append("".join(parca))
-
-        metin_str = " ".join(metin)
-        return " ".join(metin_str.split())
+        t_icinde = False
+
+        def basla(etiket, _nitelikler):
+            nonlocal t_icinde
+            if etiket == _T:
+                t_icinde = True
+            elif etiket in _AYIRICILAR:
+                parca.append(_AYIRICILAR[etiket])
+
+        def bitir(etiket):
+            nonlocal t_icinde
+            if etiket == _T:
+                t_icinde = False
+            elif etiket == _P:
+                satirlar = (" ".join(s.split()) for s in "".join(parca).split("\n"))
+                metin = "\n".join(s for s in satirlar if s)
+                parca.clear()
+                if metin:
+                    paragraflar.append(metin)
+
+        def veri(metin):
+            if t_icinde:
+                parca.append(metin)
+
+        ayristirici = expat.ParserCreate(namespace_separator=" ")
+        ayristirici.buffer_text = True
+        ayristirici.StartElementHandler = basla
+        ayristirici.EndElementHandler = bitir
+        ayristirici.CharacterDataHandler = veri
+        ayristirici.ParseFile(akis)
+        return paragraflar
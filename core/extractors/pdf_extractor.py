@@ -1,61 +1,294 @@
 # File: core\extractors\pdf_extractor.py
-import io
-import fitz  # PyMuPDF
-from PIL import Image
+from collections import deque
+import numpy as np
 from core.extractors.base import BaseExtractor
-from core.ocr_motoru import TrOCREngine
+from core.hashing import bytes_hash
+from core.onnx_backend import model_etiketi
+from core.ocr_hatti import OcrHatti
+from core.olcum import OLCUM
+from db.cache_database import CacheDatabase
+
+# OCR'i bitmemis sayfa sayisi bu sinira ulasinca bastaki sayfa beklenir
+_SAYFA_TAMPONU = 32
 
 
 class PdfExtractor(BaseExtractor):
     extensions = {".pdf"}
 
-    def __init__(self, ocr_mode: str = "heavy"):
+    def __init__(
+        self,
+        ocr_mode: str = "heavy",
+        ocr_batch_boyutu: int = 16,
+        ocr_gorsel_grubu: int = 8,
+        ocr_onbellek_yolu: str | None = None,
+        ocr_min_karakter: int = 50,
+        ocr_kaynak: str = "gorsel",
+        ocr_dpi: int = 200,
+        ocr_isci_sayisi: int = 2,
+        ocr_kuyruk_boyutu: int = 64,
+        ocr_backend: str = "torch",
+        onnx_nicemleme: str = "",
+    ):
         self._ocr_engine = None
+        # OCR hatti kurulamadiysa hata; sonraki gorsellerde yeniden denenmez
+        self._ocr_hatasi = None
         self.ocr_mode = ocr_mode
+        self.ocr_batch_boyutu = ocr_batch_boyutu
+        # OCR hattinda ayni anda cozulmus halde bulunabilecek en fazla gorsel
+        self.ocr_gorsel_grubu = max(1, int(ocr_gorsel_grubu))
+        # Gorsel cozme/satir kesme iscileri ve satir kuyrugu siniri
+        self.ocr_isci_sayisi = max(1, int(ocr_isci_sayisi))
+        self.ocr_kuyruk_boyutu = max(1, int(ocr_kuyruk_boyutu))
+        self.ocr_backend = ocr_backend
+        self.onnx_nicemleme = onnx_nicemleme
+        # OCR onbellegi backend'e gore ayrilir (nicemlenmis model farkli okuyabilir)
+        etiket = model_etiketi(ocr_backend, onnx_nicemleme)
+        self.ocr_onbellek_modu = f"{ocr_mode}@{etiket}" if etiket else ocr_mode
+        # Gorsel OCR sonuclari icin kalici onbellek (None ise yalnizca belge ici)
+        self.ocr_onbellek_yolu = ocr_onbellek_yolu
+        self._ocr_cache = None
+        # Metin katmani bu kadar karakterden azsa sayfa OCR'lanir (<= 0: her sayfa)
+        self.ocr_min_karakter = int(ocr_min_karakter)
+        # "gorsel": gomulu gorseller dogal cozunurlukte cikarilir,
+        # "render": sayfa ocr_dpi'da dogrudan NumPy dizisine render edilir
+        self.ocr_kaynak = ocr_kaynak
+        self.ocr_dpi = int(ocr_dpi)
 
     @property
-    def ocr_engine(self) -> TrOCREngine:
-        # Lazy yukle (ilk PDF geldiginde)
+    def ocr_engine(self):
+        # Lazy yukle (ilk PDF geldiginde); torch/transformers de burada import edilir
         if self._ocr_engine is None:
-            self._ocr_engine = TrOCREngine(mode=self.ocr_mode)
+            from core.ocr_motoru import TrOCREngine
+
+            self._ocr_engine = TrOCREngine(
+                mode=self.ocr_mode,
+                batch_size=self.ocr_batch_boyutu,
+                backend=self.ocr_backend,
+                nicemleme=self.onnx_nicemleme,
+            )
         return self._ocr_engine
 
+    @property
+    def ocr_cache(self):
+        # Her process kendi baglantisini acar (process havuzu iscileri dahil)
+        if self._ocr_cache is None and self.ocr_onbellek_yolu:
+            self._ocr_cache = CacheDatabase(self.ocr_onbellek_yolu)
+        return self._ocr_cache
+
+    def onbellek_anahtari(self) -> str:
+        # OCR modu, sayfa esigi ve render ayarlari ciktiyi degistirir
+        anahtar = (
+            f"{super().onbellek_anahtari()}:ocr={self.ocr_onbellek_modu}"
+            f":ocr_min={self.ocr_min_karakter}"
+        )
+        if self.ocr_kaynak == "render":
+            anahtar += f":render={self.ocr_dpi}"
+        return anahtar
+
     def metin_cikar(self, dosya_yolu: str) -> str:
-        tam_metin = []
+        sayfa_metinleri = [m for _, m in self.sayfalar(dosya_yolu) if m]
+        return " ".join(sayfa_metinleri)
+
+    def sayfalar(self, dosya_yolu: str):
+        """
+        Sayfa sonuclarini (sayfa_no, metin) olarak sirayla uretir. Gorseller
+        OCR hattina verilir; sayfa, gorsellerinin OCR'i bitince uretilir.
+        Gorseller yalnizca metin katmani ocr_min_karakter'in altinda kalan
+        sayfalarda okunur.
+        """
+        # Gorsel ozeti -> OCR metni (onbellekten, belge icinden veya yeni)
+        bilinen = {}
+        # Henuz uretilmemis sayfalar: (sayfa_no, metin katmani, gorsel ozetleri)
+        sirada = deque()
+        xref_ozet = {}
+        hat = None
+        isabet = 0
+        atlanan = 0
         print(f"--> Dosya isleniyor: {dosya_yolu}")
+        import fitz  # PyMuPDF
+
+        try:
+            # fitz cagrilari yalnizca bu thread'de yapilir
+            with fitz.open(dosya_yolu) as doc:
+                for sayfa_no, page in enumerate(doc, start=1):
+                    # Metin katmani
+                    text = page.get_text()
+                    ozetler = []
+
+                    # Gorsel katmani; metin katmani yeterliyse hic okunmaz
+                    image_list = []
+                    if self.ocr_mode != "off":
+                        if self._ocr_gerekli_mi(text):
+                            image_list = page.get_images(full=True)
+                        else:
+                            atlanan += 1
+
+                    if image_list and self.ocr_kaynak == "render":
+                        print(
+                            f"    Sayfa {sayfa_no}: "
+                            f"{self.ocr_dpi} dpi render ediliyor, OCR yapiliyor..."
+                        )
+                        try:
+                            ozet, dizi = self._sayfa_render(page)
+                            if self._ozet_bilinen_mi(ozet, bilinen, hat):
+                                isabet += 1
+                            else:
+                                hat = self._hatta_gonder(hat, ozet, dizi, bilinen)
+                            ozetler.append(ozet)
+                        except Exception as e:
+                            print(f"    Sayfa render hatasi: {e}")
+
+                    elif image_list:
+                        print(
+                            f"    Sayfa {sayfa_no}: "
+                            f"{len(image_list)} resim bulundu, OCR yapiliyor..."
+                        )
+
+                        for img in image_list:
+                            try:
+                                xref = img[0]
+                                ozet = xref_ozet.get(xref)
+                                # Ayni xref sayfalar arasi tekrarlaniyorsa yeniden cikarilmaz
+                                if ozet is None:
+                                    base_image = doc.extract_image(xref)
+                                    image_bytes = base_image["image"]
+                                    ozet = bytes_hash(image_bytes)
+                                    if self._ozet_bilinen_mi(ozet, bilinen, hat):
+                                        isabet += 1
+                                    # Kucuk ikon ve logolari ele
+                                    elif (
+                                        base_image["width"] > 100
+                                        and base_image["height"] > 50
+                                    ):
+                                        # Cozme ve satir kesme hattin iscilerinde
+                                        hat = self._hatta_gonder(
+                                            hat, ozet, image_bytes, bilinen
+                                        )
+                                    else:
+                                        bilinen[ozet] = ""
+                                    # Ozet hatta verildikten (veya bos sayildiktan) sonra kaydedilir
+                                    xref_ozet[xref] = ozet
+                                else:
+                                    isabet += 1
 
-        with fitz.open(dosya_yolu) as doc:
-            for sayfa_no, page in enumerate(doc, start=1):
-                # Metin katmani
-                text = page.get_text()
-                tam_metin.append(text)
+                                # Metin OCR sonrasi sayfaya eklenir
+                                ozetler.append(ozet)
 
-                # Gorsel katmani
-                image_list = page.get_images(full=True)
+                            except Exception as e:
+                                print(f"    Resim okuma hatasi: {e}")
 
-                if image_list and self.ocr_mode != "off":
-                    print(
-                        f"    Sayfa {sayfa_no}: "
-                        f"{len(image_list)} resim bulundu, OCR yapiliyor..."
+                    sirada.append((sayfa_no, text, ozetler))
+                    # OCR'i biten bastaki sayfalar uretilir; tampon dolduysa beklenir
+                    yield from self._hazir_sayfalar(
+                        sirada, bilinen, hat, bekle=len(sirada) >= _SAYFA_TAMPONU
                     )
 
-                    for img in image_list:
-                        try:
-                            xref = img[0]
-                            base_image = doc.extract_image(xref)
-                            image_bytes = base_image["image"]
+            yield from self._hazir_sayfalar(sirada, bilinen, hat, bekle=True)
+        finally:
+            if hat is not None:
+                hat.kapat()
 
-                            pil_image = Image.open(
-                                io.BytesIO(image_bytes)
-                            ).convert("RGB")
+        if isabet:
+            OLCUM.say("ocr_onbellek_isabet", isabet)
+            print(f"    OCR onbellegi: {isabet} gorsel tekrar okunmadi")
+        if atlanan:
+            OLCUM.say("ocr_atlanan_sayfa", atlanan)
+            print(f"    Metin katmani yeterli: {atlanan} sayfada OCR atlandi")
 
-                            # Kucuk ikon ve logolari ele
-                            if pil_image.width > 100 and pil_image.height > 50:
-                                ocr_sonuc = self.ocr_engine.ocr_yap(pil_image)
-                                tam_metin.append(ocr_sonuc)
+    def _hat_kur(self) -> OcrHatti:
+        return OcrHatti(
+            self.ocr_engine,
+            isci_sayisi=self.ocr_isci_sayisi,
+            kuyruk_boyutu=self.ocr_kuyruk_boyutu,
+            en_fazla_gorsel=self.ocr_gorsel_grubu,
+        )
 
-                        except Exception as e:
-                            print(f"    Resim okuma hatasi: {e}")
+    def _hatta_gonder(self, hat, ozet, kaynak, bilinen):
+        """
+        Gorseli OCR hattina verir (hat yoksa kurar) ve guncel hatti dondurur.
+        OCR motoru kurulamazsa hata bir kez yazilir ve bu extractor'da sonraki
+        gorseller metinsiz sayilir (onbellekteki sonuclar yine kullanilir);
+        belgenin metin katmani islenmeye devam eder.
+        """
+        if hat is None:
+            if self._ocr_hatasi is not None:
+                bilinen[ozet] = ""
+                return None
+            try:
+                hat = self._hat_kur()
+            except Exception as e:
+                self._ocr_hatasi = e
+                print(f"    OCR baslatilamadi, kalan gorseller OCR'siz islenecek: {e}")
+                bilinen[ozet] = ""
+                return None
+        try:
+            hat.gonder(ozet, kaynak)
+        except Exception as e:
+            print(f"    OCR hatasi: {e}")
+            bilinen[ozet] = ""
+        return hat
+
+    def _hazir_sayfalar(self, sirada, bilinen, hat, bekle=False):
+        """
+        Siranin basindan, tum gorselleri okunmus sayfalari sirayla uretir.
+        bekle=True ise siradaki tum sayfalar tamamlanana kadar bekler.
+        """
+        while sirada:
+            sayfa_no, text, ozetler = sirada[0]
+            eksik = {ozet for ozet in ozetler if ozet not in bilinen}
+            if eksik:
+                if hat is None:
+                    # Hat hic kurulamadi: eksik gorseller metinsiz kalir
+                    gelen = {ozet: "" for ozet in eksik}
+                else:
+                    gelen = hat.bekle(eksik) if bekle else hat.hazirlar(eksik)
+                self._ocr_kaydet(gelen, bilinen)
+                if not eksik.issubset(bilinen):
+                    return
+            sirada.popleft()
+            parcalar = [text] + [bilinen[ozet] for ozet in ozetler]
+            yield sayfa_no, " ".join(" ".join(parcalar).split())
+
+    def _sayfa_render(self, page):
+        """
+        Sayfayi ocr_dpi'da RGB pixmap olarak render eder; PIL'e ugramadan
+        (ozet, HxWx3 uint8 dizi) dondurur. Ozet DPI'yi da icerir.
+        """
+        import fitz
+
+        pix = page.get_pixmap(dpi=self.ocr_dpi, colorspace=fitz.csRGB, alpha=False)
+        ornekler = pix.samples
+        dizi = np.frombuffer(ornekler, dtype=np.uint8).reshape(
+            pix.height, pix.width, pix.n
+        )
+        ozet = bytes_hash(f"render:{self.ocr_dpi}:".encode() + ornekler)
+        return ozet, dizi
+
+    def _ocr_gerekli_mi(self, text: str) -> bool:
+        """Metin katmani bos veya esigin altindaysa sayfa OCR'lanir."""
+        if self.ocr_min_karakter <= 0:
+            return True
+        return len("".join(text.split())) < self.ocr_min_karakter
+
+    def _ozet_bilinen_mi(self, ozet, bilinen, hat) -> bool:
+        """Gorsel bu belgede/onbellekte daha once okunduysa veya hattaysa True."""
+        if ozet in bilinen or (hat is not None and ozet in hat):
+            return True
+        cache = self.ocr_cache
+        if cache is not None:
+            metin = cache.get_ocr(ozet, self.ocr_onbellek_modu)
+            if metin is not None:
+                bilinen[ozet] = metin
+                return True
+        return False
 
-        birlestirilmis = " ".join(tam_metin)
-        return " ".join(birlestirilmis.split())
+    def _ocr_kaydet(self, gelen, bilinen):
+        """Hattan gelen OCR sonuclarini belgeye ve kalici onbellege yazar."""
+        yeni = {}
+        for ozet, ocr_sonuc in gelen.items():
+            bilinen[ozet] = ocr_sonuc
+            # Bos sonuc hata olabilir; kalici onbellege yazilmaz
+            if ocr_sonuc.strip():
+                yeni[ozet] = ocr_sonuc
+        if yeni and self.ocr_cache is not None:
+            self.ocr_cache.save_ocr_many(self.ocr_onbellek_modu, yeni)
@@ -0,0 +1,19 @@
+# File: core\hashing.py
+import hashlib
+
+
+def dosya_hash(dosya_yolu: str, blok_boyutu: int = 1 << 20) -> str:
+    """Dosya iceriginin SHA-256 ozeti (parca parca okunur)."""
+    h = hashlib.sha256()
+    with open(dosya_yolu, "rb") as f:
+        for blok in iter(lambda: f.read(blok_boyutu), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def bytes_hash(veri: bytes) -> str:
+    return hashlib.sha256(veri).hexdigest()
+
+
+def metin_hash(metin: str) -> str:
+    return hashlib.sha256(metin.encode("utf-8")).hexdigest()
@@ -0,0 +1,76 @@
+# File: core\kanit_motoru.py
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from core.olcum import OLCUM
+
+
+class KanitMotoru:
+    """
+    Parca (cumle/paragraf) bazli kanit cikarimi.
+    Tum belgelerin parcalari tek TF-IDF matrisinde bir kez vektorlestirilir;
+    bir cift icin parca benzerlikleri tek sparse carpimla, en iyi eslesmeler
+    vektorize satir argmax/top-k ile bulunur.
+    """
+
+    def __init__(self):
+        self.vectorizer = None
+        self.matris = None
+        self.parcalar = {}
+        self.araliklar = {}
+
+    def hazirla(self, belge_parcalari: dict):
+        """
+        belge_parcalari: {belge: [parca, ...]}. Her belgenin parca satirlari
+        ortak matriste ardisik bir aralik olarak tutulur.
+        """
+        self.parcalar = {}
+        self.araliklar = {}
+        tum = []
+        for belge, parcalar in belge_parcalari.items():
+            self.araliklar[belge] = (len(tum), len(tum) + len(parcalar))
+            self.parcalar[belge] = list(parcalar)
+            tum.extend(parcalar)
+
+        self.vectorizer = TfidfVectorizer()
+        with OLCUM.asama("kanit_hazirlama", adet=len(tum)):
+            try:
+                self.matris = self.vectorizer.fit_transform(tum).tocsr()
+            except ValueError:
+                # Bos sozluk: hic kanit uretilmez
+                self.matris = sparse.csr_matrix((len(tum), 0), dtype=np.float64)
+        return self
+
+    def __contains__(self, belge):
+        return belge in self.araliklar
+
+    def kanit_bul(self, belge1, belge2, top_n: int = 3):
+        """
+        belge1'in her parcasi icin belge2'deki en benzer parcayi bulur ve
+        en yuksek top_n eslesmeyi {"p1", "p2", "score"} listesi olarak dondurur.
+        """
+        with OLCUM.asama("kanit", adet=1):
+            return self._kanit_bul(belge1, belge2, top_n)
+
+    def _kanit_bul(self, belge1, belge2, top_n):
+        b1, s1 = self.araliklar[belge1]
+        b2, s2 = self.araliklar[belge2]
+        if b1 == s1 or b2 == s2:
+            return []
+
+        sim = (self.matris[b1:s1] @ self.matris[b2:s2].T).tocsr()
+        if sim.nnz == 0:
+            return []
+
+        en_iyi = sim.max(axis=1).toarray().ravel()
+        en_iyi_j = np.asarray(sim.argmax(axis=1)).ravel()
+
+        # Esit skorlarda parca sirasi korunur
+        sira = np.argsort(-en_iyi, kind="stable")[:top_n]
+        p1 = self.parcalar[belge1]
+        p2 = self.parcalar[belge2]
+        return [
+            {"p1": p1[i], "p2": p2[en_iyi_j[i]], "score": float(en_iyi[i])}
+            for i in sira
+            if en_iyi[i] > 0
+        ]
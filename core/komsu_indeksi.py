@@ -0,0 +1,75 @@
+# File: core\komsu_indeksi.py
+import os
+import numpy as np
+
+
+class KomsuIndeksi:
+    """
+    Belge embedding'leri uzerinde tam (exact) top-k komsu arama.
+    Skorlar bloklar halinde E[blok] @ E.T ile hesaplanir; bellek
+    blok x n ile sinirli kalir. Indeks .npz olarak diske kaydedilebilir.
+    """
+
+    def __init__(self, blok_boyutu: int = 1024):
+        self.blok_boyutu = max(1, int(blok_boyutu))
+        self.anahtarlar = []
+        self.ozetler = []
+        self.emb = np.zeros((0, 0), dtype=np.float32)
+
+    def kur(self, anahtarlar, emb, ozetler=None):
+        """Indeksi (L2-normalize) embedding matrisiyle kurar."""
+        self.anahtarlar = list(anahtarlar)
+        self.ozetler = list(ozetler) if ozetler is not None else [""] * len(self.anahtarlar)
+        self.emb = np.ascontiguousarray(emb, dtype=np.float32)
+        if self.emb.shape[0] != len(self.anahtarlar):
+            raise ValueError("Anahtar ve embedding sayisi uyusmuyor.")
+        return self
+
+    def __len__(self):
+        return len(self.anahtarlar)
+
+    def ara(self, k: int, sorgu=None):
+        """
+        Her sorgu satiri icin en yakin k komsuyu (kendisi haric) dondurur:
+        (indeksler (m, k), skorlar (m, k)), skora gore azalan sirada.
+        sorgu: indeks dizisi; None ise tum belgeler.
+        """
+        n = len(self)
+        k = max(0, min(int(k), n - 1))
+        sorgu = np.arange(n) if sorgu is None else np.asarray(sorgu, dtype=np.int64)
+        komsular = np.zeros((len(sorgu), k), dtype=np.int64)
+        skorlar = np.zeros((len(sorgu), k), dtype=np.float32)
+        if k == 0:
+            return komsular, skorlar
+
+        for bas in range(0, len(sorgu), self.blok_boyutu):
+            idx = sorgu[bas : bas + self.blok_boyutu]
+            sim = self.emb[idx] @ self.emb.T
+            # Belgenin kendisi komsu sayilmaz
+            sim[np.arange(len(idx)), idx] = -np.inf
+            secim = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+            secim_skor = np.take_along_axis(sim, secim, axis=1)
+            sira = np.argsort(-secim_skor, axis=1)
+            komsular[bas : bas + len(idx)] = np.take_along_axis(secim, sira, axis=1)
+            skorlar[bas : bas + len(idx)] = np.take_along_axis(secim_skor, sira, axis=1)
+        return komsular, skorlar
+
+    def kaydet(self, yol: str):
+        os.makedirs(os.path.dirname(yol) or ".", exist_ok=True)
+        with open(yol, "wb") as f:
+            np.savez(
+                f,
+                anahtarlar=np.array(self.anahtarlar, dtype=object),
+                ozetler=np.array(self.ozetler, dtype=object),
+                emb=self.emb,
+            )
+
+    @classmethod
+    def yukle(cls, yol: str, blok_boyutu: int = 1024):
+        """Kayitli indeksi yukler; dosya yoksa None."""
+        if not os.path.exists(yol):
+            return None
+        with np.load(yol, allow_pickle=True) as veri:
+            return cls(blok_boyutu=blok_boyutu).kur(
+                veri["anahtarlar"].tolist(), veri["emb"], veri["ozetler"].tolist()
+            )
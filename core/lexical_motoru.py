@@ -0,0 +1,79 @@
+# File: core\lexical_motoru.py
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+class LexicalMotoru:
+    """
+    Korpus genelinde bir kez fit edilen TF-IDF ile lexical benzerlik.
+    Her belge yalnizca bir kez tokenize edilir; IDF agirliklari tum
+    korpustan gelir ve ciftler X @ X.T ile bloklar halinde hesaplanir.
+    """
+
+    def __init__(self, blok_boyutu: int = 512):
+        self.blok_boyutu = max(1, int(blok_boyutu))
+        self.vectorizer = None
+        self.matris = None
+
+    def fit(self, metinler):
+        """Vectorizer'i korpusa fit eder ve L2-normalize doc-term matrisini saklar."""
+        metinler = list(metinler)
+        vectorizer = TfidfVectorizer()
+        try:
+            matris = vectorizer.fit_transform(metinler).tocsr()
+        except ValueError:
+            # Bos sozluk (orn. tum metinler stop-word/bos): tum skorlar 0
+            vectorizer = None
+            matris = sparse.csr_matrix((len(metinler), 0), dtype=np.float64)
+        # Birlikte atanir; donustur() baska thread'den yarim fit gormez
+        self.vectorizer, self.matris = vectorizer, matris
+        return self
+
+    @property
+    def belge_sayisi(self) -> int:
+        return 0 if self.matris is None else self.matris.shape[0]
+
+    def blok_skorlari(self, blok_boyutu: int | None = None):
+        """
+        Ust ucgeni bloklar halinde uretir: (baslangic, bitis, blok).
+        blok[a, b] = skor(baslangic + a, baslangic + b); sutunlar
+        baslangic'tan korpus sonuna kadardir, bellek blok x n ile sinirli kalir.
+        """
+        if self.matris is None:
+            raise RuntimeError("LexicalMotoru once fit edilmelidir.")
+        b = blok_boyutu or self.blok_boyutu
+        n = self.belge_sayisi
+        for baslangic in range(0, n, b):
+            bitis = min(n, baslangic + b)
+            satirlar = self.matris[baslangic:bitis]
+            sutunlar = self.matris[baslangic:]
+            blok = (satirlar @ sutunlar.T).toarray()
+            yield baslangic, bitis, blok
+
+    def cift_skorlari(self, i_dizi, j_dizi):
+        """Secili ciftler icin skorlar: satir satir ic carpim, (m,) dizi."""
+        return _satir_carpimlari(self.matris, i_dizi, j_dizi)
+
+    def donustur(self, metinler):
+        """
+        Korpus disi metinleri fit edilmis sozluk ve IDF ile L2-normalize
+        satirlara cevirir; korpus satirlariyla ayni olcektedir.
+        """
+        if self.matris is None:
+            raise RuntimeError("LexicalMotoru once fit edilmelidir.")
+        vectorizer = self.vectorizer
+        if vectorizer is None:
+            return sparse.csr_matrix((len(metinler), 0), dtype=np.float64)
+        return vectorizer.transform(metinler).tocsr()
+
+    def metin_skorlari(self, metinler, i_dizi, j_dizi):
+        """Korpus IDF'iyle metinler[i] - metinler[j] ciftlerinin skorlari."""
+        return _satir_carpimlari(self.donustur(metinler), i_dizi, j_dizi)
+
+
+def _satir_carpimlari(matris, i_dizi, j_dizi):
+    if len(i_dizi) == 0:
+        return np.zeros(0, dtype=np.float64)
+    carpim = matris[i_dizi].multiply(matris[j_dizi])
+    return np.asarray(carpim.sum(axis=1)).ravel()
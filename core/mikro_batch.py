@@ -0,0 +1,99 @@
+# File: core\mikro_batch.py
+import threading
+import time
+from concurrent.futures import Future
+from queue import Empty, Queue
+
+
+class MikroBatch:
+    """
+    Farkli thread'lerden gelen kucuk istekleri dinamik batch'lerde birlestirir.
+
+    islev(ogeler) -> ogelerle ayni sirada sonuc dizisi (liste veya satirlari
+    ogelere karsilik gelen NumPy dizisi). Ilk istek geldikten sonra en fazla
+    bekleme_ms kadar ya da batch en_fazla ogeye ulasana kadar beklenir; islev
+    yalnizca tek tuketici thread'den cagrilir.
+    """
+
+    def __init__(self, islev, en_fazla: int = 64, bekleme_ms: float = 5):
+        self.islev = islev
+        self.en_fazla = max(1, int(en_fazla))
+        self.bekleme = max(0.0, float(bekleme_ms)) / 1000
+        self._kuyruk = Queue()
+        self._kilit = threading.Lock()
+        self.istatistik = {"istek": 0, "oge": 0, "batch": 0, "en_buyuk": 0}
+        self._tuketici = threading.Thread(
+            target=self._calis, name="mikro-batch", daemon=True
+        )
+        self._tuketici.start()
+
+    def gonder(self, ogeler) -> Future:
+        """Ogeleri kuyruga ekler; sonuc listesini tasiyan Future dondurur."""
+        ogeler = list(ogeler)
+        gelecek = Future()
+        if not ogeler:
+            gelecek.set_result([])
+            return gelecek
+        self._kuyruk.put((ogeler, gelecek))
+        return gelecek
+
+    def isle(self, ogeler, zaman_asimi: float | None = None):
+        """gonder + sonucu bekle."""
+        return self.gonder(ogeler).result(zaman_asimi)
+
+    def kapat(self):
+        self._kuyruk.put(None)
+        self._tuketici.join()
+
+    def _topla(self, ilk):
+        """Ilk istegin ardindan sure/boyut sinirina kadar gelenleri toplar."""
+        istekler = [ilk]
+        adet = len(ilk[0])
+        son = time.monotonic() + self.bekleme
+        while adet < self.en_fazla:
+            try:
+                oge = self._kuyruk.get(timeout=max(0.0, son - time.monotonic()))
+            except Empty:
+                break
+            if oge is None:
+                # Kapatma isareti: toplananlar islenir, sonra cikilir
+                self._kuyruk.put(None)
+                break
+            istekler.append(oge)
+            adet += len(oge[0])
+        return istekler
+
+    def _calis(self):
+        while True:
+            ilk = self._kuyruk.get()
+            if ilk is None:
+                break
+            istekler = self._topla(ilk)
+            istekler = [(o, g) for o, g in istekler if g.set_running_or_notify_cancel()]
+            if not istekler:
+                continue
+
+            duz = [oge for ogeler, _ in istekler for oge in ogeler]
+            with self._kilit:
+                self.istatistik["istek"] += len(istekler)
+                self.istatistik["oge"] += len(duz)
+                self.istatistik["batch"] += 1
+                self.istatistik["en_buyuk"] = max(self.istatistik["en_buyuk"], len(duz))
+            try:
+                sonuc = self.islev(duz)
+            except Exception as e:
+                for _, gelecek in istekler:
+                    gelecek.set_exception(e)
+                continue
+
+            # Sonuc istek sinirlarindan geri bolunur
+            i = 0
+            for ogeler, gelecek in istekler:
+                gelecek.set_result(sonuc[i : i + len(ogeler)])
+                i += len(ogeler)
+
+    def ozet(self) -> dict:
+        with self._kilit:
+            ist = dict(self.istatistik)
+        ist["ort_batch"] = round(ist["oge"] / ist["batch"], 2) if ist["batch"] else 0.0
+        return ist
@@ -0,0 +1,138 @@
+# File: core\minhash.py
+import hashlib
+import re
+from collections import defaultdict
+import numpy as np
+
+
+class MinHashLSH:
+    """
+    Kelime shingle'lari uzerinde MinHash imzalari ve LSH bantlama.
+    Tam skorlamadan once, Jaccard benzerligi esigi gecebilecek aday
+    ciftleri bulmak icin kullanilir.
+    """
+
+    _MERSENNE = np.uint64((1 << 61) - 1)
+    _KELIME = re.compile(r"\w+", re.UNICODE)
+    # Shingle hash'lerine permutasyon uygulanirken kullanilan parca boyutu
+    _PARCA = 8192
+
+    def __init__(
+        self,
+        perm_sayisi: int = 128,
+        shingle: int = 3,
+        esik: float = 0.1,
+        tohum: int = 1,
+    ):
+        self.perm_sayisi = int(perm_sayisi)
+        self.shingle = max(1, int(shingle))
+        self.esik = float(esik)
+        self.bant_sayisi, self.bant_satiri = self._bant_sec(self.perm_sayisi, self.esik)
+
+        rng = np.random.default_rng(tohum)
+        self._a = rng.integers(1, int(self._MERSENNE), self.perm_sayisi, dtype=np.uint64)
+        self._b = rng.integers(0, int(self._MERSENNE), self.perm_sayisi, dtype=np.uint64)
+        # a*x 64 biti asar; a ust 29 ve alt 32 bite bolunerek carpilir
+        self._a_ust = (self._a >> np.uint64(32))[:, None]
+        self._a_alt = (self._a & np.uint64(0xFFFFFFFF))[:, None]
+
+    @staticmethod
+    def _bant_sec(perm_sayisi, esik):
+        """
+        Bant yapisini secer: (1/b)^(1/r) esigin altinda kalan en buyuk r.
+        Boylece esigi gecen ciftlerin buyuk cogunlugu aday olur (yuksek recall).
+        """
+        secim = (perm_sayisi, 1)
+        for r in range(1, perm_sayisi + 1):
+            if perm_sayisi % r:
+                continue
+            b = perm_sayisi // r
+            if (1.0 / b) ** (1.0 / r) <= esik:
+                secim = (b, r)
+        return secim
+
+    def _shingle_hashleri(self, metin):
+        kelimeler = self._KELIME.findall(metin.lower())
+        k = self.shingle
+        if len(kelimeler) < k:
+            shingles = {" ".join(kelimeler)} if kelimeler else set()
+        else:
+            shingles = {
+                " ".join(kelimeler[i : i + k]) for i in range(len(kelimeler) - k + 1)
+            }
+        return np.fromiter(
+            (
+                int.from_bytes(
+                    hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little"
+                )
+                for s in shingles
+            ),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+
+    @classmethod
+    def _mod_mersenne(cls, v):
+        """v mod (2^61 - 1); v < 2^64 olmali (2^61 = 1 esitligiyle katlama)."""
+        p = cls._MERSENNE
+        v = (v & p) + (v >> np.uint64(61))
+        return np.where(v >= p, v - p, v)
+
+    def _permutasyon(self, parca):
+        """
+        (a*x + b) mod (2^61 - 1), tasmasiz. x < 2^32 (4 baytlik shingle
+        hash'i) oldugundan a_ust*x < 2^61 ve a_alt*x < 2^64 kalir; sonuc
+        platformdan bagimsizdir.
+        """
+        x = parca[None, :]
+        ust = self._a_ust * x
+        # ust * 2^32 mod p: 2^61'i asan bitler basa katlanir
+        ust = ((ust & np.uint64((1 << 29) - 1)) << np.uint64(32)) + (ust >> np.uint64(29))
+        alt = self._mod_mersenne(self._a_alt * x)
+        return self._mod_mersenne(ust + alt + self._b[:, None])
+
+    def imza(self, metin):
+        """Tek metin icin (perm_sayisi,) uint64 MinHash imzasi."""
+        imza = np.full(self.perm_sayisi, np.iinfo(np.uint64).max, dtype=np.uint64)
+        hashler = self._shingle_hashleri(metin)
+        for i in range(0, hashler.size, self._PARCA):
+            perm = self._permutasyon(hashler[i : i + self._PARCA])
+            np.minimum(imza, perm.min(axis=1), out=imza)
+        return imza
+
+    def imzalar(self, metinler):
+        """(n, perm_sayisi) imza matrisi."""
+        return np.stack([self.imza(m) for m in metinler]) if metinler else np.empty(
+            (0, self.perm_sayisi), dtype=np.uint64
+        )
+
+    def aday_ciftler(self, imzalar):
+        """
+        LSH bantlarinda en az bir kez ayni kovaya dusen ve tahmini
+        Jaccard'i esigi gecen ciftleri {(i, j): tahmin} olarak dondurur (i < j).
+        """
+        adaylar = set()
+        r = self.bant_satiri
+        for bant in range(self.bant_sayisi):
+            kovalar = defaultdict(list)
+            # Kova anahtari bayt sirasindan bagimsiz (little-endian)
+            dilim = imzalar[:, bant * r : (bant + 1) * r].astype("<u8", copy=False)
+            for idx, satir in enumerate(dilim):
+                kovalar[satir.tobytes()].append(idx)
+            for uyeler in kovalar.values():
+                if len(uyeler) < 2:
+                    continue
+                for a in range(len(uyeler)):
+                    for b in range(a + 1, len(uyeler)):
+                        adaylar.add((uyeler[a], uyeler[b]))
+
+        sonuc = {}
+        for i, j in adaylar:
+            tahmin = self.jaccard_tahmini(imzalar, i, j)
+            if tahmin >= self.esik:
+                sonuc[(i, j)] = tahmin
+        return sonuc
+
+    @staticmethod
+    def jaccard_tahmini(imzalar, i, j) -> float:
+        return float(np.mean(imzalar[i] == imzalar[j]))
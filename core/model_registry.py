@@ -0,0 +1,100 @@
+# File: core\model_registry.py
+import threading
+from collections import OrderedDict
+from core.olcum import OLCUM
+
+
+class ModelKaydi:
+    """
+    Process genelinde paylasilan model ornekleri.
+
+    Modeller (tur, mod, backend) anahtariyla ilk istendiklerinde yuklenir ve
+    sonraki isteklerde ayni ornek dondurulur. Toplam tahmini bellek butce_mb'yi
+    asarsa en uzun suredir kullanilmayan modeller kayittan cikarilir (LRU).
+    Cikarilan model, onu tutan motor birakilana kadar bellekte kalir.
+    """
+
+    def __init__(self, butce_mb: float = 0):
+        # <= 0: sinirsiz
+        self.butce_mb = float(butce_mb)
+        self._ornekler = OrderedDict()
+        # Yukleme sirasinda da tutulur; ayni model iki kez yuklenmez
+        self._kilit = threading.RLock()
+        self.istatistik = {"isabet": 0, "yukleme": 0, "cikarma": 0}
+
+    def getir(self, tur: str, mod: str, backend: str, yukleyici):
+        """Kayitli ornegi dondurur; yoksa yukleyici() ile yukleyip kaydeder."""
+        anahtar = (tur, mod, backend)
+        with self._kilit:
+            if anahtar in self._ornekler:
+                self._ornekler.move_to_end(anahtar)
+                self.istatistik["isabet"] += 1
+                return self._ornekler[anahtar][0]
+
+            with OLCUM.asama(f"model_yukleme_{tur}", adet=1):
+                nesne = yukleyici()
+            self._ornekler[anahtar] = (nesne, bellek_mb(nesne))
+            self.istatistik["yukleme"] += 1
+            self._sigdir(korunan=anahtar)
+            return nesne
+
+    def butce_ayarla(self, butce_mb: float):
+        with self._kilit:
+            self.butce_mb = float(butce_mb)
+            self._sigdir()
+
+    def bosalt(self, tur: str | None = None):
+        """Kayittaki modelleri (veya yalnizca bir turu) birakir."""
+        with self._kilit:
+            for anahtar in [a for a in self._ornekler if tur is None or a[0] == tur]:
+                del self._ornekler[anahtar]
+
+    def toplam_mb(self) -> float:
+        with self._kilit:
+            return sum(mb for _, mb in self._ornekler.values())
+
+    def ozet(self) -> dict:
+        with self._kilit:
+            return {
+                **self.istatistik,
+                "modeller": {
+                    "/".join(a): round(mb, 1) for a, (_, mb) in self._ornekler.items()
+                },
+            }
+
+    def __contains__(self, anahtar) -> bool:
+        return tuple(anahtar) in self._ornekler
+
+    def _sigdir(self, korunan=None):
+        if self.butce_mb <= 0:
+            return
+        toplam = self.toplam_mb()
+        for anahtar in list(self._ornekler):
+            if toplam <= self.butce_mb:
+                break
+            if anahtar == korunan:
+                continue
+            _, mb = self._ornekler.pop(anahtar)
+            toplam -= mb
+            self.istatistik["cikarma"] += 1
+            print(f"[Sistem] Model bellekten birakildi: {'/'.join(anahtar)} ({mb:.0f} MB)")
+
+
+def bellek_mb(nesne) -> float:
+    """
+    Tahmini model bellegi (MB): torch parametre ve buffer'lari. Demet/liste
+    elemanlari toplanir; olculemeyen nesneler (orn. ONNX oturumlari) 0 sayilir.
+    """
+    if isinstance(nesne, (tuple, list)):
+        return sum(bellek_mb(n) for n in nesne)
+    bayt = 0
+    try:
+        for t in (*nesne.parameters(), *nesne.buffers()):
+            bayt += t.numel() * t.element_size()
+    except (AttributeError, TypeError):
+        return 0.0
+    return bayt / (1024 * 1024)
+
+
+# Process genelindeki kayit; butcesi SimilarityApp config'inden ayarlanir
+MODELLER = ModelKaydi()
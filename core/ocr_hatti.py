@@ -0,0 +1,148 @@
+# File: core\ocr_hatti.py
+import io
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from core.olcum import baglamda
+
+
+class OcrHatti:
+    """
+    Uretici/tuketici OCR hatti.
+
+    Gorsel cozme ve satir_bul_ve_kes bir thread havuzunda calisir, satir
+    kesitleri sinirli bir kuyruga yazilir; tek tuketici thread kuyrugu
+    batch'ler halinde modele verir. Kuyruk doldugunda ureticiler bekler
+    (geri basinc). Metinler gorsel anahtari bazinda satir sirasiyla
+    birlestirilir. Model yalnizca tuketici thread'den cagrilir.
+    """
+
+    def __init__(
+        self,
+        motor,
+        isci_sayisi: int = 2,
+        kuyruk_boyutu: int = 64,
+        en_fazla_gorsel: int = 8,
+    ):
+        self.motor = motor
+        self._kuyruk = queue.Queue(maxsize=max(1, int(kuyruk_boyutu)))
+        self._havuz = ThreadPoolExecutor(
+            max_workers=max(1, int(isci_sayisi)), thread_name_prefix="ocr-kes"
+        )
+        # Ayni anda cozulmus halde bekleyen en fazla gorsel
+        self._yer = threading.Semaphore(max(1, int(en_fazla_gorsel)))
+        self._kosul = threading.Condition()
+        self._gonderilen = set()
+        # anahtar -> satir metinleri (okundukca doldurulur)
+        self._satirlar = {}
+        self._kalan = {}
+        self._sonuclar = {}
+        # Isci thread'leri hatti kuranin olcum toplayicisina yazar
+        self._tuketici = threading.Thread(
+            target=baglamda(self._tuket), name="ocr-model", daemon=True
+        )
+        self._tuketici.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.kapat()
+
+    def __contains__(self, anahtar) -> bool:
+        return anahtar in self._gonderilen
+
+    def gonder(self, anahtar, kaynak):
+        """
+        Gorseli hatta ekler. kaynak: kodlanmis gorsel baytlari, PIL gorsel
+        veya RGB NumPy dizisi. Hat doluysa yer acilana kadar bekler.
+        """
+        if anahtar in self._gonderilen:
+            return
+        self._gonderilen.add(anahtar)
+        self._yer.acquire()
+        self._havuz.submit(baglamda(self._kes), anahtar, kaynak)
+
+    def hazirlar(self, anahtarlar) -> dict:
+        """Tamamlanmis olanlarin {anahtar: metin} sozlugu; beklemez."""
+        with self._kosul:
+            return {a: self._sonuclar[a] for a in anahtarlar if a in self._sonuclar}
+
+    def bekle(self, anahtarlar) -> dict:
+        """Verilen tum anahtarlar okunana kadar bekler."""
+        anahtarlar = list(anahtarlar)
+        with self._kosul:
+            self._kosul.wait_for(
+                lambda: all(a in self._sonuclar for a in anahtarlar)
+            )
+            return {a: self._sonuclar[a] for a in anahtarlar}
+
+    def kapat(self):
+        """Bekleyen isleri bitirir, thread'leri kapatir."""
+        self._havuz.shutdown(wait=True, cancel_futures=True)
+        self._kuyruk.put(None)
+        self._tuketici.join()
+
+    def _kes(self, anahtar, kaynak):
+        try:
+            try:
+                if isinstance(kaynak, (bytes, bytearray)):
+                    kaynak = Image.open(io.BytesIO(kaynak)).convert("RGB")
+                # Satir bulunamazsa tum gorseli dene
+                satirlar = self.motor.satir_bul_ve_kes(kaynak) or [kaynak]
+                # Dizi kesitleri tum sayfayi bellekte tutmasin
+                satirlar = [
+                    np.ascontiguousarray(s) if isinstance(s, np.ndarray) else s
+                    for s in satirlar
+                ]
+            except Exception as e:
+                print(f"OCR hatasi: {e}")
+                satirlar = []
+
+            with self._kosul:
+                if not satirlar:
+                    self._sonuclar[anahtar] = ""
+                    self._kosul.notify_all()
+                    return
+                self._satirlar[anahtar] = [""] * len(satirlar)
+                self._kalan[anahtar] = len(satirlar)
+            for no, satir in enumerate(satirlar):
+                self._kuyruk.put((anahtar, no, satir))
+        finally:
+            self._yer.release()
+
+    def _tuket(self):
+        bitti = False
+        while not bitti:
+            oge = self._kuyruk.get()
+            if oge is None:
+                break
+            # Kuyrukta biriken satirlarla batch doldurulur; beklenmez
+            parti = [oge]
+            while len(parti) < self.motor.batch_size:
+                try:
+                    oge = self._kuyruk.get_nowait()
+                except queue.Empty:
+                    break
+                if oge is None:
+                    bitti = True
+                    break
+                parti.append(oge)
+
+            try:
+                metinler = self.motor.satirlari_oku([s for _, _, s in parti])
+            except Exception as e:
+                print(f"OCR hatasi: {e}")
+                metinler = [""] * len(parti)
+
+            with self._kosul:
+                for (anahtar, no, _), metin in zip(parti, metinler):
+                    self._satirlar[anahtar][no] = metin
+                    self._kalan[anahtar] -= 1
+                    if self._kalan[anahtar] == 0:
+                        satirlar = self._satirlar.pop(anahtar)
+                        del self._kalan[anahtar]
+                        self._sonuclar[anahtar] = "".join(t + " " for t in satirlar)
+                self._kosul.notify_all()
@@ -2,9 +2,10 @@
 import cv2
 import numpy as np
 from PIL import Image
-from transformers import TrOCRProcessor, VisionEncoderDecoderModel
-import torch
 from core.model_paths import resolve_model_path
+from core.model_registry import MODELLER
+from core.olcum import OLCUM
+from core.onnx_backend import model_etiketi, ocr_modeli_yukle
 
 
 class TrOCREngine:
@@ -15,29 +16,63 @@ class TrOCREngine:
         "light": ("microsoft/trocr-small-printed", "ocr_light"),
     }
 
-    def __init__(self, mode: str = "heavy"):
-        # GPU varsa CUDA'yi kullan
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"[Sistem] OCR motoru basliyor... Cihaz: {self.device}")
-
+    def __init__(
+        self,
+        mode: str = "heavy",
+        batch_size: int = 16,
+        backend: str = "torch",
+        nicemleme: str = "",
+    ):
         model_name, alias = self.MODEL_MAP.get(mode, self.MODEL_MAP["heavy"])
-        model_path = resolve_model_path(model_name, alias)
+        # Processor ve model process genelinde paylasilir; extractor yeniden
+        # kurulsa da (set_options) model tekrar yuklenmez
+        self.processor, self.model, self.backend, self.device = MODELLER.getir(
+            "ocr",
+            alias,
+            model_etiketi(backend, nicemleme) or "torch",
+            lambda: self._model_yukle(resolve_model_path(model_name, alias), backend, nicemleme),
+        )
+        self.batch_size = max(1, int(batch_size))
+
+    @staticmethod
+    def _model_yukle(model_path, backend, nicemleme):
+        """(processor, model, gercek backend, cihaz) dondurur."""
+        # Model kaydina hazir ornek verilirse (orn. benchmark stub'i) import edilmez
+        import torch
+        from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+
+        # GPU varsa CUDA'yi kullan; ONNX backend CPU'da calisir
+        device = "cuda" if backend != "onnx" and torch.cuda.is_available() else "cpu"
+        print(f"[Sistem] OCR motoru basliyor... Cihaz: {device}")
 
         # Onceden egitilmis TrOCR modellerini yukle
         print(f"[Sistem] TrOCR modeli yukleniyor... ({model_path})")
-        self.processor = TrOCRProcessor.from_pretrained(model_path, use_fast=False)
-        self.model = VisionEncoderDecoderModel.from_pretrained(
-            model_path
-        ).to(self.device)
+        processor = TrOCRProcessor.from_pretrained(model_path, use_fast=False)
+        model, gercek = None, "torch"
+        if backend == "onnx":
+            try:
+                model, gercek = ocr_modeli_yukle(model_path, nicemleme), "onnx"
+            except Exception as e:
+                print(f"[Uyari] ONNX OCR yuklenemedi, PyTorch kullaniliyor: {e}")
+        if model is None:
+            model = VisionEncoderDecoderModel.from_pretrained(model_path).to(device)
 
         print("[Sistem] OCR motoru hazir!")
+        return processor, model, gercek, device
 
-    def satir_bul_ve_kes(self, pil_image):
-        """OpenCV ile metin satirlarini tespit eder ve parcalara ayirir."""
+    def satir_bul_ve_kes(self, image):
+        """
+        OpenCV ile metin satirlarini tespit eder ve parcalara ayirir.
+        PIL gorsel veya RGB NumPy dizisi kabul eder; dizi verilirse satirlar
+        da dizi (kopyasiz kesit) olarak doner, PIL donusumu yapilmaz.
+        """
+        with OLCUM.asama("ocr_satir_kesme", adet=1):
+            return self._satirlari_kes(image)
 
-        img = np.array(pil_image)
-        img = img[:, :, ::-1].copy()  # RGB -> BGR
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    def _satirlari_kes(self, image):
+        dizi_mi = isinstance(image, np.ndarray)
+        img = image if dizi_mi else np.asarray(image.convert("RGB"))
+        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
 
         # Gurultu azaltma ve ikili goruntuye cevirme
         blur = cv2.GaussianBlur(gray, (7, 7), 0)
@@ -63,8 +98,7 @@ class TrOCREngine:
             x, y, w, h = cv2.boundingRect(c)
             if h > 15 and w > 15:  # Gurultuyu ele
                 roi = img[y : y + h, x : x + w]
-                roi_pil = Image.fromarray(cv2.cvtColor(roi, cv2.COLOR_BGR2RGB))
-                satir_resimleri.append(roi_pil)
+                satir_resimleri.append(roi if dizi_mi else Image.fromarray(roi))
 
         return satir_resimleri
 
@@ -72,31 +106,62 @@ class TrOCREngine:
         """
         Tek bir gorseli alir:
         - Satirlara boler
-        - Her satiri OCR ile okur
+        - Tum satirlari batch'ler halinde OCR ile okur
         """
+        return self.ocr_toplu([image])[0]
 
-        try:
-            satirlar = self.satir_bul_ve_kes(image)
-            full_text = ""
-
-            # Satir bulunamazsa tum gorseli dene
-            if not satirlar:
-                satirlar = [image]
-
-            for satir_img in satirlar:
+    def ocr_toplu(self, images):
+        """
+        Birden fazla gorseli (ayni sayfa/PDF) tek seferde okur.
+        Tum gorsellerin satirlari ortak batch'lerde modele verilir,
+        metinler gorsel sirasina gore geri birlestirilir.
+        """
+        gruplar = []
+        for image in images:
+            try:
+                satirlar = self.satir_bul_ve_kes(image)
+                # Satir bulunamazsa tum gorseli dene
+                gruplar.append(satirlar or [image])
+            except Exception as e:
+                print(f"OCR hatasi: {e}")
+                gruplar.append([])
+
+        duz = [satir for grup in gruplar for satir in grup]
+        metinler = self.satirlari_oku(duz)
+
+        sonuc = []
+        i = 0
+        for grup in gruplar:
+            parca = metinler[i : i + len(grup)]
+            i += len(grup)
+            sonuc.append("".join(t + " " for t in parca))
+        return sonuc
+
+    def satirlari_oku(self, satirlar):
+        """
+        Satir gorsellerini batch_size'lik gruplar halinde tek generate
+        cagrisiyla okur. Processor her satiri sabit boyuta getirdigi icin
+        farkli boyuttaki satirlar ayni tensorde birlestirilebilir.
+        """
+        with OLCUM.asama("ocr", adet=len(satirlar)):
+            return self._satirlari_oku(satirlar)
+
+    def _satirlari_oku(self, satirlar):
+        metinler = []
+        for i in range(0, len(satirlar), self.batch_size):
+            parca = satirlar[i : i + self.batch_size]
+            try:
                 pixel_values = self.processor(
-                    images=satir_img, return_tensors="pt"
+                    images=parca, return_tensors="pt"
                 ).pixel_values.to(self.device)
 
                 generated_ids = self.model.generate(pixel_values)
-                generated_text = self.processor.batch_decode(
-                    generated_ids, skip_special_tokens=True
-                )[0]
-
-                full_text += generated_text + " "
-
-            return full_text
-
-        except Exception as e:
-            print(f"OCR hatasi: {e}")
-            return ""
+                metinler.extend(
+                    self.processor.batch_decode(
+                        generated_ids, skip_special_tokens=True
+                    )
+                )
+            except Exception as e:
+                print(f"OCR hatasi: {e}")
+                metinler.extend([""] * len(parca))
+        return metinler
@@ -0,0 +1,288 @@
+# File: core\olcum.py
+import contextlib
+import contextvars
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+# Asama kayitlarinin alanlari (CSV/GUI sutun sirasi)
+ASAMA_ALANLARI = (
+    "cagri", "adet", "sure", "cpu", "rss_mb", "rss_artis_mb", "py_tepe_mb"
+)
+
+# Kayitlarin gidecegi toplayici (Olcum.etkin ile baglanir)
+_ETKIN = contextvars.ContextVar("olcum", default=None)
+
+
+class Aralik:
+    """Acik bir olcum araligi; islenen oge sayisi is bitince adet'e yazilabilir."""
+
+    __slots__ = ("adet",)
+
+    def __init__(self, adet: int = 0):
+        self.adet = adet
+
+
+class Olcum:
+    """
+    Asama bazli sure, CPU ve bellek toplayicisi (run basina bir tane).
+
+    Her asama icin cagri sayisi, islenen oge adedi, duvar saati, CPU suresi
+    ve bellek tutulur. CPU suresi aralik boyunca tum process'in CPU
+    suresidir (model ic thread'leri dahil); ic ice asamalarin sureleri
+    birbirini kapsar. rss_mb asama sonunda olculen anlik RSS'in en
+    buyugu, rss_artis_mb asama boyunca RSS degisimlerinin toplamidir.
+    tracemalloc aciksa Python heap tepesi de kaydedilir. Thread'ler arasi
+    paylasilabilir; sayaclar asamasiz toplamlardir.
+    """
+
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self._asamalar = {}
+        self._sayaclar = {}
+
+    @contextlib.contextmanager
+    def etkin(self):
+        """
+        Bu baglamda (ve baglamda() ile sarilan thread islevlerinde) OLCUM'a
+        yapilan kayitlar bu toplayiciya gider.
+        """
+        token = _ETKIN.set(self)
+        try:
+            yield self
+        finally:
+            _ETKIN.reset(token)
+
+    @contextlib.contextmanager
+    def asama(self, ad: str, adet: int = 0):
+        aralik = Aralik(adet)
+        rss = guncel_rss_mb()
+        duvar, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield aralik
+        finally:
+            sure = time.perf_counter() - duvar
+            cpu = time.process_time() - cpu
+            self._kaydet(ad, aralik.adet, sure, cpu, rss)
+
+    def uretec(self, ad: str, ogeler, adet=lambda oge: 1):
+        """
+        ogeler'i aynen uretir; yalnizca her ogenin uretim suresi olculur
+        (tuketicinin ogeyle gecirdigi sure asamaya katilmaz).
+        """
+        ogeler = iter(ogeler)
+        while True:
+            with self.asama(ad) as aralik:
+                try:
+                    oge = next(ogeler)
+                except StopIteration:
+                    return
+                aralik.adet = adet(oge)
+            yield oge
+
+    def say(self, ad: str, n: int = 1):
+        with self._kilit:
+            self._sayaclar[ad] = self._sayaclar.get(ad, 0) + n
+
+    def ozet(self) -> dict:
+        """JSON'a yazilabilir toplamlar: {"asamalar": {...}, "sayaclar": {...}}."""
+        with self._kilit:
+            asamalar = {
+                ad: {k: round(v, 4) if isinstance(v, float) else v for k, v in a.items()}
+                for ad, a in self._asamalar.items()
+            }
+            return {"asamalar": asamalar, "sayaclar": dict(self._sayaclar)}
+
+    def birlestir(self, ozet: dict | None):
+        """Baska bir process'in (veya onceki oturumun) ozetini toplamlara ekler."""
+        if not ozet:
+            return
+        with self._kilit:
+            for ad, a in ozet.get("asamalar", {}).items():
+                hedef = self._asamalar.setdefault(ad, _bos_asama())
+                for k in ("cagri", "adet", "sure", "cpu", "rss_artis_mb"):
+                    hedef[k] += a.get(k) or 0
+                for k in ("rss_mb", "py_tepe_mb"):
+                    if a.get(k) is not None:
+                        hedef[k] = max(hedef.get(k) or 0.0, a[k])
+            for ad, n in ozet.get("sayaclar", {}).items():
+                self._sayaclar[ad] = self._sayaclar.get(ad, 0) + n
+
+    def _kaydet(self, ad, adet, sure, cpu, rss_bas):
+        rss = guncel_rss_mb()
+        py_tepe = (
+            tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            if tracemalloc.is_tracing() else None
+        )
+        with self._kilit:
+            a = self._asamalar.setdefault(ad, _bos_asama())
+            a["cagri"] += 1
+            a["adet"] += adet
+            a["sure"] += sure
+            a["cpu"] += cpu
+            if rss is not None:
+                a["rss_mb"] = max(a["rss_mb"] or 0.0, rss)
+                if rss_bas is not None:
+                    a["rss_artis_mb"] += rss - rss_bas
+            if py_tepe is not None:
+                a["py_tepe_mb"] = max(a["py_tepe_mb"] or 0.0, py_tepe)
+
+
+def _bos_asama() -> dict:
+    return {
+        "cagri": 0,
+        "adet": 0,
+        "sure": 0.0,
+        "cpu": 0.0,
+        "rss_mb": None,
+        "rss_artis_mb": 0.0,
+        "py_tepe_mb": None,
+    }
+
+
+class _EtkinOlcum:
+    """
+    Motorlarin kullandigi OLCUM vekili: kayitlari baglamdaki etkin Olcum'a
+    iletir. Etkin toplayici yoksa (orn. servisin skor istekleri, GUI
+    isinmasi) hicbir sey kaydedilmez; boylece eszamanli islerin olcumleri
+    bir run'a karismaz.
+    """
+
+    def asama(self, ad: str, adet: int = 0):
+        olcum = _ETKIN.get()
+        if olcum is None:
+            return contextlib.nullcontext(Aralik(adet))
+        return olcum.asama(ad, adet)
+
+    def uretec(self, ad: str, ogeler, adet=lambda oge: 1):
+        olcum = _ETKIN.get()
+        return iter(ogeler) if olcum is None else olcum.uretec(ad, ogeler, adet)
+
+    def say(self, ad: str, n: int = 1):
+        olcum = _ETKIN.get()
+        if olcum is not None:
+            olcum.say(ad, n)
+
+    def birlestir(self, ozet: dict | None):
+        olcum = _ETKIN.get()
+        if olcum is not None:
+            olcum.birlestir(ozet)
+
+
+def baglamda(islev):
+    """
+    islev'i cagiranin etkin toplayicisiyla calisacak sekilde sarar; thread
+    ve thread havuzu hedefleri icin (yeni thread'ler baglami devralmaz).
+    """
+    olcum = _ETKIN.get()
+    if olcum is None:
+        return islev
+
+    def sarili(*args, **kwargs):
+        token = _ETKIN.set(olcum)
+        try:
+            return islev(*args, **kwargs)
+        finally:
+            _ETKIN.reset(token)
+
+    return sarili
+
+
+def guncel_rss_mb():
+    """Process'in anlik bellek kullanimi (RSS, MB); olculemiyorsa None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def tepe_rss_mb():
+    """Process'in simdiye kadarki tepe bellek kullanimi (MB); olculemiyorsa None."""
+    try:
+        import resource
+
+        tepe = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux KB, macOS bayt dondurur
+        return tepe / (1024 * 1024) if sys.platform == "darwin" else tepe / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class Profil:
+    """profil() tarafindan uretilir; ad cikistan once degistirilebilir."""
+
+    def __init__(self, ad: str):
+        self.ad = ad
+        self.dosyalar = []
+
+
+@contextlib.contextmanager
+def profil(klasor: str, ad: str, cprofile: bool = False, bellek: bool = False):
+    """
+    Istege bagli cProfile ve tracemalloc kaydi. cProfile yalnizca cagiran
+    thread'i olcer; sonuc <ad>.prof (pstats) olarak yazilir. bellek=True ise
+    tracemalloc acilir ve en cok bellek ayiran satirlar <ad>_bellek.txt'ye
+    yazilir. Ikisi de kapaliysa hicbir sey yapmaz.
+    """
+    p = Profil(ad)
+    if not (cprofile or bellek):
+        yield p
+        return
+
+    profiler = None
+    if cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    baslatti = bellek and not tracemalloc.is_tracing()
+    if baslatti:
+        tracemalloc.start()
+    elif bellek:
+        tracemalloc.reset_peak()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield p
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        os.makedirs(klasor, exist_ok=True)
+        # Run tarihleri ":" ve bosluk icerir (Windows'ta gecersiz)
+        temel = os.path.join(klasor, re.sub(r"[^\w.-]+", "_", p.ad))
+        try:
+            if profiler is not None:
+                profiler.dump_stats(f"{temel}.prof")
+                p.dosyalar.append(f"{temel}.prof")
+            if bellek:
+                anlik = tracemalloc.take_snapshot()
+                _, tepe = tracemalloc.get_traced_memory()
+                with open(f"{temel}_bellek.txt", "w", encoding="utf-8") as f:
+                    f.write(f"Python heap tepesi: {tepe / (1024 * 1024):.1f} MB\n\n")
+                    for stat in anlik.statistics("lineno")[:30]:
+                        f.write(f"{stat}\n")
+                p.dosyalar.append(f"{temel}_bellek.txt")
+        except Exception as e:
+            print(f"[Uyari] Profil kaydedilemedi: {e}")
+        finally:
+            if baslatti:
+                tracemalloc.stop()
+
+
+# Motorlarin kayit noktasi; kayitlar etkin run toplayicisina gider
+OLCUM = _EtkinOlcum()
@@ -0,0 +1,171 @@
+# File: core\onnx_backend.py
+"""
+ONNX Runtime cikarim backend'i.
+
+Modeller models/<alias>/onnx/ altina disa aktarilir (scripts/download_models.py
+--onnx). Semantik model sentence-transformers'in ONNX backend'i ile, TrOCR
+optimum'un ORTModelForVision2Seq sinifi ile calistirilir. onnxruntime ve
+optimum[onnxruntime] yalnizca bu backend secildiginde gerekir.
+"""
+from pathlib import Path
+
+ONNX_KLASORU = "onnx"
+# Dinamik int8 nicemleme hedefleri (optimum AutoQuantizationConfig adlari)
+NICEMLEME_HEDEFLERI = ("avx2", "avx512", "avx512_vnni", "arm64")
+_OCR_EKI = "_quantized"
+
+
+def _nicemleme_dogrula(nicemleme: str):
+    if nicemleme and nicemleme not in NICEMLEME_HEDEFLERI:
+        raise ValueError(
+            f"Gecersiz nicemleme: {nicemleme} (secenekler: {NICEMLEME_HEDEFLERI})"
+        )
+
+
+def model_etiketi(backend: str, nicemleme: str = "") -> str:
+    """Onbellek anahtarlarina eklenen backend etiketi; torch icin bos."""
+    if backend != "onnx":
+        return ""
+    return f"onnx-{nicemleme}" if nicemleme else "onnx"
+
+
+# ---------------- SEMANTIK ----------------
+
+def semantik_dosya_adi(nicemleme: str = "") -> str:
+    if nicemleme:
+        return f"{ONNX_KLASORU}/model_qint8_{nicemleme}.onnx"
+    return f"{ONNX_KLASORU}/model.onnx"
+
+
+def semantik_modeli_yukle(model_path: str, nicemleme: str = ""):
+    """SentenceTransformer'i ONNX Runtime (CPU) ile yukler."""
+    from sentence_transformers import SentenceTransformer
+
+    _nicemleme_dogrula(nicemleme)
+    dosya = semantik_dosya_adi(nicemleme)
+    if Path(model_path).is_dir() and not (Path(model_path) / dosya).is_file():
+        raise FileNotFoundError(
+            f"{dosya} bulunamadi; once scripts/download_models.py --onnx calistirin"
+        )
+    return SentenceTransformer(
+        model_path,
+        backend="onnx",
+        model_kwargs={"file_name": dosya, "provider": "CPUExecutionProvider"},
+    )
+
+
+def semantik_disa_aktar(model_path: str, nicemleme: str = ""):
+    """model_path/onnx altina model.onnx ve istenirse int8 kopyasini yazar."""
+    from sentence_transformers import (
+        SentenceTransformer,
+        export_dynamic_quantized_onnx_model,
+    )
+
+    _nicemleme_dogrula(nicemleme)
+    # Yerel klasorde ONNX dosyasi yoksa yukleme sirasinda disa aktarilir
+    model = SentenceTransformer(model_path, backend="onnx")
+    if not (Path(model_path) / semantik_dosya_adi()).is_file():
+        model.save(model_path)
+    if nicemleme:
+        # Dosya adi hedefe gore (qint8/quint8) degismesin diye sonek sabitlenir
+        export_dynamic_quantized_onnx_model(
+            model, nicemleme, model_path, file_suffix=f"qint8_{nicemleme}"
+        )
+    return Path(model_path) / semantik_dosya_adi(nicemleme)
+
+
+# ---------------- OCR ----------------
+
+def ocr_modeli_yukle(model_path: str, nicemleme: str = ""):
+    """TrOCR'i ORTModelForVision2Seq olarak yukler; generate() arayuzu aynidir."""
+    from optimum.onnxruntime import ORTModelForVision2Seq
+
+    _nicemleme_dogrula(nicemleme)
+    klasor = Path(model_path) / ONNX_KLASORU
+    ek = _OCR_EKI if nicemleme else ""
+    dosyalar = {
+        "encoder_file_name": f"encoder_model{ek}.onnx",
+        "decoder_file_name": f"decoder_model{ek}.onnx",
+    }
+    gecmisli = f"decoder_with_past_model{ek}.onnx"
+    if (klasor / gecmisli).is_file():
+        dosyalar["decoder_with_past_file_name"] = gecmisli
+
+    eksik = [d for d in dosyalar.values() if not (klasor / d).is_file()]
+    if eksik:
+        raise FileNotFoundError(
+            f"{klasor} altinda {eksik} yok; once scripts/download_models.py --onnx calistirin"
+        )
+    return ORTModelForVision2Seq.from_pretrained(
+        klasor, provider="CPUExecutionProvider", **dosyalar
+    )
+
+
+def ocr_disa_aktar(model_path: str, nicemleme: str = ""):
+    """model_path/onnx altina encoder/decoder ONNX dosyalarini yazar."""
+    from optimum.onnxruntime import ORTModelForVision2Seq, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    _nicemleme_dogrula(nicemleme)
+    klasor = Path(model_path) / ONNX_KLASORU
+    model = ORTModelForVision2Seq.from_pretrained(model_path, export=True)
+    model.save_pretrained(klasor)
+
+    if nicemleme:
+        ayar = getattr(AutoQuantizationConfig, nicemleme)(
+            is_static=False, per_channel=False
+        )
+        for dosya in sorted(klasor.glob("*.onnx")):
+            if dosya.stem.endswith(_OCR_EKI):
+                continue
+            ORTQuantizer.from_pretrained(klasor, file_name=dosya.name).quantize(
+                save_dir=klasor, quantization_config=ayar, file_suffix=_OCR_EKI[1:]
+            )
+    return klasor
+
+
+# ---------------- SAPMA RAPORU ----------------
+
+def semantik_sapma(torch_modeli, onnx_modeli, cumleler) -> dict:
+    """Ayni cumlelerde iki backend'in embedding'lerini karsilastirir."""
+    import numpy as np
+
+    a = torch_modeli.encode(cumleler, normalize_embeddings=True)
+    b = onnx_modeli.encode(cumleler, normalize_embeddings=True)
+    kosinus = np.sum(a * b, axis=1)
+    # Ciftler arasi benzerlik matrisinin degisimi skorlara yansiyan sapmadir
+    skor_farki = np.abs(a @ a.T - b @ b.T)
+    return {
+        "ornek": len(cumleler),
+        "kosinus_min": float(kosinus.min()),
+        "kosinus_ort": float(kosinus.mean()),
+        "skor_farki_max": float(skor_farki.max()),
+        "skor_farki_ort": float(skor_farki.mean()),
+    }
+
+
+def ocr_sapma(torch_metinleri, onnx_metinleri) -> dict:
+    """Iki backend'in OCR ciktilarini tam eslesme ve karakter hata orani ile karsilastirir."""
+    hatalar = [
+        _duzenleme_mesafesi(a, b) / max(1, len(a))
+        for a, b in zip(torch_metinleri, onnx_metinleri)
+    ]
+    esit = sum(a == b for a, b in zip(torch_metinleri, onnx_metinleri))
+    return {
+        "ornek": len(hatalar),
+        "tam_eslesme": esit / max(1, len(hatalar)),
+        "cer_ort": sum(hatalar) / max(1, len(hatalar)),
+        "cer_max": max(hatalar, default=0.0),
+    }
+
+
+def _duzenleme_mesafesi(a: str, b: str) -> int:
+    onceki = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        simdiki = [i]
+        for j, cb in enumerate(b, start=1):
+            simdiki.append(
+                min(onceki[j] + 1, simdiki[j - 1] + 1, onceki[j - 1] + (ca != cb))
+            )
+        onceki = simdiki
+    return onceki[-1]
@@ -0,0 +1,62 @@
+# File: core\segmentasyon.py
+import re
+from typing import NamedTuple
+from core.hashing import metin_hash
+
+# Segmentasyon kurali degistiginde artirilir; kayitli parcalar gecersizlesir
+SEGMENT_SURUMU = 1
+
+# Cumle sonu (. ! ? ;) ardindan bosluk, ya da satir/paragraf sonu
+_SINIR = re.compile(r"(?<=[.!?;])\s+|\s*\n\s*")
+_KELIME = re.compile(r"\S+")
+
+
+class Parca(NamedTuple):
+    """Belge metninin bir cumle/paragraf parcasi."""
+
+    metin: str
+    baslangic: int
+    bitis: int
+    token_sayisi: int
+    ozet: str
+
+
+def _pencereler(metin, bas, bit, max_token):
+    """[bas, bit) araligini en fazla max_token kelimelik alt araliklara boler."""
+    kelimeler = list(_KELIME.finditer(metin, bas, bit))
+    if len(kelimeler) <= max_token:
+        if kelimeler:
+            yield kelimeler[0].start(), kelimeler[-1].end(), len(kelimeler)
+        return
+    for i in range(0, len(kelimeler), max_token):
+        grup = kelimeler[i : i + max_token]
+        yield grup[0].start(), grup[-1].end(), len(grup)
+
+
+def parcalara_bol(metin: str, min_len: int = 30, max_token: int = 80):
+    """
+    Metni cumle/paragraf parcalarina boler; her parca icin belge icindeki
+    ofsetleri, kelime sayisini ve ozetini tutar. Noktalama icermeyen uzun
+    metinler max_token kelimelik pencerelere bolunur. min_len karakterden
+    kisa parcalar atilir.
+    """
+    parcalar = []
+    bas = 0
+    sinirlar = [(m.start(), m.end()) for m in _SINIR.finditer(metin)]
+    sinirlar.append((len(metin), len(metin)))
+    for sinir_bas, sinir_bit in sinirlar:
+        for p_bas, p_bit, token in _pencereler(metin, bas, sinir_bas, max_token):
+            t = " ".join(metin[p_bas:p_bit].split())
+            if len(t) >= min_len:
+                parcalar.append(Parca(t, p_bas, p_bit, token, metin_hash(t)))
+        bas = sinir_bit
+    return parcalar
+
+
+def parcalari_kodla(parcalar) -> list:
+    """Parcalari JSON'a yazilabilir listeye cevirir."""
+    return [list(p) for p in parcalar]
+
+
+def parcalari_coz(veri) -> list:
+    return [Parca(*p) for p in veri]
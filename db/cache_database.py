@@ -0,0 +1,212 @@
+# File: db\cache_database.py
+import sqlite3
+import threading
+import time
+from datetime import datetime
+import os
+import numpy as np
+
+
+class CacheDatabase:
+    """
+    Analizler arasinda kalici onbellek (db/cache.db).
+    Cikarilan metinler dosya icerik ozeti + extractor anahtari ile,
+    embedding vektorleri metin ozeti + model alias'i ile,
+    gorsel OCR sonuclari gorsel icerik ozeti + OCR modu ile,
+    belge parcalari (JSON) metin ozeti + segmentasyon ayari ile saklanir.
+    """
+
+    # SQLite parametre sinirinin altinda kalmak icin IN (...) parca boyutu
+    _IN_PARCA = 500
+
+    def __init__(self, yol: str = "db/cache.db"):
+        os.makedirs(os.path.dirname(yol) or ".", exist_ok=True)
+        # check_same_thread=False: GUI thread + worker thread paylasimi icin
+        # Process havuzu iscileri de ayni dosyaya yazar: WAL + bekleme suresi
+        self.conn = sqlite3.connect(yol, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.lock = threading.Lock()
+        self.cursor = self.conn.cursor()
+        self._create_table()
+
+    def _create_table(self):
+        with self.lock:
+            self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS text_cache (
+            dosya_hash TEXT,
+            anahtar TEXT,
+            metin TEXT,
+            tarih TEXT,
+            PRIMARY KEY (dosya_hash, anahtar)
+        )
+        """)
+            self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS embeddings (
+            metin_hash TEXT,
+            model TEXT,
+            dtype TEXT,
+            boyut INTEGER,
+            vektor BLOB,
+            son_erisim REAL,
+            PRIMARY KEY (metin_hash, model)
+        )
+        """)
+            self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS segments (
+            metin_hash TEXT,
+            ayar TEXT,
+            veri TEXT,
+            PRIMARY KEY (metin_hash, ayar)
+        )
+        """)
+            self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ocr_cache (
+            gorsel_hash TEXT,
+            ocr_mode TEXT,
+            metin TEXT,
+            PRIMARY KEY (gorsel_hash, ocr_mode)
+        )
+        """)
+            self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_embeddings_erisim
+        ON embeddings (son_erisim)
+        """)
+            self.conn.commit()
+
+    def get_text(self, dosya_hash: str, anahtar: str):
+        """Onbellekteki metni dondurur; yoksa None."""
+        with self.lock:
+            self.cursor.execute("""
+        SELECT metin FROM text_cache WHERE dosya_hash = ? AND anahtar = ?
+        """, (dosya_hash, anahtar))
+            row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def save_text(self, dosya_hash: str, anahtar: str, metin: str):
+        zaman = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with self.lock:
+            self.cursor.execute("""
+        INSERT INTO text_cache (dosya_hash, anahtar, metin, tarih)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(dosya_hash, anahtar) DO UPDATE SET
+            metin=excluded.metin, tarih=excluded.tarih
+        """, (dosya_hash, anahtar, metin, zaman))
+            self.conn.commit()
+
+    def get_segments(self, metin_hash: str, ayar: str):
+        """Kayitli parca listesini (JSON metni) dondurur; yoksa None."""
+        with self.lock:
+            self.cursor.execute("""
+        SELECT veri FROM segments WHERE metin_hash = ? AND ayar = ?
+        """, (metin_hash, ayar))
+            row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def save_segments(self, metin_hash: str, ayar: str, veri: str):
+        with self.lock:
+            self.cursor.execute("""
+        INSERT OR REPLACE INTO segments (metin_hash, ayar, veri) VALUES (?, ?, ?)
+        """, (metin_hash, ayar, veri))
+            self.conn.commit()
+
+    def get_ocr(self, gorsel_hash: str, ocr_mode: str):
+        """Gorselin kayitli OCR metnini dondurur; yoksa None."""
+        with self.lock:
+            self.cursor.execute("""
+        SELECT metin FROM ocr_cache WHERE gorsel_hash = ? AND ocr_mode = ?
+        """, (gorsel_hash, ocr_mode))
+            row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def save_ocr_many(self, ocr_mode: str, sonuclar: dict):
+        """{gorsel_hash: metin} kayitlarini toplu saklar."""
+        if not sonuclar:
+            return
+        with self.lock:
+            self.cursor.executemany("""
+        INSERT INTO ocr_cache (gorsel_hash, ocr_mode, metin)
+        VALUES (?, ?, ?)
+        ON CONFLICT(gorsel_hash, ocr_mode) DO UPDATE SET metin=excluded.metin
+        """, [(h, ocr_mode, m) for h, m in sonuclar.items()])
+            self.conn.commit()
+
+    def get_embeddings(self, metin_hashleri, model: str) -> dict:
+        """
+        Verilen ozetler icin kayitli vektorleri {hash: float32 dizi} olarak
+        dondurur ve erisim zamanlarini gunceller (LRU tahliyesi icin).
+        """
+        sonuc = {}
+        hashler = list(dict.fromkeys(metin_hashleri))
+        simdi = time.time()
+        with self.lock:
+            for i in range(0, len(hashler), self._IN_PARCA):
+                parca = hashler[i : i + self._IN_PARCA]
+                yer = ",".join("?" * len(parca))
+                self.cursor.execute(f"""
+            SELECT metin_hash, dtype, boyut, vektor FROM embeddings
+            WHERE model = ? AND metin_hash IN ({yer})
+            """, (model, *parca))
+                for h, dtype, boyut, blob in self.cursor.fetchall():
+                    vek = np.frombuffer(blob, dtype=dtype)
+                    if vek.size == boyut:
+                        sonuc[h] = vek.astype(np.float32)
+            if sonuc:
+                self.cursor.executemany("""
+            UPDATE embeddings SET son_erisim = ? WHERE metin_hash = ? AND model = ?
+            """, [(simdi, h, model) for h in sonuc])
+                self.conn.commit()
+        return sonuc
+
+    def save_embeddings(self, model: str, vektorler: dict, dtype: str = "float16"):
+        """{hash: vektor} kayitlarini kompakt blob olarak toplu saklar."""
+        if not vektorler:
+            return
+        simdi = time.time()
+        rows = []
+        for h, vek in vektorler.items():
+            dizi = np.ascontiguousarray(vek, dtype=dtype)
+            rows.append((h, model, dizi.dtype.name, int(dizi.size), dizi.tobytes(), simdi))
+        with self.lock:
+            self.cursor.executemany("""
+        INSERT INTO embeddings (metin_hash, model, dtype, boyut, vektor, son_erisim)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(metin_hash, model) DO UPDATE SET
+            dtype=excluded.dtype, boyut=excluded.boyut,
+            vektor=excluded.vektor, son_erisim=excluded.son_erisim
+        """, rows)
+            self.conn.commit()
+
+    def evict_embeddings(self, max_bayt: int) -> int:
+        """
+        Toplam vektor boyutu max_bayt'i asarsa en uzun suredir kullanilmayan
+        kayitlari siler. Silinen kayit sayisini dondurur.
+        """
+        with self.lock:
+            self.cursor.execute("SELECT COALESCE(SUM(LENGTH(vektor)), 0) FROM embeddings")
+            toplam = self.cursor.fetchone()[0]
+            if toplam <= max_bayt:
+                return 0
+            self.cursor.execute("""
+        SELECT metin_hash, model, LENGTH(vektor) FROM embeddings
+        ORDER BY son_erisim ASC
+        """)
+            silinecek = []
+            for h, model, bayt in self.cursor.fetchall():
+                if toplam <= max_bayt:
+                    break
+                silinecek.append((h, model))
+                toplam -= bayt
+            self.cursor.executemany("""
+        DELETE FROM embeddings WHERE metin_hash = ? AND model = ?
+        """, silinecek)
+            self.conn.commit()
+        return len(silinecek)
+
+    def clear_all(self):
+        """Tum onbellek kayitlarini siler."""
+        with self.lock:
+            self.cursor.execute("DELETE FROM text_cache")
+            self.cursor.execute("DELETE FROM embeddings")
+            self.cursor.execute("DELETE FROM ocr_cache")
+            self.cursor.execute("DELETE FROM segments")
+            self.conn.commit()
@@ -4,13 +4,22 @@ import threading
 from datetime import datetime
 import os
 import csv
+import json
+from core.olcum import ASAMA_ALANLARI, OLCUM
 
 
 class ResultDatabase:
+    # PRAGMA user_version ile izlenen sema surumu; _migrate adimlari sirayla uygular
+    SEMA_SURUMU = 4
+
     def __init__(self):
         os.makedirs("db", exist_ok=True)
         # check_same_thread=False: GUI thread + worker thread paylasimi icin
         self.conn = sqlite3.connect("db/results.db", check_same_thread=False)
+        # WAL: okuyucular (GUI) yazari (analiz thread'i) beklemez;
+        # NORMAL senkronizasyon her commit'te fsync yapmaz
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
         self.lock = threading.Lock()
         self.cursor = self.conn.cursor()
         self._create_table()
@@ -26,14 +35,27 @@ class ResultDatabase:
             sem REAL,
             final REAL,
             durum TEXT,
-            tarih TEXT
+            tarih TEXT,
+            atlandi INTEGER DEFAULT 0
         )
         """)
             self.cursor.execute("""
         CREATE TABLE IF NOT EXISTS runs (
             tarih TEXT PRIMARY KEY,
             model TEXT,
-            ocr_mode TEXT
+            ocr_mode TEXT,
+            base_tarih TEXT,
+            tamamlandi INTEGER DEFAULT 0,
+            olcum TEXT
+        )
+        """)
+            # Her run'da analiz edilen belgeler ve metin ozetleri (artimli analiz icin)
+            self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS run_docs (
+            tarih TEXT,
+            dosya TEXT,
+            metin_hash TEXT,
+            PRIMARY KEY (tarih, dosya)
         )
         """)
             self.cursor.execute("""
@@ -48,6 +70,70 @@ class ResultDatabase:
         )
         """)
             self.conn.commit()
+            self._migrate()
+
+    def _migrate(self):
+        """
+        Mevcut db/results.db dosyalarini guncel semaya tasir.
+        Her adim bir kez calisir; ilerleme PRAGMA user_version'da tutulur.
+        (kilit cagiran tarafindan tutulur)
+        """
+        self.cursor.execute("PRAGMA user_version")
+        surum = self.cursor.fetchone()[0]
+        adimlar = {
+            1: self._migrate_v1_kolonlar,
+            2: self._migrate_v2_indeksler,
+            3: self._migrate_v3_tamamlanma,
+            4: self._migrate_v4_olcum,
+        }
+        for hedef in range(surum + 1, self.SEMA_SURUMU + 1):
+            try:
+                adimlar[hedef]()
+                self.cursor.execute(f"PRAGMA user_version = {hedef}")
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def _migrate_v1_kolonlar(self):
+        # Eski veritabanlari icin eksik kolonlari ekle
+        self._kolon_ekle("results", "atlandi", "INTEGER DEFAULT 0")
+        self._kolon_ekle("runs", "base_tarih", "TEXT")
+
+    def _migrate_v2_indeksler(self):
+        # get_results_by_tarih, get_evidences ve artimli aktarim tam tarama yapmasin
+        self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_results_tarih ON results (tarih)
+        """)
+        self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_results_cift ON results (tarih, dosya1, dosya2)
+        """)
+        self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_evidences_cift ON evidences (tarih, dosya1, dosya2)
+        """)
+
+    def _migrate_v3_tamamlanma(self):
+        # Yarida kalan run'lar devam ettirilebilsin; eski run'lar tamamlanmis sayilir
+        if "tamamlandi" not in self._kolonlar("runs"):
+            self.cursor.execute("ALTER TABLE runs ADD COLUMN tamamlandi INTEGER DEFAULT 0")
+            self.cursor.execute("UPDATE runs SET tamamlandi = 1")
+
+    def _migrate_v4_olcum(self):
+        # Run basina asama sureleri/bellek (JSON); eski run'larda bos kalir
+        self._kolon_ekle("runs", "olcum", "TEXT")
+
+    def _kolonlar(self, tablo: str) -> set:
+        self.cursor.execute(f"PRAGMA table_info({tablo})")
+        return {r[1] for r in self.cursor.fetchall()}
+
+    def _kolon_ekle(self, tablo: str, kolon: str, tip: str):
+        """Kolon yoksa ekler (kilit cagiran tarafindan tutulur)."""
+        if kolon not in self._kolonlar(tablo):
+            self.cursor.execute(f"ALTER TABLE {tablo} ADD COLUMN {kolon} {tip}")
+
+    def toplu_yazici(self, tarih: str, parti_boyutu: int = 1000, yazildi_cb=None):
+        """Run sonuclarini tamponlayip buyuk islemlerle yazan SonucYazici."""
+        return SonucYazici(self, tarih, parti_boyutu, yazildi_cb)
 
     def save_result(self, r: dict, tarih: str | None = None):
         """Sonucu kaydeder. Tarih verilirse tum satirlar ayni zaman damgasi alir."""
@@ -55,8 +141,8 @@ class ResultDatabase:
         with self.lock:
             self.cursor.execute("""
         INSERT INTO results
-        (dosya1, dosya2, lex, sem, final, durum, tarih)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+        (dosya1, dosya2, lex, sem, final, durum, tarih, atlandi)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             r["dosya1"],
             r["dosya2"],
@@ -64,7 +150,8 @@ class ResultDatabase:
             r["sem"],
             r["final"],
             r["durum"],
-            zaman
+            zaman,
+            int(bool(r.get("atlandi", False))),
         ))
             self.conn.commit()
 
@@ -72,20 +159,126 @@ class ResultDatabase:
         """Turkce isimle geriye donuk uyumluluk saglar."""
         self.save_result(r)
 
-    def save_run_meta(self, tarih: str, model: str, ocr_mode: str):
-        """Run bilgisini saklar; ayni tarih varsa gunceller."""
+    def save_run_meta(
+        self, tarih: str, model: str, ocr_mode: str, base_tarih: str | None = None
+    ):
+        """Run bilgisini saklar; ayni tarih varsa gunceller.
+        base_tarih: artimli run'larda genisletilen onceki run."""
         with self.lock:
             self.cursor.execute("""
-        INSERT INTO runs (tarih, model, ocr_mode)
-        VALUES (?, ?, ?)
-        ON CONFLICT(tarih) DO UPDATE SET model=excluded.model, ocr_mode=excluded.ocr_mode
-        """, (tarih, model, ocr_mode))
+        INSERT INTO runs (tarih, model, ocr_mode, base_tarih)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(tarih) DO UPDATE SET model=excluded.model,
+            ocr_mode=excluded.ocr_mode, base_tarih=excluded.base_tarih
+        """, (tarih, model, ocr_mode, base_tarih))
+            self.conn.commit()
+
+    def save_run_olcum(self, tarih: str, olcum: dict):
+        """Run'in asama olcumlerini (Olcum.ozet() bicimi) JSON olarak saklar."""
+        with self.lock:
+            self.cursor.execute(
+                "UPDATE runs SET olcum = ? WHERE tarih = ?",
+                (json.dumps(olcum, ensure_ascii=False), tarih),
+            )
+            self.conn.commit()
+
+    def get_run_olcum(self, tarih: str):
+        """Run'in olcum sozlugu; kaydedilmemisse None."""
+        with self.lock:
+            self.cursor.execute("SELECT olcum FROM runs WHERE tarih = ?", (tarih,))
+            row = self.cursor.fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def get_all_run_olcum(self):
+        """Olcumu olan run'lar: [(tarih, olcum sozlugu), ...] (en yeni once)."""
+        with self.lock:
+            self.cursor.execute("""
+        SELECT tarih, olcum FROM runs WHERE olcum IS NOT NULL ORDER BY tarih DESC
+        """)
+            rows = self.cursor.fetchall()
+        return [(t, json.loads(o)) for t, o in rows]
+
+    def run_exists(self, tarih: str) -> bool:
+        with self.lock:
+            self.cursor.execute("SELECT 1 FROM runs WHERE tarih = ?", (tarih,))
+            return self.cursor.fetchone() is not None
+
+    def set_run_complete(self, tarih: str):
+        """Run'in tum ciftleri yazildiginda cagrilir."""
+        with self.lock:
+            self.cursor.execute("UPDATE runs SET tamamlandi = 1 WHERE tarih = ?", (tarih,))
+            self.conn.commit()
+
+    def is_run_complete(self, tarih: str) -> bool:
+        with self.lock:
+            self.cursor.execute("SELECT tamamlandi FROM runs WHERE tarih = ?", (tarih,))
+            row = self.cursor.fetchone()
+        return bool(row and row[0])
+
+    def get_latest_incomplete_run(self, model: str, ocr_mode: str):
+        """Ayni model/OCR moduyla baslatilip yarida kalmis en son run."""
+        with self.lock:
+            self.cursor.execute("""
+        SELECT tarih FROM runs
+        WHERE model = ? AND ocr_mode = ? AND tamamlandi = 0
+        ORDER BY tarih DESC LIMIT 1
+        """, (model, ocr_mode))
+            row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def get_run_meta(self, tarih: str):
+        """(tarih, model, ocr_mode, base_tarih) veya None."""
+        with self.lock:
+            self.cursor.execute("""
+        SELECT tarih, model, ocr_mode, base_tarih FROM runs WHERE tarih = ?
+        """, (tarih,))
+            return self.cursor.fetchone()
+
+    def save_run_docs(self, tarih: str, belgeler: dict):
+        """Run'da analiz edilen belgeleri {dosya: metin_hash} olarak saklar."""
+        with OLCUM.asama("db_yazma", adet=len(belgeler)), self.lock:
+            self.cursor.executemany("""
+        INSERT OR REPLACE INTO run_docs (tarih, dosya, metin_hash) VALUES (?, ?, ?)
+        """, [(tarih, d, h) for d, h in belgeler.items()])
+            self.conn.commit()
+
+    def get_run_docs(self, tarih: str) -> dict:
+        with self.lock:
+            self.cursor.execute("""
+        SELECT dosya, metin_hash FROM run_docs WHERE tarih = ?
+        """, (tarih,))
+            return dict(self.cursor.fetchall())
+
+    def get_latest_base_run(self, model: str, ocr_mode: str, haric: str | None = None):
+        """
+        Belge listesi kayitli, ayni model/OCR moduyla tamamlanmis en son run.
+        haric verilirse o run (orn. yeni baslayan run) temel alinmaz.
+        """
+        with self.lock:
+            self.cursor.execute("""
+        SELECT r.tarih FROM runs r
+        WHERE r.model = ? AND r.ocr_mode = ? AND r.tamamlandi = 1
+            AND r.tarih IS NOT ?
+            AND EXISTS (SELECT 1 FROM run_docs d WHERE d.tarih = r.tarih)
+        ORDER BY r.tarih DESC LIMIT 1
+        """, (model, ocr_mode, haric))
+            row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def copy_evidences(self, base_tarih: str, yeni_tarih: str, ciftler):
+        """Onceki run'in kanitlarini verilen (dosya1, dosya2) ciftleri icin kopyalar."""
+        with self.lock:
+            self.cursor.executemany("""
+        INSERT INTO evidences (tarih, dosya1, dosya2, parca1, parca2, skor)
+        SELECT ?, dosya1, dosya2, parca1, parca2, skor FROM evidences
+        WHERE tarih = ? AND dosya1 = ? AND dosya2 = ?
+        """, [(yeni_tarih, base_tarih, d1, d2) for d1, d2 in ciftler])
             self.conn.commit()
 
     def get_all_results(self):
         with self.lock:
             self.cursor.execute("""
-        SELECT dosya1, dosya2, lex, sem, final, durum, tarih
+        SELECT dosya1, dosya2, lex, sem, final, durum, tarih, atlandi
         FROM results
         ORDER BY id DESC
         """)
@@ -108,6 +301,16 @@ class ResultDatabase:
                 rows = [(r[0], None, None, None) for r in self.cursor.fetchall()]
         return rows
 
+    def get_pair_results(self, tarih):
+        """Run'in sonuclarini {(dosya1, dosya2): (lex, sem, atlandi)} olarak dondurur."""
+        with OLCUM.asama("db_okuma") as aralik, self.lock:
+            self.cursor.execute("""
+        SELECT dosya1, dosya2, lex, sem, atlandi FROM results WHERE tarih = ?
+        """, (tarih,))
+            rows = self.cursor.fetchall()
+            aralik.adet = len(rows)
+        return {(r[0], r[1]): (r[2], r[3], bool(r[4])) for r in rows}
+
     def get_results_by_tarih(self, tarih):
         """Belirli bir zaman damgasi icin sonuclari dondurur."""
         with self.lock:
@@ -120,31 +323,49 @@ class ResultDatabase:
             return self.cursor.fetchall()
 
     def export_csv(self, file_path: str):
-        """Tum sonuclari CSV olarak disari aktarir."""
+        """
+        Tum sonuclari CSV olarak disari aktarir. Olcumu olan run'lar varsa
+        asama toplamlari yanina <ad>_olcum.csv olarak yazilir; yolu dondurulur.
+        """
         rows = self.get_all_results()
-        header = ["dosya1", "dosya2", "lex", "sem", "final", "durum", "tarih"]
+        header = ["dosya1", "dosya2", "lex", "sem", "final", "durum", "tarih", "atlandi"]
         with open(file_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(header)
             writer.writerows(rows)
 
+        olcumler = self.get_all_run_olcum()
+        if not olcumler:
+            return None
+        kok, uzanti = os.path.splitext(file_path)
+        olcum_yolu = f"{kok}_olcum{uzanti or '.csv'}"
+        alanlar = list(ASAMA_ALANLARI)
+        with open(olcum_yolu, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["tarih", "asama", *alanlar])
+            for tarih, olcum in olcumler:
+                for asama, a in olcum.get("asamalar", {}).items():
+                    writer.writerow([tarih, asama, *(a.get(k) for k in alanlar)])
+                # Sayaclar yalnizca adet sutununu doldurur
+                for ad, n in olcum.get("sayaclar", {}).items():
+                    writer.writerow(
+                        [tarih, f"sayac:{ad}", *(n if k == "adet" else None for k in alanlar)]
+                    )
+        return olcum_yolu
+
     def clear_all(self):
         """Tum kayitlari siler."""
         with self.lock:
             self.cursor.execute("DELETE FROM results")
             self.cursor.execute("DELETE FROM runs")
             self.cursor.execute("DELETE FROM evidences")
+            self.cursor.execute("DELETE FROM run_docs")
             self.conn.commit()
 
     def save_evidences(self, tarih: str, dosya1: str, dosya2: str, evidences: list[dict]):
-        """Parca bazli kanitlari toplu kaydeder."""
-        if not evidences:
-            return
-        rows = [
-            (tarih, dosya1, dosya2, e["p1"], e["p2"], e["score"])
-            for e in evidences
-        ]
-        with self.lock:
+        """Parca bazli kanitlari toplu kaydeder; bos liste isaret satiri olarak yazilir."""
+        rows = _kanit_satirlari(tarih, dosya1, dosya2, evidences)
+        with OLCUM.asama("db_yazma", adet=len(rows)), self.lock:
             self.cursor.executemany("""
             INSERT INTO evidences (tarih, dosya1, dosya2, parca1, parca2, skor)
             VALUES (?, ?, ?, ?, ?, ?)
@@ -152,7 +373,10 @@ class ResultDatabase:
             self.conn.commit()
 
     def get_evidences(self, tarih: str, dosya1: str, dosya2: str):
-        """Belirli run ve dosya cifti icin kanitlari getirir."""
+        """
+        Belirli run ve dosya cifti icin kanitlari getirir. Kanit hic
+        hesaplanmamissa None, hesaplanip eslesme bulunamadiysa [] doner.
+        """
         with self.lock:
             self.cursor.execute("""
             SELECT parca1, parca2, skor FROM evidences
@@ -161,7 +385,102 @@ class ResultDatabase:
             )
             """, (tarih, dosya1, dosya2, dosya2, dosya1))
             rows = self.cursor.fetchall()
+        if not rows:
+            return None
         return [
             {"p1": r[0], "p2": r[1], "score": r[2]}
             for r in rows
+            if r[0] is not None
         ]
+
+
+class SonucYazici:
+    """
+    Bir run'in sonuc ve kanit satirlarini tamponda biriktirir, parti_boyutu
+    satira ulasinca tek islemde (tek commit) yazar. Cift basina commit/fsync
+    yerine run basina birkac commit yapilir.
+
+        with db.toplu_yazici(tarih) as yazici:
+            yazici.sonuc_ekle(s)
+            yazici.kanit_ekle(d1, d2, kanitlar)
+
+    yazildi_cb verilirse her sonuc dict'i, partisi commit edildikten sonra
+    ona iletilir (commit edilmemis sonuc disariya yansimaz).
+    """
+
+    def __init__(
+        self, db: ResultDatabase, tarih: str, parti_boyutu: int = 1000, yazildi_cb=None
+    ):
+        self.db = db
+        self.tarih = tarih
+        self.parti_boyutu = max(1, int(parti_boyutu))
+        self.yazildi_cb = yazildi_cb
+        self._sonuclar = []
+        self._kanitlar = []
+        self._bekleyenler = []
+
+    def sonuc_ekle(self, r: dict):
+        if self.yazildi_cb is not None:
+            self._bekleyenler.append(r)
+        self._sonuclar.append((
+            r["dosya1"],
+            r["dosya2"],
+            r["lex"],
+            r["sem"],
+            r["final"],
+            r["durum"],
+            self.tarih,
+            int(bool(r.get("atlandi", False))),
+        ))
+        self._gerekirse_yaz()
+
+    def kanit_ekle(self, dosya1: str, dosya2: str, evidences: list[dict]):
+        self._kanitlar.extend(_kanit_satirlari(self.tarih, dosya1, dosya2, evidences))
+        self._gerekirse_yaz()
+
+    def _gerekirse_yaz(self):
+        if len(self._sonuclar) + len(self._kanitlar) >= self.parti_boyutu:
+            self.flush()
+
+    def flush(self):
+        """Tampondaki satirlari tek islemde yazar; hata olursa parti geri alinir."""
+        if not self._sonuclar and not self._kanitlar:
+            return
+        sonuclar, self._sonuclar = self._sonuclar, []
+        kanitlar, self._kanitlar = self._kanitlar, []
+        bekleyenler, self._bekleyenler = self._bekleyenler, []
+        db = self.db
+        with OLCUM.asama("db_yazma", adet=len(sonuclar) + len(kanitlar)), db.lock:
+            try:
+                db.cursor.executemany("""
+        INSERT INTO results
+        (dosya1, dosya2, lex, sem, final, durum, tarih, atlandi)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, sonuclar)
+                db.cursor.executemany("""
+        INSERT INTO evidences (tarih, dosya1, dosya2, parca1, parca2, skor)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, kanitlar)
+                db.conn.commit()
+            except Exception:
+                db.conn.rollback()
+                raise
+        for r in bekleyenler:
+            self.yazildi_cb(r)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+
+def _kanit_satirlari(tarih, dosya1, dosya2, evidences):
+    """
+    evidences tablosu satirlari. Eslesme yoksa parca/skor alanlari NULL tek
+    bir isaret satiri yazilir; kanitin hesaplandigi boylece kaybolmaz.
+    """
+    if not evidences:
+        return [(tarih, dosya1, dosya2, None, None, None)]
+    return [(tarih, dosya1, dosya2, e["p1"], e["p2"], e["score"]) for e in evidences]
@@ -1,5 +1,8 @@
 # File: main.py
+import multiprocessing
 from app.gui import SimilarityGUI
 
 if __name__ == "__main__":
+    # Paketlenmis EXE'de process havuzu iscileri icin gerekli
+    multiprocessing.freeze_support()
     SimilarityGUI().run()
@@ -0,0 +1,346 @@
+# File: scripts\benchmark.py
+"""
+Tekrarlanabilir verim olcumu.
+
+    python scripts/benchmark.py --belge 200 --stub            # model indirmeden
+    python scripts/benchmark.py --korpus KLASOR --ocr heavy -o sonuc.json
+
+Sentetik korpus uretilir (veya --korpus kullanilir) ve asamalar ayri ayri
+olculur: extractor bazinda metin cikarma, TrOCREngine.ocr_yap, cift bazli
+BenzerlikMotoru.hesapla, korpus skorlama (cift_skorlari), KanitMotoru ile
+kanit hazirlama/bulma ve DB yazimi.
+Sonuc (belge/s, cift/s, tepe RSS, asama yuzdeleri) JSON olarak yazilir.
+--stub modunda semantik model ve TrOCR yerine deterministik stub'lar model
+kaydina konur; boylece surumler model indirmeden karsilastirilabilir.
+Gecici calisma klasoru (db/, dokumanlar/) sonunda silinir (--sakla haric).
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+KOK = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(KOK))
+
+import korpus_uret  # noqa: E402
+from app.similarity_app import SimilarityApp  # noqa: E402
+from core.document_processor import DocumentProcessor  # noqa: E402
+from core.model_registry import MODELLER  # noqa: E402
+from core.olcum import Olcum, tepe_rss_mb  # noqa: E402
+from db.database import ResultDatabase  # noqa: E402
+
+
+# ---------------- STUB MODELLER ----------------
+
+class StubKodlayici:
+    """SentenceTransformer yerine: kelime ozetlerinden sabit boyutlu vektor."""
+
+    boyut = 384
+
+    def encode(self, metinler, batch_size=32, convert_to_numpy=True, show_progress_bar=False, **_):
+        tek = isinstance(metinler, str)
+        metinler = [metinler] if tek else list(metinler)
+        emb = np.zeros((len(metinler), self.boyut), dtype=np.float32)
+        for i, metin in enumerate(metinler):
+            for kelime in metin.lower().split():
+                emb[i, zlib.crc32(kelime.encode()) % self.boyut] += 1.0
+        return emb[0] if tek else emb
+
+
+class _StubTensor:
+    def __init__(self, dizi):
+        self.dizi = dizi
+
+    def to(self, _cihaz):
+        return self
+
+
+class StubOcrIslemci:
+    """TrOCRProcessor yerine: satirlari 384x384'e olcekler (on isleme maliyeti)."""
+
+    def __call__(self, images=None, return_tensors="pt"):
+        import cv2
+
+        dizi = np.stack([
+            cv2.resize(np.asarray(img, dtype=np.uint8), (384, 384)) for img in images
+        ])
+        return type("Girdi", (), {"pixel_values": _StubTensor(dizi)})()
+
+    def batch_decode(self, ids, skip_special_tokens=True):
+        return [f"satir {int(i)}" for i in ids]
+
+
+class StubOcrModel:
+    def generate(self, pixel_values):
+        return [int(x.mean()) for x in pixel_values.dizi]
+
+
+def stublari_kaydet(model_mode: str, ocr_mode: str):
+    """Stub'lari motorlarin kullanacagi model kaydi anahtarlarina yerlestirir."""
+    from core.analiz_motoru import BenzerlikMotoru
+    from core.ocr_motoru import TrOCREngine
+
+    alias = BenzerlikMotoru.MODEL_MAP[model_mode][1]
+    MODELLER.getir("semantik", alias, "torch", lambda: (StubKodlayici(), "torch"))
+    if ocr_mode != "off":
+        alias = TrOCREngine.MODEL_MAP[ocr_mode][1]
+        MODELLER.getir(
+            "ocr", alias, "torch",
+            lambda: (StubOcrIslemci(), StubOcrModel(), "torch", "cpu"),
+        )
+
+
+# ---------------- OLCUM ----------------
+
+# Asama -> adet birimi (raporda hiz bu birim/saniye)
+BIRIMLER = {
+    "ocr_model_yukleme": "model",
+    "ocr": "sayfa",
+    "model_yukleme": "model",
+    "hesapla": "cift",
+    "korpus_skorlama": "cift",
+    "kanit_hazirlama": "belge",
+    "kanit": "cift",
+    "db_yazma": "satir",
+}
+
+
+def rapor(ozet: dict, birimler: dict = BIRIMLER) -> dict:
+    """Olcum ozetine birim, hiz ve toplam sure icindeki yuzdeyi ekler."""
+    asamalar = ozet["asamalar"]
+    toplam = sum(a["sure"] for a in asamalar.values()) or 1.0
+    return {
+        ad: {
+            **a,
+            "birim": birimler.get(ad, "belge" if ad.startswith("cikarma_") else None),
+            "hiz": round(a["adet"] / a["sure"], 2) if a["sure"] else None,
+            "yuzde": round(100 * a["sure"] / toplam, 1),
+        }
+        for ad, a in asamalar.items()
+    }
+
+
+# ---------------- ASAMALAR ----------------
+
+def metinleri_cikar(olcer, klasor, dosyalar):
+    """Extractor bazinda (OCR kapali) metin cikarma."""
+    processor = DocumentProcessor(ocr_mode="off")
+    metinler = {}
+    for ad in dosyalar:
+        bicim = ad.rsplit(".", 1)[-1].lower()
+        with olcer.asama(f"cikarma_{bicim}") as k:
+            metinler[ad] = processor.metin_cikar(str(Path(klasor) / ad))
+            k.adet += 1
+    return metinler
+
+
+def ocr_olc(olcer, klasor, taranmislar, ocr_mode, batch_boyutu, en_fazla_sayfa):
+    """Taranmis PDF sayfalarinin gorsellerini TrOCREngine.ocr_yap ile okur."""
+    import io
+
+    import fitz
+    from PIL import Image
+
+    from core.ocr_motoru import TrOCREngine
+
+    gorseller = []
+    for ad in taranmislar:
+        with fitz.open(str(Path(klasor) / ad)) as doc:
+            for sayfa in doc:
+                for img in sayfa.get_images(full=True):
+                    veri = doc.extract_image(img[0])["image"]
+                    gorseller.append((ad, Image.open(io.BytesIO(veri)).convert("RGB")))
+                if len(gorseller) >= en_fazla_sayfa:
+                    break
+        if len(gorseller) >= en_fazla_sayfa:
+            break
+
+    with olcer.asama("ocr_model_yukleme") as k:
+        motor = TrOCREngine(mode=ocr_mode, batch_size=batch_boyutu)
+        k.adet += 1
+    ocr_metinleri = {}
+    for ad, gorsel in gorseller:
+        with olcer.asama("ocr") as k:
+            ocr_metinleri[ad] = ocr_metinleri.get(ad, "") + motor.ocr_yap(gorsel)
+            k.adet += 1
+    return ocr_metinleri
+
+
+def main():
+    p = argparse.ArgumentParser(description="Asama bazli verim olcumu (JSON rapor).")
+    p.add_argument("--korpus", help="Mevcut korpus klasoru (verilmezse uretilir)")
+    korpus_uret.arguman_ekle(p)
+    p.add_argument("--model", choices=["heavy", "light"], default="heavy")
+    p.add_argument("--ocr", choices=["heavy", "light", "off"], default="heavy")
+    p.add_argument("--backend", choices=["torch", "onnx"], default="torch")
+    p.add_argument("--stub", action="store_true", help="Model indirmeden stub kodlayici/OCR")
+    p.add_argument("--cift", type=int, default=200, help="hesapla ile olculecek cift sayisi")
+    p.add_argument("--kanit-cift", type=int, default=50, help="Kanit cikarilacak cift sayisi")
+    p.add_argument("--ocr-sayfa", type=int, default=20, help="OCR'lanacak en fazla sayfa")
+    p.add_argument("--ocr-batch", type=int, default=16)
+    p.add_argument("-o", "--cikti", help="JSON rapor dosyasi (varsayilan stdout)")
+    p.add_argument("--sakla", action="store_true", help="Gecici calisma klasorunu silme")
+    args = p.parse_args()
+    backend = "torch" if args.stub else args.backend
+
+    calisma = Path(tempfile.mkdtemp(prefix="benchmark_"))
+    eski_dizin = os.getcwd()
+    # Harness asamalari; motorlarin ic asamalari ic_olcum'de ayrica toplanir
+    olcer = Olcum()
+    ic_olcum = Olcum()
+    uretim_suresi = None
+    rng = random.Random(args.tohum)
+    # Motor/extractor print'leri JSON raporu bozmasin
+    with contextlib.redirect_stdout(sys.stderr), ic_olcum.etkin():
+        try:
+            if args.korpus:
+                klasor = Path(args.korpus).resolve()
+                manifest_yolu = klasor / "manifest.json"
+                manifest = (
+                    json.loads(manifest_yolu.read_text(encoding="utf-8"))
+                    if manifest_yolu.is_file() else None
+                )
+            else:
+                klasor = calisma / "korpus"
+                # Uretim suresi asama yuzdelerine katilmaz
+                bas = time.perf_counter()
+                manifest = korpus_uret.korpus_uret(klasor, **korpus_uret.uretim_ayarlari(args))
+                uretim_suresi = round(time.perf_counter() - bas, 4)
+            # db/ ve dokumanlar/ gecici klasorde olussun
+            os.chdir(calisma)
+
+            dosyalar = sorted(
+                f for f in os.listdir(klasor)
+                if f.rsplit(".", 1)[-1].lower() in korpus_uret.BICIMLER
+            )
+            if args.stub:
+                stublari_kaydet(args.model, args.ocr)
+
+            metinler = metinleri_cikar(olcer, klasor, dosyalar)
+
+            taranmislar = [d for d in dosyalar if d.endswith(".pdf") and not metinler[d].strip()]
+            if taranmislar and args.ocr != "off":
+                for ad, metin in ocr_olc(
+                    olcer, klasor, taranmislar, args.ocr, args.ocr_batch, args.ocr_sayfa
+                ).items():
+                    metinler[ad] = metin
+
+            app = SimilarityApp(
+                model_mode=args.model,
+                ocr_mode="off",
+                ayarlar={"cikarim_backend": backend, "embedding_onbellegi": False},
+            )
+            with olcer.asama("model_yukleme") as k:
+                motor = app.motor
+                k.adet += 1
+
+            adlar = list(metinler)
+            liste = [metinler[d] for d in adlar]
+            n = len(adlar)
+            tum_ciftler = [(i, j) for i in range(n) for j in range(i + 1, n)]
+            for i, j in rng.sample(tum_ciftler, min(args.cift, len(tum_ciftler))):
+                with olcer.asama("hesapla") as k:
+                    motor.hesapla(liste[i], liste[j])
+                    k.adet += 1
+
+            # Hazirlik (TF-IDF fit + kodlama) ve tum ciftlerin skorlanmasi
+            with olcer.asama("korpus_skorlama") as k:
+                motor.korpus_hazirla(liste)
+                i_dizi, j_dizi = np.triu_indices(n, k=1)
+                lex, sem, final = motor.cift_skorlari(i_dizi, j_dizi)
+                k.adet = len(i_dizi)
+            satirlar = list(zip(i_dizi.tolist(), j_dizi.tolist()))
+
+            # Kanit analizdeki gibi: parca matrisi korpusa bir kez hazirlanir,
+            # en yuksek skorlu ciftler icin kanit_bul cagrilir
+            tarih = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            app.veriler = dict(metinler)
+            with olcer.asama("kanit_hazirlama") as k:
+                kanit = app._kanit_hazirla(adlar, tarih)
+                k.adet = n
+            sira = np.argsort(-final)[: args.kanit_cift]
+            for s in sira:
+                i, j = satirlar[s]
+                with olcer.asama("kanit") as k:
+                    kanit.kanit_bul(adlar[i], adlar[j])
+                    k.adet += 1
+
+            db = ResultDatabase()
+            with olcer.asama("db_yazma") as k:
+                with db.toplu_yazici(tarih, app.config["db_parti_boyutu"]) as yazici:
+                    for s, (i, j) in enumerate(satirlar):
+                        yazici.sonuc_ekle(app._sonuc_satiri(
+                            adlar[i], adlar[j], float(lex[s]), float(sem[s]),
+                            float(final[s]), tarih,
+                        ))
+                k.adet = len(satirlar)
+        finally:
+            os.chdir(eski_dizin)
+            if not args.sakla:
+                shutil.rmtree(calisma, ignore_errors=True)
+
+    asamalar = rapor(olcer.ozet())
+    cikarma = [v for a, v in asamalar.items() if a.startswith("cikarma_")]
+    cikarma_suresi = sum(v["sure"] for v in cikarma)
+    sonuc = {
+        "surum": _git_surumu(),
+        "tarih": datetime.now().isoformat(timespec="seconds"),
+        "ortam": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu": os.cpu_count(),
+            "stub": args.stub,
+            "model": args.model,
+            "ocr": args.ocr,
+            "backend": backend,
+        },
+        "korpus": {
+            "klasor": args.korpus,
+            "ayarlar": manifest["ayarlar"] if manifest else None,
+            "belge": len(dosyalar),
+            "taranmis": len(taranmislar),
+            "karakter": sum(len(m) for m in metinler.values()),
+            "uretim_suresi": uretim_suresi,
+        },
+        "ozet": {
+            "belge_hizi": round(len(dosyalar) / cikarma_suresi, 2) if cikarma_suresi else None,
+            "cift_hizi": asamalar["korpus_skorlama"]["hiz"],
+            "hesapla_cift_hizi": asamalar.get("hesapla", {}).get("hiz"),
+            "tepe_rss_mb": round(tepe_rss_mb() or 0, 1) or None,
+        },
+        "asamalar": asamalar,
+        # Motor/extractor/DB icindeki asamalar (kodlama, tfidf, ocr_satir_kesme...)
+        "ic_asamalar": rapor(ic_olcum.ozet(), birimler={}),
+        "sayaclar": ic_olcum.ozet()["sayaclar"],
+    }
+    metin = json.dumps(sonuc, ensure_ascii=False, indent=2)
+    if args.cikti:
+        Path(args.cikti).write_text(metin, encoding="utf-8")
+    else:
+        print(metin)
+
+
+def _git_surumu():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=KOK, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+if __name__ == "__main__":
+    main()
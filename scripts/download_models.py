@@ -1,9 +1,15 @@
 # File: scripts\download_models.py
+import argparse
+import sys
 from pathlib import Path
 
 from sentence_transformers import SentenceTransformer
 from transformers import TrOCRProcessor, VisionEncoderDecoderModel
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import onnx_backend  # noqa: E402
+
 
 SEMANTIC_MODELS = {
     "semantic_heavy": "paraphrase-multilingual-MiniLM-L12-v2",
@@ -15,6 +21,18 @@ OCR_MODELS = {
     "ocr_light": "microsoft/trocr-small-printed",
 }
 
+# Sapma raporu icin sabit ornekler
+ORNEK_CUMLELER = [
+    "Bu calismada derin ogrenme yontemleri ile metin benzerligi incelenmistir.",
+    "Onerilen yontem, onceki calismalara gore daha yuksek dogruluk saglamistir.",
+    "Veri seti uc farkli universitenin tez arsivlerinden derlenmistir.",
+    "Sonuclar, anlamsal benzerligin sozcuksel benzerlikten farkli oldugunu gostermektedir.",
+    "The proposed method improves accuracy compared to previous studies.",
+    "Tablo 3'te modelin farkli parametrelerle elde edilen basarimi verilmistir.",
+    "Kaynakca bolumunde yer alan calismalar APA formatina gore duzenlenmistir.",
+    "Hava bugun cok guzel, disarida yuruyuse cikmak istiyorum.",
+]
+
 
 def _models_dir() -> Path:
     return Path(__file__).resolve().parents[1] / "models"
@@ -38,14 +56,92 @@ def download_ocr(alias: str, model_name: str):
     model.save_pretrained(dest)
 
 
+def export_semantic(alias: str, nicemleme: str):
+    dest = _models_dir() / alias
+    print(f"[ONNX] Semantic: {dest} (nicemleme: {nicemleme or 'yok'})")
+    onnx_backend.semantik_disa_aktar(str(dest), nicemleme)
+
+    rapor = onnx_backend.semantik_sapma(
+        SentenceTransformer(str(dest)),
+        onnx_backend.semantik_modeli_yukle(str(dest), nicemleme),
+        ORNEK_CUMLELER,
+    )
+    _rapor_yaz(alias, rapor)
+
+
+def export_ocr(alias: str, nicemleme: str):
+    dest = _models_dir() / alias
+    print(f"[ONNX] OCR: {dest} (nicemleme: {nicemleme or 'yok'})")
+    onnx_backend.ocr_disa_aktar(str(dest), nicemleme)
+
+    processor = TrOCRProcessor.from_pretrained(dest, use_fast=False)
+    pixel_values = processor(
+        images=_ornek_satirlar(), return_tensors="pt"
+    ).pixel_values
+    metinler = []
+    for model in (
+        VisionEncoderDecoderModel.from_pretrained(dest),
+        onnx_backend.ocr_modeli_yukle(str(dest), nicemleme),
+    ):
+        metinler.append(
+            processor.batch_decode(
+                model.generate(pixel_values), skip_special_tokens=True
+            )
+        )
+    _rapor_yaz(alias, onnx_backend.ocr_sapma(*metinler))
+
+
+def _ornek_satirlar():
+    """Ornek cumlelerden basit satir gorselleri uretir."""
+    from PIL import Image, ImageDraw
+
+    satirlar = []
+    for cumle in ORNEK_CUMLELER:
+        img = Image.new("RGB", (8 * len(cumle) + 20, 32), "white")
+        ImageDraw.Draw(img).text((10, 10), cumle, fill="black")
+        satirlar.append(img)
+    return satirlar
+
+
+def _rapor_yaz(alias: str, rapor: dict):
+    ozet = ", ".join(
+        f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}"
+        for k, v in rapor.items()
+    )
+    print(f"[Sapma] {alias} (torch -> onnx): {ozet}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Modelleri models/ altina indirir.")
+    parser.add_argument(
+        "--onnx", action="store_true",
+        help="Indirilen modelleri ONNX'e aktar ve sapma raporu yazdir",
+    )
+    parser.add_argument(
+        "--nicemleme", default="avx2",
+        choices=[*onnx_backend.NICEMLEME_HEDEFLERI, "yok"],
+        help="ONNX dinamik int8 nicemleme hedefi ('yok': fp32)",
+    )
+    parser.add_argument(
+        "--indirmeden", action="store_true",
+        help="Indirmeyi atla, models/ altindaki mevcut modelleri kullan",
+    )
+    args = parser.parse_args()
+    nicemleme = "" if args.nicemleme == "yok" else args.nicemleme
+
     _models_dir().mkdir(parents=True, exist_ok=True)
 
     for alias, model_name in SEMANTIC_MODELS.items():
-        download_semantic(alias, model_name)
+        if not args.indirmeden:
+            download_semantic(alias, model_name)
+        if args.onnx:
+            export_semantic(alias, nicemleme)
 
     for alias, model_name in OCR_MODELS.items():
-        download_ocr(alias, model_name)
+        if not args.indirmeden:
+            download_ocr(alias, model_name)
+        if args.onnx:
+            export_ocr(alias, nicemleme)
 
     print("[OK] Tum modeller indirildi.")
 
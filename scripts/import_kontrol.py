@@ -0,0 +1,83 @@
+# File: scripts\import_kontrol.py
+"""
+Acilis import regresyon kontrolu.
+
+    python scripts/import_kontrol.py [--sure 1.0]
+
+Her giris modulu temiz bir Python process'inde import edilir. Agir
+kutuphanelerden biri yuklenirse veya import suresi siniri asarsa
+cikis kodu 1 olur (CI / commit oncesi kontrol icin).
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Acilista yuklenmemesi gereken moduller (modeller/motorlar kurulurken yuklenir)
+AGIR_MODULLER = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "sklearn",
+    "scipy",
+    "cv2",
+    "fitz",
+    "pymupdf",
+    "onnxruntime",
+    "optimum",
+)
+
+GIRIS_MODULLERI = ("app.gui", "app.cli", "app.similarity_app")
+
+_OLCUM = """
+import json, sys, time
+bas = time.perf_counter()
+import {modul}
+sure = time.perf_counter() - bas
+agir = sorted(m for m in {agir!r} if m in sys.modules)
+print(json.dumps({{"sure": sure, "agir": agir}}))
+"""
+
+
+def olc(modul: str) -> dict:
+    """Modulu ayri process'te import eder; sure ve yuklenen agir modulleri dondurur."""
+    kok = Path(__file__).resolve().parents[1]
+    cikti = subprocess.run(
+        [sys.executable, "-c", _OLCUM.format(modul=modul, agir=AGIR_MODULLER)],
+        cwd=kok,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(cikti.strip().splitlines()[-1])
+
+
+def main():
+    p = argparse.ArgumentParser(description="Acilis import suresi ve agir modul kontrolu")
+    p.add_argument("--sure", type=float, default=1.0, help="Modul basina en fazla saniye")
+    p.add_argument("moduller", nargs="*", default=list(GIRIS_MODULLERI))
+    args = p.parse_args()
+
+    basarisiz = False
+    for modul in args.moduller:
+        try:
+            sonuc = olc(modul)
+        except subprocess.CalledProcessError as e:
+            print(f"[Hata] {modul} import edilemedi:\n{e.stderr}")
+            basarisiz = True
+            continue
+        sorunlar = []
+        if sonuc["agir"]:
+            sorunlar.append(f"agir moduller: {', '.join(sonuc['agir'])}")
+        if sonuc["sure"] > args.sure:
+            sorunlar.append(f"sure {sonuc['sure']:.2f} s > {args.sure:.2f} s")
+        durum = "HATA" if sorunlar else "OK"
+        print(f"[{durum}] {modul}: {sonuc['sure']:.2f} s" + (f" ({'; '.join(sorunlar)})" if sorunlar else ""))
+        basarisiz = basarisiz or bool(sorunlar)
+
+    sys.exit(1 if basarisiz else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+# File: scripts\korpus_uret.py
+"""
+Benchmark icin sentetik teslim korpusu uretir.
+
+    python scripts/korpus_uret.py CIKTI_KLASORU --belge 100 --kopya-orani 0.1
+
+Belgeler ozgun, bir ozgun belgenin kopyasi (az duzenleme) veya parafrazi
+(es anlamli kelimeler, cumle sirasi) olur. TXT, DOCX ve PDF yazilir;
+PDF'lerin bir kismi sayfa gorseli olarak (metin katmansiz) kaydedilerek OCR
+yolu calistirilir. Iliskiler manifest.json'a yazilir. Ayni tohum ayni
+korpusu uretir.
+"""
+import argparse
+import json
+import random
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+KELIMELER = (
+    "calisma veri model yontem sonuc analiz benzerlik metin belge tez ogrenme "
+    "derin agirlik skor esik deney tablo sekil bolum kaynak universite arastirma "
+    "onerilen karsilastirma dogruluk basarim ornek literatur hipotez degisken "
+    "olcum orneklem istatistik anlamli farkli yuksek dusuk onemli temel yeni "
+    "sistem yapi surec etki iliski katki sinir kapsam amac yaklasim cerceve "
+    "uygulama gelistirme tasarim performans verim maliyet zaman kullanici "
+    "katilimci gorusme anket bulgu tartisma oneri gelecek sinirlilik yontembilim "
+    "ogrenci ogretmen egitim ders program proje rapor makale dergi yazar ekip"
+).split()
+
+# Parafraz icin cift yonlu es anlamlilar
+ES_ANLAMLILAR = {
+    "calisma": "arastirma", "sonuc": "bulgu", "yontem": "yaklasim",
+    "onemli": "kritik", "yuksek": "fazla", "dusuk": "az", "yeni": "ozgun",
+    "amac": "hedef", "etki": "tesir", "iliski": "baglanti", "ornek": "misal",
+    "gelistirme": "iyilestirme", "tasarim": "kurgu", "performans": "basarim",
+    "katilimci": "denek", "tartisma": "degerlendirme", "oneri": "tavsiye",
+    "temel": "esas", "farkli": "degisik", "sistem": "duzen",
+}
+ES_ANLAMLILAR.update({v: k for k, v in list(ES_ANLAMLILAR.items())})
+
+BICIMLER = ("txt", "docx", "pdf")
+
+
+def _cumle(rng):
+    kelimeler = [rng.choice(KELIMELER) for _ in range(rng.randint(8, 20))]
+    return " ".join(kelimeler).capitalize() + "."
+
+
+def ozgun_metin(rng, kelime_sayisi):
+    """Paragraflara bolunmus rastgele cumleler; [[cumle, ...], ...]."""
+    paragraflar, paragraf, adet = [], [], 0
+    while adet < kelime_sayisi:
+        c = _cumle(rng)
+        paragraf.append(c)
+        adet += len(c.split())
+        if len(paragraf) >= rng.randint(3, 6):
+            paragraflar.append(paragraf)
+            paragraf = []
+    if paragraf:
+        paragraflar.append(paragraf)
+    return paragraflar
+
+
+def kopyala(rng, paragraflar, duzenleme=0.05):
+    """Kelimelerin kucuk bir kismi degistirilmis kopya."""
+    sonuc = []
+    for p in paragraflar:
+        yeni = []
+        for c in p:
+            kelimeler = c.rstrip(".").split()
+            for i in range(len(kelimeler)):
+                if rng.random() < duzenleme:
+                    kelimeler[i] = rng.choice(KELIMELER)
+            yeni.append(" ".join(kelimeler).capitalize() + ".")
+        sonuc.append(yeni)
+    return sonuc
+
+
+def parafraz(rng, paragraflar, oran=0.6):
+    """Es anlamli degisim, paragraf ici cumle karistirma ve cumle atma."""
+    sonuc = []
+    for p in paragraflar:
+        yeni = []
+        for c in p:
+            if rng.random() < 0.15:
+                continue
+            kelimeler = [
+                ES_ANLAMLILAR[k] if k in ES_ANLAMLILAR and rng.random() < oran else k
+                for k in c.rstrip(".").lower().split()
+            ]
+            yeni.append(" ".join(kelimeler).capitalize() + ".")
+        rng.shuffle(yeni)
+        if yeni:
+            sonuc.append(yeni)
+    return sonuc
+
+
+def _duz_metin(paragraflar):
+    return "\n\n".join(" ".join(p) for p in paragraflar)
+
+
+def txt_yaz(yol, paragraflar):
+    Path(yol).write_text(_duz_metin(paragraflar), encoding="utf-8")
+
+
+_DOCX_TURLER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+_DOCX_ILISKILER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+
+def docx_yaz(yol, paragraflar):
+    """python-docx gerektirmeyen en kucuk gecerli DOCX paketi."""
+    govde = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(" ".join(p))}</w:t></w:r></w:p>'
+        for p in paragraflar
+    )
+    belge = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{govde}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(yol, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _DOCX_TURLER)
+        z.writestr("_rels/.rels", _DOCX_ILISKILER)
+        z.writestr("word/document.xml", belge)
+
+
+def pdf_yaz(yol, paragraflar, taranmis=False, dpi=150, sayfa_kelime=300):
+    """
+    Metin katmanli PDF yazar. taranmis=True ise her sayfa dpi'da render
+    edilip metin katmani olmayan bir gorsel sayfa olarak kaydedilir.
+    """
+    import fitz  # PyMuPDF
+
+    kelimeler = _duz_metin(paragraflar).split(" ")
+    kaynak = fitz.open()
+    for i in range(0, len(kelimeler), sayfa_kelime):
+        sayfa = kaynak.new_page()
+        sayfa.insert_textbox(
+            sayfa.rect + (50, 50, -50, -50),
+            " ".join(kelimeler[i : i + sayfa_kelime]),
+            fontsize=10,
+        )
+    if not taranmis:
+        kaynak.save(yol)
+        kaynak.close()
+        return
+
+    hedef = fitz.open()
+    for sayfa in kaynak:
+        pix = sayfa.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        yeni = hedef.new_page(width=sayfa.rect.width, height=sayfa.rect.height)
+        yeni.insert_image(yeni.rect, pixmap=pix)
+    hedef.save(yol)
+    hedef.close()
+    kaynak.close()
+
+
+def korpus_uret(
+    klasor,
+    belge: int = 100,
+    kelime: int = 800,
+    kopya_orani: float = 0.1,
+    parafraz_orani: float = 0.1,
+    bicimler: dict | None = None,
+    taranmis_orani: float = 0.0,
+    dpi: int = 150,
+    tohum: int = 0,
+) -> dict:
+    """
+    Korpusu klasor'e yazar ve manifest'i dondurur. bicimler: {"txt": 0.4, ...}
+    agirliklari; taranmis_orani PDF'lerin gorsel sayfali olma olasiligidir.
+    """
+    rng = random.Random(tohum)
+    klasor = Path(klasor)
+    klasor.mkdir(parents=True, exist_ok=True)
+    bicimler = bicimler or {"txt": 0.4, "docx": 0.3, "pdf": 0.3}
+    adlar, agirliklar = zip(*bicimler.items())
+
+    ozgunler = []
+    belgeler = []
+    for i in range(belge):
+        zar = rng.random()
+        if ozgunler and zar < kopya_orani:
+            kaynak = rng.choice(ozgunler)
+            iliski, paragraflar = "kopya", kopyala(rng, kaynak[1])
+        elif ozgunler and zar < kopya_orani + parafraz_orani:
+            kaynak = rng.choice(ozgunler)
+            iliski, paragraflar = "parafraz", parafraz(rng, kaynak[1])
+        else:
+            kaynak = None
+            iliski = "ozgun"
+            paragraflar = ozgun_metin(rng, max(20, int(rng.gauss(kelime, kelime * 0.2))))
+
+        bicim = rng.choices(adlar, weights=agirliklar)[0]
+        taranmis = bicim == "pdf" and rng.random() < taranmis_orani
+        ad = f"belge_{i:05d}.{bicim}"
+        yol = klasor / ad
+        if bicim == "txt":
+            txt_yaz(yol, paragraflar)
+        elif bicim == "docx":
+            docx_yaz(yol, paragraflar)
+        else:
+            pdf_yaz(yol, paragraflar, taranmis=taranmis, dpi=dpi)
+
+        if iliski == "ozgun":
+            ozgunler.append((ad, paragraflar))
+        belgeler.append({
+            "dosya": ad,
+            "bicim": bicim,
+            "taranmis": taranmis,
+            "iliski": iliski,
+            "kaynak": kaynak[0] if kaynak else None,
+            "kelime": sum(len(" ".join(p).split()) for p in paragraflar),
+        })
+
+    manifest = {
+        "ayarlar": {
+            "belge": belge, "kelime": kelime, "kopya_orani": kopya_orani,
+            "parafraz_orani": parafraz_orani, "bicimler": bicimler,
+            "taranmis_orani": taranmis_orani, "dpi": dpi, "tohum": tohum,
+        },
+        "belgeler": belgeler,
+    }
+    (klasor / "manifest.json").write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    return manifest
+
+
+def bicim_ayristir(deger: str) -> dict:
+    """'txt=0.4,docx=0.3,pdf=0.3' -> {'txt': 0.4, ...}"""
+    sonuc = {}
+    for parca in deger.split(","):
+        ad, _, agirlik = parca.partition("=")
+        ad = ad.strip().lower()
+        if ad not in BICIMLER:
+            raise argparse.ArgumentTypeError(f"Gecersiz bicim: {ad}")
+        sonuc[ad] = float(agirlik or 1)
+    return sonuc
+
+
+def arguman_ekle(p):
+    """Uretim argumanlari (benchmark.py de kullanir)."""
+    p.add_argument("--belge", type=int, default=100)
+    p.add_argument("--kelime", type=int, default=800, help="Ozgun belge basina ortalama kelime")
+    p.add_argument("--kopya-orani", type=float, default=0.1)
+    p.add_argument("--parafraz-orani", type=float, default=0.1)
+    p.add_argument(
+        "--bicimler", type=bicim_ayristir, default={"txt": 0.4, "docx": 0.3, "pdf": 0.3},
+        help="Bicim agirliklari, orn. txt=0.4,docx=0.3,pdf=0.3",
+    )
+    p.add_argument(
+        "--taranmis-orani", type=float, default=0.0,
+        help="Gorsel sayfali (OCR gerektiren) PDF olasiligi",
+    )
+    p.add_argument("--dpi", type=int, default=150, help="Taranmis sayfa cozunurlugu")
+    p.add_argument("--tohum", type=int, default=0)
+
+
+def uretim_ayarlari(args) -> dict:
+    return {
+        "belge": args.belge, "kelime": args.kelime, "kopya_orani": args.kopya_orani,
+        "parafraz_orani": args.parafraz_orani, "bicimler": args.bicimler,
+        "taranmis_orani": args.taranmis_orani, "dpi": args.dpi, "tohum": args.tohum,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description="Sentetik teslim korpusu uretir.")
+    p.add_argument("klasor")
+    arguman_ekle(p)
+    args = p.parse_args()
+    manifest = korpus_uret(args.klasor, **uretim_ayarlari(args))
+    sayilar = {}
+    for b in manifest["belgeler"]:
+        sayilar[b["iliski"]] = sayilar.get(b["iliski"], 0) + 1
+    print(f"[OK] {len(manifest['belgeler'])} belge yazildi: {sayilar} -> {args.klasor}")
+
+
+if __name__ == "__main__":
+    main()
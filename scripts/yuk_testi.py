@@ -0,0 +1,104 @@
+# File: scripts\yuk_testi.py
+"""
+app.servis icin localhost yuk testi.
+
+    python -m app.servis --ocr off -q            # ayri terminalde
+    python scripts/yuk_testi.py --istemci 16 --istek 50
+
+Her istemci thread'i sirayla /skor'a rastgele metin ciftleri gonderir.
+Gecikme yuzdelikleri, verim ve servisin mikro-batch istatistikleri yazilir.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+KELIMELER = (
+    "calisma veri model yontem sonuc analiz benzerlik metin belge tez "
+    "ogrenme derin agirlik skor esik deney tablo sekil bolum kaynak "
+    "universite arastirma onerilen karsilastirma dogruluk basarim ornek"
+).split()
+
+
+def _metin(rng, kelime_sayisi):
+    return " ".join(rng.choice(KELIMELER) for _ in range(kelime_sayisi))
+
+
+def _istek(url, yol, veri=None):
+    govde = None if veri is None else json.dumps(veri).encode("utf-8")
+    istek = urllib.request.Request(
+        url + yol, data=govde, headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(istek, timeout=300) as cevap:
+        return json.loads(cevap.read())
+
+
+def _istemci(url, istek_sayisi, kelime_sayisi, tohum, gecikmeler, hatalar):
+    rng = random.Random(tohum)
+    for _ in range(istek_sayisi):
+        veri = {
+            "metin1": _metin(rng, kelime_sayisi),
+            "metin2": _metin(rng, kelime_sayisi),
+        }
+        bas = time.perf_counter()
+        try:
+            _istek(url, "/skor", veri)
+        except (urllib.error.URLError, OSError) as e:
+            hatalar.append(str(e))
+            continue
+        gecikmeler.append(time.perf_counter() - bas)
+
+
+def _yuzdelik(degerler, p):
+    if not degerler:
+        return 0.0
+    degerler = sorted(degerler)
+    return degerler[min(len(degerler) - 1, int(round(p / 100 * (len(degerler) - 1))))]
+
+
+def main():
+    p = argparse.ArgumentParser(description="app.servis /skor yuk testi")
+    p.add_argument("--url", default="http://127.0.0.1:8765")
+    p.add_argument("--istemci", type=int, default=16, help="Es zamanli istemci sayisi")
+    p.add_argument("--istek", type=int, default=50, help="Istemci basina istek")
+    p.add_argument("--kelime", type=int, default=120, help="Metin basina kelime")
+    p.add_argument("--tohum", type=int, default=0)
+    args = p.parse_args()
+
+    onceki = _istek(args.url, "/saglik")["batch"]
+    gecikmeler, hatalar = [], []
+    threadler = [
+        threading.Thread(
+            target=_istemci,
+            args=(args.url, args.istek, args.kelime, args.tohum + i, gecikmeler, hatalar),
+        )
+        for i in range(args.istemci)
+    ]
+    bas = time.perf_counter()
+    for t in threadler:
+        t.start()
+    for t in threadler:
+        t.join()
+    sure = time.perf_counter() - bas
+    sonraki = _istek(args.url, "/saglik")["batch"]
+
+    batch = sonraki["batch"] - onceki["batch"]
+    oge = sonraki["oge"] - onceki["oge"]
+    print(f"Istemci: {args.istemci}, basarili istek: {len(gecikmeler)}, hata: {len(hatalar)}")
+    print(f"Sure: {sure:.2f} s, verim: {len(gecikmeler) / sure:.1f} istek/s")
+    print(
+        "Gecikme (ms): "
+        + ", ".join(
+            f"p{q}={_yuzdelik(gecikmeler, q) * 1000:.1f}" for q in (50, 95, 99)
+        )
+    )
+    print(f"Mikro-batch: {batch} encode cagrisi, ortalama {oge / max(1, batch):.1f} metin")
+    if hatalar:
+        print(f"Ilk hata: {hatalar[0]}")
+
+
+if __name__ == "__main__":
+    main()
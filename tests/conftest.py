@@ -0,0 +1,98 @@
+# File: tests\conftest.py
+"""
+Ortak fixture'lar. Semantik model yerine model kaydina deterministik bir
+stub konur; testler model indirmeden ve torch olmadan calisir. Veritabani
+ve onbellek yollari goreli oldugundan her test gecici klasorde calisir.
+"""
+import random
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+KOK = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(KOK))
+
+from app.similarity_app import SimilarityApp  # noqa: E402
+from core.analiz_motoru import BenzerlikMotoru  # noqa: E402
+from core.model_registry import MODELLER  # noqa: E402
+
+
+class StubKodlayici:
+    """SentenceTransformer yerine: kelime ozetlerinden sabit boyutlu vektor."""
+
+    boyut = 64
+
+    def encode(self, metinler, batch_size=32, convert_to_numpy=True, show_progress_bar=False, **_):
+        tek = isinstance(metinler, str)
+        metinler = [metinler] if tek else list(metinler)
+        emb = np.zeros((len(metinler), self.boyut), dtype=np.float32)
+        for i, metin in enumerate(metinler):
+            for kelime in metin.lower().split():
+                emb[i, zlib.crc32(kelime.encode()) % self.boyut] += 1.0
+        return emb[0] if tek else emb
+
+
+# Testlerde ortak kelime havuzu (Jaccard'i dusuk tutacak kadar genis)
+KELIMELER = [f"kelime{i}" for i in range(2000)]
+
+
+def rastgele_metin(rng: random.Random, uzunluk: int = 300) -> str:
+    return " ".join(rng.choice(KELIMELER) for _ in range(uzunluk))
+
+
+def degistir(rng: random.Random, metin: str, oran: float) -> str:
+    """Kelimelerin yaklasik oran kadarini rastgele kelimelerle degistirir."""
+    kelimeler = metin.split()
+    for k in rng.sample(range(len(kelimeler)), int(len(kelimeler) * oran)):
+        kelimeler[k] = rng.choice(KELIMELER)
+    return " ".join(kelimeler)
+
+
+@pytest.fixture
+def korpus(tmp_path):
+    """
+    Kaynak klasoru: birbirinden bagimsiz belgeler ve bunlarin yakin
+    kopyalari. Klasor yolu dondurulur.
+    """
+    rng = random.Random(7)
+    kaynak = tmp_path / "kaynak"
+    kaynak.mkdir()
+    asillar = [rastgele_metin(rng) for _ in range(6)]
+    for i, metin in enumerate(asillar):
+        (kaynak / f"belge_{i:02d}.txt").write_text(metin, encoding="utf-8")
+    for i in (0, 2):
+        (kaynak / f"kopya_{i:02d}.txt").write_text(
+            degistir(rng, asillar[i], 0.1), encoding="utf-8"
+        )
+    return kaynak
+
+
+@pytest.fixture
+def uygulama_kur(tmp_path, monkeypatch):
+    """
+    Gecici calisma klasorunde SimilarityApp ureten fabrika. Ayni testte
+    birden fazla uygulama ayni db/ klasorunu paylasir.
+    """
+    calisma = tmp_path / "calisma"
+    calisma.mkdir()
+    monkeypatch.chdir(calisma)
+    alias = BenzerlikMotoru.MODEL_MAP["light"][1]
+    MODELLER.getir("semantik", alias, "torch", lambda: (StubKodlayici(), "torch"))
+
+    def kur(**ayarlar):
+        temel = {"yukleme_isci_sayisi": 1, "aday_modu": "hepsi"}
+        return SimilarityApp("light", "off", ayarlar={**temel, **ayarlar})
+
+    return kur
+
+
+def run_satirlari(app, tarih):
+    """Run'in sonuc satirlari: [(dosya1, dosya2, lex, sem, atlandi)]."""
+    with app.db.lock:
+        return app.db.cursor.execute(
+            "SELECT dosya1, dosya2, lex, sem, atlandi FROM results WHERE tarih = ?",
+            (tarih,),
+        ).fetchall()
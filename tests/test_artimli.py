@@ -0,0 +1,73 @@
+# File: tests\test_artimli.py
+"""
+Artimli analiz: iki belgesi de degismemis ve temel run'da skorlanmis
+ciftler aktarilir; temel run'da aday elemeyle atlananlar ve yeni belgeli
+ciftler guncel korpusla skorlanir.
+"""
+import random
+
+from conftest import degistir, run_satirlari
+
+
+def _sozluk(satirlar):
+    return {frozenset((d1, d2)): (lex, sem, atlandi) for d1, d2, lex, sem, atlandi in satirlar}
+
+
+def _temel_run(korpus, uygulama_kur):
+    app = uygulama_kur(aday_modu="lsh", atlananlari_kaydet=True)
+    app.klasor_yukle(str(korpus))
+    _, tarih = app.analiz_et()
+    temel = _sozluk(run_satirlari(app, tarih))
+    assert any(a for *_, a in temel.values()) and not all(a for *_, a in temel.values())
+    return tarih, temel, set(app.veriler)
+
+
+def _yeni_belge_ekle(korpus):
+    metin = (korpus / "belge_04.txt").read_text(encoding="utf-8")
+    (korpus / "yeni.txt").write_text(
+        degistir(random.Random(1), metin, 0.05), encoding="utf-8"
+    )
+
+
+def test_hepsi_modunda_atlananlar_yeniden_skorlanir(korpus, uygulama_kur):
+    base, temel, eskiler = _temel_run(korpus, uygulama_kur)
+    _yeni_belge_ekle(korpus)
+
+    app = uygulama_kur(aday_modu="hepsi")
+    app.klasor_yukle(str(korpus))
+    _, tarih = app.analiz_et(artimli=True, base_tarih=base)
+    artimli = _sozluk(run_satirlari(app, tarih))
+
+    # Ayni korpusun tam analizi (yeniden skorlananlarin beklenen degeri)
+    app = uygulama_kur(aday_modu="hepsi")
+    app.klasor_yukle(str(korpus))
+    _, tam_tarih = app.analiz_et()
+    tam = _sozluk(run_satirlari(app, tam_tarih))
+
+    assert app.db.get_run_meta(tarih)[3] == base
+    assert artimli.keys() == tam.keys()
+    assert not any(a for *_, a in artimli.values())
+    for cift, skor in artimli.items():
+        if cift <= eskiler and not temel[cift][2]:
+            # Aktarilan: temel run'daki skor aynen
+            assert skor == temel[cift]
+        else:
+            # Yeni belgeli veya temel run'da atlanmis: guncel korpusla skorlanir
+            assert skor == tam[cift]
+
+
+def test_lsh_modunda_atlananlar_aktarilmaz(korpus, uygulama_kur):
+    base, temel, eskiler = _temel_run(korpus, uygulama_kur)
+    _yeni_belge_ekle(korpus)
+
+    app = uygulama_kur(aday_modu="lsh")
+    app.klasor_yukle(str(korpus))
+    _, tarih = app.analiz_et(artimli=True, base_tarih=base)
+    artimli = _sozluk(run_satirlari(app, tarih))
+
+    eski_ciftler = {c for c in artimli if c <= eskiler}
+    assert eski_ciftler == {c for c, (*_, a) in temel.items() if not a}
+    for cift in eski_ciftler:
+        assert artimli[cift] == temel[cift]
+    # Yeni belge yakin kopyasiyla skorlanir
+    assert frozenset(("yeni.txt", "belge_04.txt")) in artimli
@@ -0,0 +1,82 @@
+# File: tests\test_docx_extractor.py
+import zipfile
+
+import pytest
+
+from core.extractors.docx_extractor import DocxExtractor
+
+_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _paragraf(*runlar):
+    return "<w:p>" + "".join(f"<w:r>{r}</w:r>" for r in runlar) + "</w:p>"
+
+
+def _docx(yol, govde, **parcalar):
+    """Yalnizca extractor'in okudugu XML parcalariyla en kucuk DOCX."""
+    kok = {"word/document.xml": ("w:document", f"<w:body>{govde}</w:body>")}
+    for ad, icerik in parcalar.items():
+        kok[f"word/{ad}.xml"] = (
+            "w:ftr" if ad.startswith("footer") else
+            "w:hdr" if ad.startswith("header") else "w:footnotes",
+            icerik,
+        )
+    with zipfile.ZipFile(yol, "w") as z:
+        for ad, (etiket, icerik) in kok.items():
+            z.writestr(ad, f'<?xml version="1.0"?><{etiket} {_NS}>{icerik}</{etiket}>')
+    return str(yol)
+
+
+@pytest.fixture
+def belge(tmp_path):
+    govde = (
+        # Tek kelime birden fazla run'a bolunmus (bicim degisikligi)
+        _paragraf("<w:t>Ben</w:t>", "<w:t>zerlik</w:t>", '<w:t xml:space="preserve"> analizi</w:t>')
+        + _paragraf("<w:t>sol</w:t>", "<w:tab/>", "<w:t>sag</w:t>", "<w:br/>", "<w:t>alt</w:t>")
+        + _paragraf()
+        + "<w:tbl><w:tr>"
+        + f"<w:tc>{_paragraf('<w:t>hucre1</w:t>')}</w:tc>"
+        + f"<w:tc>{_paragraf('<w:t>hucre2</w:t>')}</w:tc>"
+        + "</w:tr></w:tbl>"
+    )
+    dipnot = f'<w:footnote w:id="1">{_paragraf("<w:t>dipnot metni</w:t>")}</w:footnote>'
+    return _docx(
+        tmp_path / "belge.docx",
+        govde,
+        footnotes=dipnot,
+        header1=_paragraf("<w:t>ust bilgi</w:t>"),
+        footer1=_paragraf("<w:t>alt bilgi</w:t>"),
+    )
+
+
+def test_govde_runlar_tablolar(belge):
+    assert DocxExtractor().metin_cikar(belge).split("\n") == [
+        "Benzerlik analizi",
+        "sol sag",
+        "alt",
+        "hucre1",
+        "hucre2",
+    ]
+
+
+def test_dipnot_ve_ustbilgi_istege_bagli(belge):
+    metin = DocxExtractor(dipnotlar=True, ustbilgiler=True).metin_cikar(belge)
+    satirlar = metin.split("\n")
+    assert satirlar[:5] == DocxExtractor().metin_cikar(belge).split("\n")
+    # Ust/alt bilgi parcalari ad sirasiyla (footer1, header1) okunur
+    assert satirlar[5:] == ["dipnot metni", "alt bilgi", "ust bilgi"]
+
+
+def test_onbellek_anahtari_ayarlari_ayirir():
+    anahtarlar = {
+        DocxExtractor(dipnotlar=d, ustbilgiler=u).onbellek_anahtari()
+        for d in (False, True)
+        for u in (False, True)
+    }
+    assert len(anahtarlar) == 4
+
+
+def test_bozuk_dosya_bos_metin(tmp_path):
+    yol = tmp_path / "bozuk.docx"
+    yol.write_bytes(b"docx degil")
+    assert DocxExtractor().metin_cikar(str(yol)) == ""
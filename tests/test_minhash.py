@@ -0,0 +1,65 @@
+# File: tests\test_minhash.py
+import random
+
+import numpy as np
+import pytest
+
+from conftest import degistir, rastgele_metin
+from core.minhash import MinHashLSH
+
+
+def _gercek_jaccard(lsh, m1, m2):
+    a = set(lsh._shingle_hashleri(m1).tolist())
+    b = set(lsh._shingle_hashleri(m2).tolist())
+    return len(a & b) / len(a | b)
+
+
+def _korpus(tohum=3):
+    """Bagimsiz belgeler ve farkli oranlarda degistirilmis kopyalari."""
+    rng = random.Random(tohum)
+    metinler = []
+    for _ in range(15):
+        asil = rastgele_metin(rng, 200)
+        metinler.append(asil)
+        for oran in (0.02, 0.1, 0.25, 0.5):
+            metinler.append(degistir(rng, asil, oran))
+    return metinler
+
+
+@pytest.mark.parametrize("esik, alt_sinir", [(0.1, 0.2), (0.5, 0.65)])
+def test_lsh_esigi_gecen_ciftleri_bulur(esik, alt_sinir):
+    lsh = MinHashLSH(perm_sayisi=128, shingle=3, esik=esik)
+    metinler = _korpus()
+    adaylar = lsh.aday_ciftler(lsh.imzalar(metinler))
+
+    beklenen = {
+        (i, j)
+        for i in range(len(metinler))
+        for j in range(i + 1, len(metinler))
+        if _gercek_jaccard(lsh, metinler[i], metinler[j]) >= alt_sinir
+    }
+    assert beklenen
+    bulunan = beklenen & set(adaylar)
+    assert len(bulunan) / len(beklenen) >= 0.95
+
+
+def test_lsh_ilgisiz_belgeleri_eler():
+    lsh = MinHashLSH(perm_sayisi=128, shingle=3, esik=0.1)
+    rng = random.Random(11)
+    metinler = [rastgele_metin(rng, 200) for _ in range(30)]
+    assert lsh.aday_ciftler(lsh.imzalar(metinler)) == {}
+
+
+def test_permutasyon_tam_sayi_aritmetigiyle_ayni():
+    lsh = MinHashLSH(perm_sayisi=16)
+    p = (1 << 61) - 1
+    x = np.array([0, 1, 2**31, 2**32 - 1, 123456789], dtype=np.uint64)
+    sonuc = lsh._permutasyon(x)
+    for k in range(lsh.perm_sayisi):
+        a, b = int(lsh._a[k]), int(lsh._b[k])
+        assert [int(v) for v in sonuc[k]] == [(a * int(v) + b) % p for v in x]
+
+
+def test_imza_tekrarlanabilir():
+    metin = rastgele_metin(random.Random(5), 100)
+    assert np.array_equal(MinHashLSH().imza(metin), MinHashLSH().imza(metin))
@@ -0,0 +1,57 @@
+# File: tests\test_run_tarihi.py
+from datetime import datetime
+
+import app.similarity_app as similarity_app
+
+
+class _SabitSaat(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 1, 2, 3, 4, 5)
+
+
+def test_ayni_saniyedeki_runlar_ayrilir(uygulama_kur, monkeypatch):
+    app = uygulama_kur()
+    monkeypatch.setattr(similarity_app, "datetime", _SabitSaat)
+
+    tarihler = []
+    for _ in range(4):
+        tarih = app._yeni_run_tarihi()
+        app.db.save_run_meta(tarih, "light", "off")
+        tarihler.append(tarih)
+
+    assert tarihler == [
+        "2026-01-02 03:04",
+        "2026-01-02 03:04:05",
+        "2026-01-02 03:04:05-2",
+        "2026-01-02 03:04:05-3",
+    ]
+
+
+def test_art_arda_runlar_ayri_kayit_olusturur(korpus, uygulama_kur):
+    tarihler = []
+    for _ in range(3):
+        app = uygulama_kur()
+        app.klasor_yukle(str(korpus))
+        _, tarih = app.analiz_et()
+        tarihler.append(tarih)
+
+    assert len(set(tarihler)) == 3
+    n = len(app.veriler)
+    for tarih in tarihler:
+        assert len(app.db.get_results_by_tarih(tarih)) == n * (n - 1) // 2
+
+
+def test_artimli_run_kendini_temel_almaz(korpus, uygulama_kur):
+    app = uygulama_kur()
+    app.klasor_yukle(str(korpus))
+    _, base = app.analiz_et()
+
+    # Yeni run temel run'la ayni dakikada baslar
+    (korpus / "yeni.txt").write_text("tamamen yeni bir belge " * 20, encoding="utf-8")
+    app = uygulama_kur()
+    app.klasor_yukle(str(korpus))
+    _, tarih = app.analiz_et(artimli=True)
+
+    assert tarih != base
+    assert app.db.get_run_meta(tarih)[3] == base
@@ -0,0 +1,92 @@
+# File: tests\test_sonuc_yazici.py
+import sqlite3
+from collections import Counter
+
+from conftest import run_satirlari
+from db.database import ResultDatabase
+
+
+def _sonuc(i):
+    return {
+        "dosya1": f"a{i}", "dosya2": f"b{i}",
+        "lex": 0.1, "sem": 0.2, "final": 0.15, "durum": "TEMIZ",
+    }
+
+
+def _kayitli(tarih):
+    """Commit edilmis satir sayisi (ayri baglantidan okunur)."""
+    with sqlite3.connect("db/results.db") as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM results WHERE tarih = ?", (tarih,)
+        ).fetchone()[0]
+
+
+def test_parti_dolunca_yazar_ve_sonra_bildirir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = ResultDatabase()
+    bildirilen = []
+
+    def yazildi(r):
+        # Bildirim aninda satir commit edilmis olmali
+        assert _kayitli("t") >= len(bildirilen) + 1
+        bildirilen.append(r["dosya1"])
+
+    with db.toplu_yazici("t", parti_boyutu=3, yazildi_cb=yazildi) as yazici:
+        for i in range(2):
+            yazici.sonuc_ekle(_sonuc(i))
+        assert _kayitli("t") == 0 and bildirilen == []
+        yazici.sonuc_ekle(_sonuc(2))
+        assert _kayitli("t") == 3
+        for i in range(3, 7):
+            yazici.sonuc_ekle(_sonuc(i))
+        assert _kayitli("t") == 6
+
+    # Cikista kalan satir yazilir
+    assert _kayitli("t") == 7
+    assert bildirilen == [f"a{i}" for i in range(7)]
+
+
+def test_kanit_satirlari_partiye_sayilir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = ResultDatabase()
+    yazici = db.toplu_yazici("t", parti_boyutu=2)
+    yazici.sonuc_ekle(_sonuc(0))
+    yazici.kanit_ekle("a0", "b0", [])
+    assert _kayitli("t") == 1
+    # Bos kanit "hesaplandi, bulunamadi" olarak saklanir
+    assert db.get_evidences("t", "a0", "b0") == []
+    assert db.get_evidences("t", "a1", "b1") is None
+
+
+def test_yarida_kalan_run_tekrarsiz_tamamlanir(korpus, uygulama_kur):
+    app = uygulama_kur(db_parti_boyutu=4)
+    app.klasor_yukle(str(korpus))
+    n = len(app.veriler)
+    toplam = n * (n - 1) // 2
+
+    adim = [0]
+
+    def iptal():
+        adim[0] += 1
+        return adim[0] > 10
+
+    ilk = []
+    _, tarih = app.analiz_et(cancel_cb=iptal, sonuc_cb=ilk.append)
+    assert not app.db.is_run_complete(tarih)
+    assert 0 < len(run_satirlari(app, tarih)) < toplam
+
+    # Yeni process gibi: ayni klasorde yeni uygulama run'a devam eder
+    app = uygulama_kur(db_parti_boyutu=4)
+    app.klasor_yukle(str(korpus))
+    ikinci = []
+    _, tarih2 = app.analiz_et(sonuc_cb=ikinci.append, devam_tarih=tarih)
+    assert tarih2 == tarih
+    assert app.db.is_run_complete(tarih)
+
+    satirlar = run_satirlari(app, tarih)
+    ciftler = Counter(frozenset((d1, d2)) for d1, d2, *_ in satirlar)
+    assert len(satirlar) == toplam
+    assert max(ciftler.values()) == 1
+    # Her cift ciktiya (sonuc_cb) tam bir kez yansir
+    bildirilen = Counter(frozenset((s["dosya1"], s["dosya2"])) for s in ilk + ikinci)
+    assert bildirilen == ciftler